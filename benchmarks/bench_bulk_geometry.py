@@ -0,0 +1,86 @@
+"""Benchmark of the bulk geometry updates
+
+Compares the previous groupby based cell and face centroids of
+`BulkGeometry` with the fused single pass `update_all` of
+`BulkGeometry`, `MonolayerGeometry` and `ClosedMonolayerGeometry`,
+for monolayers extruded from sheets of about 1k, 10k and 100k cells.
+
+Run with `python benchmarks/bench_bulk_geometry.py`
+"""
+import timeit
+
+import numpy as np
+
+from tyssue import Sheet, Monolayer, config
+from tyssue.geometry.bulk_geometry import (
+    BulkGeometry,
+    MonolayerGeometry,
+    ClosedMonolayerGeometry,
+)
+from tyssue.utils import _to_3d
+
+
+def groupby_update_all(eptm, weighted=False):
+    """`BulkGeometry.update_all` as implemented with groupby means"""
+    BulkGeometry.update_dcoords(eptm)
+    BulkGeometry.update_ucoords(eptm)
+    BulkGeometry.update_length(eptm)
+    BulkGeometry.update_perimeters(eptm)
+
+    scoords = ["s" + c for c in eptm.coords]
+    if weighted:
+        srce_pos = eptm.edge_df[scoords].values
+        trgt_pos = eptm.edge_df[["t" + c for c in eptm.coords]].values
+        mid_pos = (srce_pos + trgt_pos) / 2
+        weighted_pos = eptm.sum_face(mid_pos * _to_3d(eptm.edge_df["length"]))
+        eptm.face_df[eptm.coords] = (
+            weighted_pos.values / eptm.face_df["perimeter"].values[:, np.newaxis]
+        )
+    else:
+        eptm.face_df[eptm.coords] = eptm.edge_df.groupby("face")[scoords].mean()
+    face_pos = eptm.upcast_face(eptm.face_df[eptm.coords])
+    for c in eptm.coords:
+        eptm.edge_df["f" + c] = face_pos[c].to_numpy()
+        eptm.edge_df["r" + c] = eptm.edge_df["s" + c] - eptm.edge_df["f" + c]
+    eptm.cell_df[eptm.coords] = eptm.edge_df.groupby("cell")[scoords].mean()
+    cell_pos = eptm.upcast_cell(eptm.cell_df[eptm.coords])
+    eptm.edge_df[["c" + c for c in eptm.coords]] = cell_pos.to_numpy()
+
+    BulkGeometry.update_normals(eptm)
+    face_pos = eptm.edge_df[["f" + c for c in eptm.coords]].values
+    cell_pos = eptm.edge_df[["c" + c for c in eptm.coords]].values
+    eptm.edge_df["sub_vol"] = (
+        np.sum((face_pos - cell_pos) * eptm.edge_df[eptm.ncoords].values, axis=1) / 6
+    )
+    eptm.cell_df["vol"] = eptm.sum_cell(eptm.edge_df["sub_vol"])
+    BulkGeometry.update_areas(eptm)
+
+
+def main(sizes=(32, 100, 316), repeat=5):
+    print(
+        f"{'cells':>8} {'edges':>9} {'groupby':>10} {'bulk':>10} "
+        f"{'monolayer':>10} {'closed':>10}"
+    )
+    for size in sizes:
+        sheet = Sheet.planar_sheet_3d("bench", size, size, 1, 1)
+        sheet.sanitize()
+        mono = Monolayer.from_flat_sheet("bench", sheet, config.geometry.bulk_spec())
+        BulkGeometry.update_all(mono)
+        funcs = (
+            groupby_update_all,
+            BulkGeometry.update_all,
+            MonolayerGeometry.update_all,
+            ClosedMonolayerGeometry.update_all,
+        )
+        timings = [
+            min(timeit.repeat(lambda: func(mono), number=1, repeat=repeat))
+            for func in funcs
+        ]
+        print(
+            f"{mono.Nc:>8d} {mono.Ne:>9d} "
+            + " ".join(f"{t * 1e3:>8.1f}ms" for t in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark of the per-face averages used in the sheet geometry updates
+
+Compares the pandas groupby / `mean(level=)` reductions with the
+bincount based `Epithelium.mean_face` for sheets of about 10k, 100k
+and 1M edges, and times `SheetGeometry.update_height` and
+`update_centroid`.
+
+Run with `python benchmarks/bench_face_means.py`
+"""
+import timeit
+import warnings
+
+from tyssue import Sheet, SheetGeometry
+
+
+def groupby_means(sheet):
+    scoords = ["s" + c for c in sheet.coords]
+    sheet.edge_df.groupby("face")[scoords].mean()
+    edge_height = sheet.upcast_srce(sheet.vert_df[["height", "rho"]])
+    edge_height.set_index(sheet.edge_df["face"], append=True, inplace=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        edge_height.mean(level="face")
+
+
+def bincount_means(sheet):
+    scoords = ["s" + c for c in sheet.coords]
+    sheet.mean_face(sheet.edge_df[scoords])
+    sheet.mean_face(sheet.upcast_srce(sheet.vert_df[["height", "rho"]]))
+
+
+def geometry_steps(sheet):
+    SheetGeometry.update_centroid(sheet)
+    SheetGeometry.update_height(sheet)
+
+
+def main(sizes=(41, 130, 410), repeat=5):
+    print(f"{'edges':>10} {'groupby':>10} {'bincount':>10} {'speedup':>8} {'steps':>10}")
+    for size in sizes:
+        sheet = Sheet.planar_sheet_3d("bench", size, size, 1, 1)
+        sheet.sanitize()
+        SheetGeometry.update_all(sheet)
+        timings = [
+            min(timeit.repeat(lambda: func(sheet), number=1, repeat=repeat))
+            for func in (groupby_means, bincount_means, geometry_steps)
+        ]
+        print(
+            f"{sheet.Ne:>10d} {timings[0]*1e3:>8.1f}ms {timings[1]*1e3:>8.1f}ms "
+            f"{timings[0]/timings[1]:>7.1f}x {timings[2]*1e3:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from tyssue import Sheet, SheetGeometry, Ensemble, config
+from tyssue.dynamics import SheetModel as model
+from tyssue.generation import three_faces_sheet
+
+
+def _sheet():
+    sheet = Sheet("3faces", *three_faces_sheet())
+    sheet.update_specs(config.dynamics.quasistatic_sheet_spec())
+    SheetGeometry.update_all(sheet)
+    return sheet
+
+
+def test_ensemble():
+    sheet = _sheet()
+    rng = np.random.default_rng(42)
+    positions = sheet.vert_df[sheet.coords].to_numpy() + rng.normal(
+        scale=0.05, size=(4, sheet.Nv, 3)
+    )
+    ensemble = Ensemble(sheet, positions=positions)
+    assert len(ensemble) == 4
+    assert ensemble.eptm.Nv == 4 * sheet.Nv
+    np.testing.assert_allclose(ensemble.positions, positions)
+
+    ensemble.set_param("face", "contractility", [0.1, 0.2, 0.3, 0.4])
+    ensemble.update_geometry(SheetGeometry)
+    energies = ensemble.compute_energy(model)
+    gradients = ensemble.compute_gradient(model)
+    assert energies.shape == (4,)
+    assert gradients.shape == (4, sheet.Nv, 3)
+
+    for i in range(4):
+        replicate = sheet.copy()
+        replicate.vert_df[replicate.coords] = positions[i]
+        replicate.face_df["contractility"] = 0.1 * (i + 1)
+        SheetGeometry.update_all(replicate)
+        np.testing.assert_allclose(energies[i], model.compute_energy(replicate))
+        np.testing.assert_allclose(
+            gradients[i], model.compute_gradient(replicate).to_numpy(), atol=1e-12
+        )
+
+    with pytest.raises(ValueError):
+        Ensemble(sheet, positions=positions[:, :-1])
+
+
+def test_ensemble_split():
+    sheet = _sheet()
+    ensemble = Ensemble(sheet, num_replicates=3)
+    assert ensemble.diverged().size == 0
+
+    # rewire an edge of the second replicate to another of its faces
+    edge_df = ensemble.eptm.edge_df
+    edges = edge_df.index[edge_df["replicate"] == 1]
+    faces = edge_df.loc[edges, "face"].unique()
+    edge = edges[edge_df.loc[edges, "face"] == faces[0]][0]
+    edge_df.loc[edge, "face"] = faces[1]
+    np.testing.assert_array_equal(ensemble.diverged(), [1])
+
+    replicate = ensemble.split(1)
+    assert replicate.Nv == sheet.Nv
+    assert "replicate" not in replicate.vert_df
+    assert len(ensemble) == 2
+    np.testing.assert_array_equal(ensemble.labels, [0, 2])
+    assert ensemble.eptm.Nv == 2 * sheet.Nv
+    assert ensemble.diverged().size == 0
+
+
+def test_parameter_sweep():
+    import pandas as pd
+    from tyssue import parameter_sweep
+
+    sheet = _sheet()
+    params = pd.DataFrame(
+        {
+            "line_tension": [0.1, 0.12, 0.14],
+            ("face", "prefered_area"): [0.9, 1.0, 1.1],
+        },
+        index=list("abc"),
+    )
+    energies, grads = parameter_sweep(sheet, model, params)
+    assert grads.shape == (3, sheet.Nv, 3)
+    full = parameter_sweep(sheet, model, params, gradients=False, full_output=True)
+    assert list(full.columns) == model.labels
+    np.testing.assert_allclose(full.sum(axis=1), energies)
+
+    for i, key in enumerate(params.index):
+        replicate = sheet.copy()
+        # the tuple column label is not a MultiIndex, select it first
+        replicate.edge_df["line_tension"] = params["line_tension"][key]
+        replicate.face_df["prefered_area"] = params[("face", "prefered_area")][key]
+        np.testing.assert_allclose(energies[key], model.compute_energy(replicate))
+        np.testing.assert_allclose(
+            grads[i], model.compute_gradient(replicate).to_numpy(), atol=1e-12
+        )
+
+    with pytest.raises(ValueError):
+        parameter_sweep(sheet, model, pd.DataFrame({"not_a_parameter": [1, 0]}))
+
+
+def test_parameter_sweep_columns():
+    import pandas as pd
+    from tyssue import parameter_sweep
+
+    sheet = _sheet()
+    rng = np.random.default_rng(0)
+    params = pd.DataFrame(
+        {
+            "line_tension": rng.uniform(0.05, 0.15, 4),
+            ("face", "contractility"): rng.uniform(0.01, 0.1, 4),
+            ("face", "prefered_area"): rng.uniform(0.8, 1.2, 4),
+            ("face", "area_elasticity"): rng.uniform(0.5, 1.5, 4),
+        }
+    )
+    energies, grads = parameter_sweep(sheet, model, params)
+    assert energies.shape == (4,)
+    assert grads.shape == (4, sheet.Nv, 3)
+
+    for i in range(4):
+        replicate = sheet.copy()
+        for column in params.columns:
+            element, name = column if isinstance(column, tuple) else ("edge", column)
+            replicate.datasets[element][name] = params[column].iloc[i]
+        np.testing.assert_allclose(energies.iloc[i], model.compute_energy(replicate))
+        np.testing.assert_allclose(
+            grads[i], model.compute_gradient(replicate).to_numpy(), atol=1e-12
+        )
@@ -5,6 +5,7 @@ import numpy as np
 import pandas as pd
 from numpy.testing import assert_array_equal
 from pytest import raises
+from scipy.spatial import Voronoi
 
 from tyssue.core import Epithelium
 from tyssue.core.sheet import Sheet, get_opposite
@@ -18,13 +19,13 @@ from tyssue import config
 from tyssue.geometry.planar_geometry import PlanarGeometry
 from tyssue.geometry.sheet_geometry import SheetGeometry
 from tyssue.geometry.bulk_geometry import RNRGeometry
-from tyssue.generation import extrude, hexa_grid3d, hexa_grid2d
+from tyssue.generation import extrude, hexa_grid3d, hexa_grid2d, from_2d_voronoi
 from tyssue.config.dynamics import quasistatic_sheet_spec
 from tyssue.config.geometry import spherical_sheet
 from tyssue.generation import generate_ring
 from tyssue.dynamics import effectors, model_factory
 from tyssue.solvers.quasistatic import QSSolver
-from tyssue import PlanarGeometry
+from tyssue.utils.decorators import do_undo
 
 
 def test_3faces():
@@ -39,6 +40,13 @@ def test_idx_lookup():
     eptm = Epithelium("3faces_2D", datasets, specs)
     eptm.face_df["id"] = eptm.face_df.index.values
     assert eptm.idx_lookup(1, "face") == 1
+    assert eptm.idx_lookup(12, "face") is None
+    # ids changed without topology change
+    eptm.face_df["id"] = [2, 0, 1]
+    assert eptm.idx_lookup(1, "face") == 2
+    eptm.face_df.loc[0, "id"] = 12
+    assert eptm.idx_lookup(12, "face") == 0
+    assert_array_equal(eptm.idx_lookups([1, 5, 12], "face"), [2, -1, 0])
 
 
 def test_triangular_mesh():
@@ -314,6 +322,102 @@ def test_eptm_copy():
     assert eptm.settings["deepcopy"] != eptm_deepcopy.settings["deepcopy"]
 
 
+def test_backup_restore():
+    datasets, specs = three_faces_sheet()
+    eptm = Epithelium("3faces_2D", datasets, specs)
+    eptm.backup()
+    assert eptm._backups[-1].datasets["vert"] is not eptm.vert_df
+    eptm.vert_df["x"] = 10.0
+    eptm.edge_df = eptm.edge_df.iloc[:4].copy()
+    bad_edges = eptm.edge_df
+    eptm.restore()
+    assert eptm.Ne == 18
+    assert eptm.vert_df["x"].max() < 10.0
+    assert eptm._bad.edge_df is bad_edges
+    assert eptm._bad.vert_df["x"].min() == 10.0
+    assert not eptm._backups
+
+
+def test_backup_inplace_writes():
+    datasets, specs = three_faces_sheet()
+    eptm = Epithelium("3faces_2D", datasets, specs)
+    vert_df = eptm.vert_df.copy()
+    edge_df = eptm.edge_df.copy()
+    face_df = eptm.face_df.copy()
+    eptm.backup()
+
+    eptm.vert_df.loc[eptm.vert_df.index[:3], eptm.coords] = 10.0
+    eptm.face_df.loc[0, "area"] = 123
+    eptm.edge_df.loc[0, "face"] = 1
+    eptm.edge_df["srce"].values[1] = 12
+    eptm.restore()
+    assert_array_equal(eptm.vert_df[eptm.coords], vert_df[eptm.coords])
+    assert_array_equal(eptm.face_df["area"], face_df["area"])
+    assert_array_equal(eptm.edge_df[["srce", "face"]], edge_df[["srce", "face"]])
+
+    # the unrestored state does not share its data with the epithelium
+    assert eptm._bad.face_df.loc[0, "area"] == 123
+    assert eptm._bad.edge_df.loc[0, "face"] == 1
+    eptm._bad.edge_df.loc[0, "trgt"] = 12
+    assert eptm.edge_df.loc[0, "trgt"] == edge_df.loc[0, "trgt"]
+
+    @do_undo
+    def rewire(eptm):
+        eptm.edge_df.loc[0, "trgt"] = 12
+        raise ValueError
+
+    with raises(ValueError):
+        rewire(eptm)
+    assert_array_equal(eptm.edge_df["trgt"], edge_df["trgt"])
+
+
+def test_reset_index():
+    datasets, specs = three_faces_sheet()
+    eptm = Epithelium("3faces_2D", datasets, specs)
+    vert_df = eptm.vert_df
+    eptm.reset_index()
+    # already compact, nothing is copied
+    assert eptm.vert_df is vert_df
+
+    eptm.vert_df.index = eptm.vert_df.index + 10
+    eptm.edge_df[["srce", "trgt"]] += 10
+    eptm.face_df = eptm.face_df.iloc[::-1]
+    eptm.edge_df = eptm.edge_df[eptm.edge_df["face"] != 1].copy()
+    xs = eptm.vert_df.loc[eptm.edge_df["srce"], "x"].to_numpy()
+    eptm.reset_index()
+    assert eptm.Nf == 2
+    assert eptm.Nv == 10
+    assert eptm.vert_df.index.name == "vert"
+    assert eptm.face_df.index.name == "face"
+    assert eptm.edge_df.index.name == "edge"
+    assert set(eptm.edge_df["face"]) == {0, 1}
+    assert_array_equal(eptm.vert_df.loc[eptm.edge_df["srce"], "x"], xs)
+
+
+def test_neighborhoods():
+    grid = hexa_grid2d(6, 4, 3, 3)
+    sheet = Sheet("test", from_2d_voronoi(Voronoi(grid)))
+    assert sheet.get_neighbors(5) == {11}
+    neighbors = sheet.get_neighborhood(5, 2)
+    assert neighbors.index[0] == 1
+    assert set(neighbors.query("order == 1")["face"]) == sheet.get_neighbors(5)
+    both = sheet.get_neighborhoods([5, 0], 2, "face")
+    assert set(both["seed"]) == {5, 0}
+    assert_array_equal(both.query("seed == 5")["face"], neighbors["face"])
+    assert_array_equal(both.query("seed == 5")["order"], neighbors["order"])
+
+    # non contiguous indices
+    sheet = Sheet("3faces", *three_faces_sheet())
+    sheet.face_df.index = sheet.face_df.index * 2 + 10
+    sheet.edge_df["face"] = sheet.edge_df["face"] * 2 + 10
+    assert sheet.get_neighbors(10, "face") == {12, 14}
+    assert sheet.get_neighbors(1, "face") == set()
+    assert sheet.get_neighbors(100, "face") == set()
+    both = sheet.get_neighborhoods([14, 3], 1, "face")
+    assert_array_equal(both["seed"], [14, 14])
+    assert_array_equal(both["face"], [10, 12])
+
+
 def test_settings_getter_setter():
     datasets, specs = three_faces_sheet()
     eptm = Epithelium("3faces_2D", datasets)
@@ -361,6 +465,33 @@ def test_upcast():
     assert_array_equal(eptm.upcast_cell("test_data"), eptm.edge_df["cell"])
 
 
+def test_upcast_out():
+    datasets_2d, specs = three_faces_sheet(zaxis=True)
+    datasets = extrude(datasets_2d)
+    eptm = Epithelium("3faces_3D", datasets, specs)
+
+    srce_pos = eptm.upcast_srce(eptm.vert_df[eptm.coords], out="pos")
+    assert isinstance(srce_pos, np.ndarray)
+    assert_array_equal(srce_pos, eptm.upcast_srce(eptm.vert_df[eptm.coords]))
+    trgt_pos = eptm.upcast_trgt(eptm.vert_df[eptm.coords], out="pos")
+    assert trgt_pos is srce_pos
+    assert_array_equal(trgt_pos, eptm.upcast_trgt(eptm.vert_df[eptm.coords]))
+
+    out = np.zeros(eptm.Ne)
+    assert eptm.upcast_face(eptm.face_df.index.values.astype(float), out=out) is out
+    assert_array_equal(out, eptm.edge_df["face"])
+
+    eptm.reset_topo()
+    assert eptm.upcast_srce(eptm.vert_df[eptm.coords], out="pos") is not srce_pos
+
+    # as without a buffer, a vertex dropped without reset_index raises
+    eptm.vert_df = eptm.vert_df.iloc[:-1]
+    with raises(IndexError):
+        eptm.upcast_srce(eptm.vert_df[eptm.coords])
+    with raises(IndexError):
+        eptm.upcast_srce(eptm.vert_df[eptm.coords], out="pos")
+
+
 def test_summation():
     datasets_2d, specs = three_faces_sheet(zaxis=True)
     datasets = extrude(datasets_2d)
@@ -464,6 +595,97 @@ def test_summation():
     assert_array_equal(eptm.sum_face(data).values.flatten(), sum_face)
 
 
+def test_sum_incidence_cache():
+    datasets_2d, specs = three_faces_sheet(zaxis=True)
+    datasets = extrude(datasets_2d)
+    eptm = Epithelium("3faces_3D", datasets, specs)
+    data = pd.DataFrame(
+        {"a": np.arange(eptm.Ne, dtype=float), "b": np.ones(eptm.Ne)},
+        index=eptm.edge_df.index,
+    )
+    for lvl in ["srce", "trgt", "face", "cell"]:
+        expected = data.groupby(eptm.edge_df[lvl]).sum()
+        summed = eptm._lvl_sum(data, lvl)
+        assert_array_equal(expected.index, summed.index)
+        assert_array_equal(expected.to_numpy(), summed.to_numpy())
+
+    incidence, _ = eptm.get_incidence("face")
+    assert eptm.get_incidence("face")[0] is incidence
+    eptm.reset_topo()
+    assert eptm.get_incidence("face")[0] is not incidence
+    assert incidence.shape == (eptm.Nf, eptm.Ne)
+
+    # in place rewiring with the same number of elements
+    incidence, _ = eptm.get_incidence("face")
+    eptm.edge_df.loc[0, "face"] = 1
+    eptm.edge_df.loc[1, "srce"] = eptm.edge_df.loc[2, "srce"]
+    assert eptm.get_incidence("face")[0] is not incidence
+    for lvl in ["srce", "face"]:
+        expected = data.groupby(eptm.edge_df[lvl]).sum()
+        assert_array_equal(eptm._lvl_sum(data, lvl).to_numpy(), expected.to_numpy())
+    assert_array_equal(
+        eptm.sum_face(data["a"]).to_numpy().ravel(),
+        data["a"].groupby(eptm.edge_df["face"]).sum().to_numpy(),
+    )
+
+
+def test_mean_face_cell():
+    datasets_2d, specs = three_faces_sheet(zaxis=True)
+    datasets = extrude(datasets_2d)
+    eptm = Epithelium("3faces_3D", datasets, specs)
+    data = pd.DataFrame(
+        {"a": np.arange(eptm.Ne, dtype=float), "b": np.ones(eptm.Ne)},
+        index=eptm.edge_df.index,
+    )
+    for lvl, mean in [("face", eptm.mean_face), ("cell", eptm.mean_cell)]:
+        expected = data.groupby(eptm.edge_df[lvl]).mean()
+        averaged = mean(data)
+        assert_array_equal(expected.index, averaged.index)
+        assert_array_equal(expected.columns, averaged.columns)
+        np.testing.assert_allclose(averaged.to_numpy(), expected.to_numpy())
+        np.testing.assert_allclose(
+            mean(data["a"]).to_numpy().ravel(), expected["a"].to_numpy()
+        )
+
+
+def test_topo_version_cache():
+    datasets, specs = three_faces_sheet()
+    sheet = Sheet("3faces", datasets, specs)
+    version = sheet.topo_version
+    next_edges = get_next_edges(sheet)
+    assert sheet._topo_cache["next_edges"][0][0] == version
+    assert_array_equal(get_next_edges(sheet), next_edges)
+
+    calls = []
+    sheet.cached_topo("test", calls.append, 1)
+    sheet.cached_topo("test", calls.append, 1)
+    assert calls == [1]
+
+    sheet.reset_topo()
+    assert sheet.topo_version > version
+    sheet.cached_topo("test", calls.append, 1)
+    assert calls == [1, 1]
+
+    version = sheet.topo_version
+    sheet.reset_index()
+    assert sheet.topo_version > version
+    SheetGeometry.update_all(sheet)
+    sheet.get_extra_indices()
+    east_edges = sheet.east_edges
+    sheet.get_extra_indices()
+    assert sheet.east_edges is east_edges
+
+    # the incidences cached while ordering the edges are dropped
+    datasets, specs = three_faces_sheet()
+    sheet = Sheet("3faces", datasets, specs)
+    sheet.edge_df = sheet.edge_df.sample(frac=1, random_state=1)
+    sheet.reset_index(order=True)
+    assert_array_equal(
+        sheet.sum_face(sheet.edge_df["srce"]).to_numpy().ravel(),
+        sheet.edge_df.groupby("face")["srce"].sum().to_numpy(),
+    )
+
+
 def test_orbits():
     datasets_2d, specs = three_faces_sheet(zaxis=True)
     datasets = extrude(datasets_2d)
@@ -473,6 +695,19 @@ def test_orbits():
     expected_res_face = datasets["edge"].groupby("face").apply(lambda df: df["trgt"])
     assert_array_equal(expected_res_cell, eptm.get_orbits("srce", "cell"))
     assert_array_equal(expected_res_face, eptm.get_orbits("face", "trgt"))
+    pd.testing.assert_series_equal(expected_res_face, eptm.get_orbits("face", "trgt"))
+
+
+def test_ragged_orbits():
+    datasets, specs = three_faces_sheet()
+    eptm = Epithelium("3faces_2D", datasets, specs)
+    faces, offsets, srces = eptm.get_ragged_orbits("face", "srce")
+    assert_array_equal(faces, [0, 1, 2])
+    assert_array_equal(offsets, [0, 6, 12, 18])
+    assert_array_equal(
+        srces[offsets[1] : offsets[2]],
+        eptm.edge_df.loc[eptm.edge_df["face"] == 1, "srce"],
+    )
 
 
 def test_polygons():
@@ -1,5 +1,9 @@
+import pytest
+import numpy as np
+
 from tyssue.generation import three_faces_sheet
-from tyssue import Monolayer, config, Sheet, MonolayerGeometry
+from tyssue import Monolayer, config, Sheet, MonolayerGeometry, SheetGeometry
+from tyssue.dynamics import model_factory
 
 from tyssue.utils import testing
 
@@ -46,3 +50,108 @@ def test_effectors():
 
     for effector in bulk_effectors:
         testing.effector_tester(mono, effector)
+
+
+def test_effectors_precision():
+
+    sheet_dsets, specs = three_faces_sheet()
+    sheet = Sheet("test", sheet_dsets, specs)
+    SheetGeometry.update_all(sheet)
+    mono = Monolayer.from_flat_sheet("test", sheet, config.geometry.bulk_spec())
+    MonolayerGeometry.update_all(mono)
+
+    for effector in sheet_effectors:
+        testing.effector_tester(sheet, effector)
+        testing.precision_tester(sheet, effector)
+
+    for effector in bulk_effectors:
+        testing.effector_tester(mono, effector)
+        testing.precision_tester(mono, effector)
+
+
+def test_model_precision():
+    sheet_dsets, specs = three_faces_sheet()
+    sheet = Sheet("test", sheet_dsets, specs)
+    model = model_factory([LineTension, FaceAreaElasticity])
+    sheet.update_specs(model.specs)
+    SheetGeometry.update_all(sheet)
+    energy = model.compute_energy(sheet)
+    grad = model.compute_gradient(sheet)
+
+    sheet.precision = "float32"
+    assert sheet.edge_df["length"].dtype == np.float32
+    assert sheet.vert_df["x"].dtype == np.float64
+    energy32 = model.compute_energy(sheet)
+    assert isinstance(energy32, np.float64)
+    np.testing.assert_allclose(energy32, energy, rtol=1e-6)
+    np.testing.assert_allclose(
+        model.compute_gradient(sheet), grad, rtol=1e-5, atol=1e-6
+    )
+    with pytest.raises(ValueError):
+        sheet.precision = "float16"
+
+
+def test_hessians():
+    from tyssue import PlanarGeometry
+    from tyssue.generation.shapes import generate_ring
+
+    hessian_effectors = [
+        LengthElasticity,
+        PerimeterElasticity,
+        LineTension,
+        FaceContractility,
+        BorderElasticity,
+    ]
+    rng = np.random.default_rng(0)
+
+    sheet = Sheet("test", *three_faces_sheet())
+    sheet.vert_df[sheet.coords] += rng.normal(scale=0.1, size=(sheet.Nv, 3))
+    for effector in hessian_effectors:
+        sheet.update_specs(effector.specs)
+        testing.hessian_tester(sheet, SheetGeometry, effector)
+
+    ring = generate_ring(6, 1, 2)
+    ring.face_df["is_alive"] = 1
+    ring.vert_df[ring.coords] += rng.normal(scale=0.1, size=(ring.Nv, 2))
+    for effector in hessian_effectors + [FaceAreaElasticity]:
+        ring.update_specs(effector.specs)
+        testing.hessian_tester(ring, PlanarGeometry, effector)
+
+    model = model_factory([LineTension, FaceContractility, FaceAreaElasticity])
+    ring.update_specs(model.specs)
+    testing.hessian_tester(ring, PlanarGeometry, model)
+
+    with pytest.raises(NotImplementedError):
+        FaceAreaElasticity.hessian(sheet)
+
+
+def test_border_elasticity_gradient():
+    from tyssue.dynamics.factory import accumulate_gradients
+
+    rng = np.random.default_rng(1)
+    sheet = Sheet("test", *three_faces_sheet())
+    sheet.update_specs(BorderElasticity.specs)
+    sheet.edge_df["prefered_length"] = 0.8
+    sheet.edge_df["is_border"] = rng.integers(0, 2, size=sheet.Ne)
+    sheet.vert_df[sheet.coords] += rng.normal(scale=0.1, size=(sheet.Nv, 3))
+    SheetGeometry.update_all(sheet)
+
+    grad = accumulate_gradients(sheet, [BorderElasticity.gradient(sheet)])
+    grad = grad.reindex(sheet.vert_df.index, fill_value=0.0).to_numpy().ravel()
+    _, grads = BorderElasticity.energy_and_gradient(sheet)
+    joint = accumulate_gradients(sheet, [grads])
+    joint = joint.reindex(sheet.vert_df.index, fill_value=0.0).to_numpy().ravel()
+
+    pos0 = sheet.vert_df[sheet.coords].to_numpy()
+    step = 1e-6
+    approx = np.zeros(pos0.size)
+    for i in range(pos0.size):
+        for sign in (1, -1):
+            pos = pos0.ravel().copy()
+            pos[i] += sign * step
+            sheet.vert_df[sheet.coords] = pos.reshape(pos0.shape)
+            SheetGeometry.update_all(sheet)
+            approx[i] += sign * BorderElasticity.energy(sheet).sum() / (2 * step)
+
+    np.testing.assert_allclose(grad, approx, rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(joint, approx, rtol=1e-5, atol=1e-8)
@@ -1,10 +1,15 @@
+import numpy as np
 import pandas as pd
 
 from tyssue import config
 from tyssue.core import Epithelium
 from tyssue.generation import three_faces_sheet, extrude
 
-from tyssue.geometry.bulk_geometry import BulkGeometry
+from tyssue.geometry.bulk_geometry import (
+    BulkGeometry,
+    MonolayerGeometry,
+    ClosedMonolayerGeometry,
+)
 
 
 def test_bulk_update_vol():
@@ -136,3 +141,76 @@ def test_mono_update_perimeters():
     # to be found in this column by the method ?
 
     # MonoLayerGeometry.update_all(eptm)
+
+
+def test_fused_update_all():
+    steps = [
+        "update_dcoords",
+        "update_length",
+        "update_ucoords",
+        "update_perimeters",
+        "update_centroid",
+        "update_normals",
+        "update_vol",
+        "update_areas",
+    ]
+    datasets_2d, _ = three_faces_sheet(zaxis=True)
+    datasets = extrude(datasets_2d, method="translation")
+    specs = config.geometry.bulk_spec()
+    for geom in (BulkGeometry, MonolayerGeometry, ClosedMonolayerGeometry):
+        eptm = Epithelium("fused", datasets, specs, coords=["x", "y", "z"])
+        eptm.vert_df["z"] += np.linspace(0, 0.5, eptm.Nv)
+        geom.update_all(eptm)
+        eptm.vert_df[eptm.coords] *= 1.1
+        ref = eptm.copy()
+
+        assert geom._fused_incidences(eptm) is not None
+        geom.update_all(eptm)
+        for step in steps:
+            getattr(geom, step)(ref)
+
+        for elem in ["vert", "edge", "face", "cell"]:
+            df, ref_df = eptm.datasets[elem], ref.datasets[elem]
+            assert set(df.columns) == set(ref_df.columns)
+            cols = [c for c, dtype in ref_df.dtypes.items() if dtype.kind == "f"]
+            np.testing.assert_allclose(
+                df[cols].to_numpy(), ref_df[cols].to_numpy(), rtol=1e-12, atol=1e-12
+            )
+
+    class OtherGeometry(BulkGeometry):
+        @staticmethod
+        def update_vol(eptm):
+            pass
+
+    assert OtherGeometry._fused_incidences(eptm) is None
+
+
+def test_update_precision():
+    datasets_2d, _ = three_faces_sheet(zaxis=True)
+    datasets = extrude(datasets_2d, method="translation")
+    specs = config.geometry.bulk_spec()
+    eptm = Epithelium("precision", datasets, specs, coords=["x", "y", "z"])
+    eptm.vert_df["z"] += np.linspace(0, 0.5, eptm.Nv)
+    ref = eptm.copy()
+    MonolayerGeometry.update_all(ref)
+
+    eptm.precision = "float32"
+    for geom in (MonolayerGeometry, MonolayerGeometry.profiled(steps=True)):
+        eptm32 = eptm.copy()
+        geom.update_all(eptm32)
+        for elem in ["edge", "face", "cell"]:
+            df, ref_df = eptm32.datasets[elem], ref.datasets[elem]
+            cols = [c for c, dtype in ref_df.dtypes.items() if dtype.kind == "f"]
+            assert (df[cols].dtypes == np.float32).all()
+            np.testing.assert_allclose(df[cols], ref_df[cols], rtol=1e-5, atol=1e-6)
+
+
+def test_validate_face_norms():
+    datasets_2d, _ = three_faces_sheet(zaxis=True)
+    datasets = extrude(datasets_2d, method="translation")
+    specs = config.geometry.bulk_spec()
+    eptm = Epithelium("norms", datasets, specs, coords=["x", "y", "z"])
+    BulkGeometry.update_all(eptm)
+    is_outward = BulkGeometry.validate_face_norms(eptm)
+    np.testing.assert_array_equal(is_outward.index, eptm.face_df.index)
+    assert is_outward.all()
@@ -1,7 +1,10 @@
 import os
 
+import numpy as np
+
 from tyssue import Sheet, config
 from tyssue import PlanarGeometry, SheetGeometry
+from tyssue.geometry.base_geometry import update_periodic_dcoords
 from tyssue.io import hdf5
 from tyssue.stores import stores_dir
 
@@ -29,3 +32,19 @@ def test_periodic_planar():
     assert lai.max() < 0.7
     assert sheet.face_df.area.max() < 1.2
     assert sheet.face_df.area.min() > 0.8
+
+
+def test_periodic_dcoords():
+    dsets = hdf5.load_datasets(os.path.join(stores_dir, "planar_periodic8x8.hf5"))
+    specs = config.stores.planar_periodic8x8()
+    sheet = Sheet("periodic", dsets, specs)
+    rng = np.random.default_rng(0)
+    sheet.vert_df[["x", "y"]] += rng.normal(scale=0.5, size=(sheet.Nv, 2))
+    update_periodic_dcoords(sheet)
+
+    for u, (lower, upper) in sheet.settings["boundaries"].items():
+        period = upper - lower
+        assert sheet.vert_df[u].between(lower, upper, inclusive="right").all()
+        assert (sheet.edge_df["d" + u].abs() <= period / 2).all()
+        at_boundary = sheet.edge_df.groupby("face")[f"at_{u}_boundary"].any()
+        assert (sheet.face_df[f"at_{u}_boundary"] == at_boundary).all()
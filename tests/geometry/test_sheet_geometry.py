@@ -1,10 +1,12 @@
 import os
 import numpy as np
 import pandas as pd
+import pytest
 
 
 from tyssue import config, Sheet, SheetGeometry
 from tyssue.generation import three_faces_sheet
+from tyssue.dynamics import effectors, model_factory
 from tyssue.io.hdf5 import load_datasets
 from tyssue.stores import stores_dir
 
@@ -67,3 +69,182 @@ def test_get_phis():
         .groupby("face")
         .apply(lambda df: np.roll(df["trgt"], 1) == df["srce"])
     )
+
+
+def test_fused_update_all():
+    steps = [
+        "update_dcoords",
+        "update_length",
+        "update_ucoords",
+        "update_centroid",
+        "update_height",
+        "update_normals",
+        "update_areas",
+        "update_perimeters",
+        "update_vol",
+    ]
+    for geometry in ["cylindrical", "flat", "spherical", "surfacic"]:
+        sheet = Sheet.planar_sheet_3d("fused", 6, 6, 1, 1, noise=0.2)
+        sheet.settings["geometry"] = geometry
+        sheet.vert_df["z"] = np.linspace(0, 1, sheet.Nv)
+        sheet.vert_df["basal_shift"] = 0.3
+        SheetGeometry.update_all(sheet)
+        sheet.vert_df[sheet.coords] *= 1.1
+        ref = sheet.copy()
+
+        assert SheetGeometry._fused_incidence(sheet) is not None
+        SheetGeometry.update_all(sheet)
+        for step in steps:
+            getattr(SheetGeometry, step)(ref)
+
+        for elem in ["vert", "edge", "face"]:
+            df, ref_df = sheet.datasets[elem], ref.datasets[elem]
+            assert set(df.columns) == set(ref_df.columns)
+            np.testing.assert_allclose(
+                df[ref_df.columns].to_numpy(dtype=float),
+                ref_df.to_numpy(dtype=float),
+                rtol=1e-12,
+                atol=1e-12,
+            )
+
+    # overridden steps are not fused
+    class OtherGeometry(SheetGeometry):
+        @staticmethod
+        def update_vol(sheet):
+            pass
+
+    assert OtherGeometry._fused_incidence(sheet) is None
+
+
+def test_ucoords_use_current_lengths():
+    # the unit vectors used to be divided by the lengths
+    # of the previous update
+    class UnfusedGeometry(SheetGeometry):
+        @staticmethod
+        def update_vol(sheet):
+            SheetGeometry.update_vol(sheet)
+
+    for geom in [SheetGeometry, UnfusedGeometry]:
+        sheet = Sheet.planar_sheet_3d("ucoords", 5, 5, 1, 1, noise=0.2)
+        geom.update_all(sheet)
+        sheet.vert_df[sheet.coords] *= 1.5
+        geom.update_all(sheet)
+
+        ucoords = sheet.edge_df[sheet.ucoords].to_numpy()
+        dcoords = sheet.edge_df[sheet.dcoords].to_numpy()
+        length = sheet.edge_df["length"].to_numpy()
+        np.testing.assert_allclose(np.linalg.norm(ucoords, axis=1), 1.0)
+        np.testing.assert_allclose(ucoords * length[:, None], dcoords)
+
+
+def test_update_local():
+    sheet = Sheet.planar_sheet_3d("local", 8, 8, 1, 1, noise=0.2)
+    sheet.vert_df["z"] = np.linspace(0, 1, sheet.Nv)
+    SheetGeometry.update_all(sheet)
+    SheetGeometry.update_all(sheet)
+    rng = np.random.default_rng(42)
+    for _ in range(3):
+        verts = rng.choice(sheet.Nv, 4, replace=False)
+        sheet.vert_df.loc[verts, sheet.coords] += rng.normal(scale=0.1, size=(4, 3))
+        ref = sheet.copy()
+        SheetGeometry.update_all(ref)
+        SheetGeometry.update_local(sheet, verts)
+        for elem in ["vert", "edge", "face"]:
+            np.testing.assert_allclose(
+                sheet.datasets[elem].to_numpy(dtype=float),
+                ref.datasets[elem][sheet.datasets[elem].columns].to_numpy(dtype=float),
+                rtol=1e-12,
+                atol=1e-12,
+            )
+
+    # the check mode catches a wrong dirty set
+    sheet.vert_df.loc[0, "z"] += 0.5
+    with pytest.raises(ValueError):
+        SheetGeometry.update_local(sheet, [1], check=True)
+    SheetGeometry.update_local(sheet, [0], check=True)
+
+    # the in place local update leaves the backups untouched
+    sheet.backup()
+    length = sheet.edge_df["length"].copy()
+    sheet.vert_df.loc[0, "z"] += 0.5
+    SheetGeometry.update_local(sheet, [0])
+    assert (sheet.edge_df["length"] != length).any()
+    np.testing.assert_array_equal(sheet._backups[-1].datasets["edge"]["length"], length)
+
+
+def test_update_plan():
+    model = model_factory([effectors.LineTension, effectors.FaceAreaElasticity])
+    plan = SheetGeometry.update_plan(model.requires)
+    assert plan == [
+        "update_dcoords",
+        "update_length",
+        "update_ucoords",
+        "update_centroid",
+        "update_normals",
+        "update_areas",
+    ]
+    assert SheetGeometry.update_plan(None) is None
+    assert SheetGeometry.update_plan({"face": ["unknown"]}) is None
+    assert SheetGeometry.restrict({"face": ["vol"]}).update_steps.keys() == {
+        "update_dcoords",
+        "update_centroid",
+        "update_height",
+        "update_normals",
+        "update_areas",
+        "update_vol",
+    }
+
+    sheet = Sheet.planar_sheet_3d("plan", 6, 6, 1, 1, noise=0.2)
+    sheet.update_specs(model.specs)
+    SheetGeometry.update_all(sheet)
+    sheet.vert_df[sheet.coords] *= 1.1
+    ref = sheet.copy()
+    SheetGeometry.update_all(ref)
+    geom = SheetGeometry.restrict(model.requires)
+    assert geom is not SheetGeometry
+    geom.update_all(sheet)
+    np.testing.assert_allclose(sheet.face_df["area"], ref.face_df["area"])
+    np.testing.assert_allclose(sheet.edge_df["length"], ref.edge_df["length"])
+    # volumes are not updated
+    assert not np.allclose(sheet.face_df["vol"], ref.face_df["vol"])
+    np.testing.assert_allclose(
+        model.compute_gradient(sheet), model.compute_gradient(ref)
+    )
+
+    # overridden update_all without declared steps
+    class OtherGeometry(SheetGeometry):
+        @classmethod
+        def update_all(cls, sheet):
+            super().update_all(sheet)
+
+    assert OtherGeometry.restrict(model.requires) is OtherGeometry
+
+
+def test_update_precision():
+    sheet = Sheet.planar_sheet_3d("precision", 6, 6, 1, 1, noise=0.2)
+    sheet.vert_df["z"] = np.linspace(0, 1, sheet.Nv)
+    SheetGeometry.update_all(sheet)
+    sheet.vert_df[sheet.coords] *= 1.1
+    ref = sheet.copy()
+    SheetGeometry.update_all(ref)
+
+    sheet.precision = "float32"
+    # the steps are not fused in the profiled geometry
+    for geom in (SheetGeometry, SheetGeometry.profiled(steps=True)):
+        sheet32 = sheet.copy()
+        geom.update_all(sheet32)
+        for elem in ["edge", "face"]:
+            df, ref_df = sheet32.datasets[elem], ref.datasets[elem]
+            cols = [c for c, dtype in ref_df.dtypes.items() if dtype.kind == "f"]
+            assert (df[cols].dtypes == np.float32).all()
+            # the cross products of long edges cancel out, relative to
+            # the largest value of each column
+            scale = np.maximum(np.abs(ref_df[cols]).max().to_numpy(), 1.0)
+            np.testing.assert_allclose(
+                df[cols] / scale, ref_df[cols] / scale, rtol=1e-5, atol=1e-5
+            )
+
+    SheetGeometry.update_all(sheet)
+    sheet.vert_df.loc[[3, 4], sheet.coords] += 0.1
+    SheetGeometry.update_local(sheet, [3, 4], check=True)
+    assert sheet.edge_df["length"].dtype == np.float32
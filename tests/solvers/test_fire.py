@@ -0,0 +1,46 @@
+import numpy as np
+
+from tyssue import Sheet, PlanarGeometry as geom, config
+from tyssue.dynamics.planar_vertex_model import PlanarModel as model
+from tyssue.generation import three_faces_sheet
+from tyssue.solvers import QSSolver, FIRE
+
+
+def test_fire_quadratic():
+    scales = np.array([1.0, 2.0, 0.5, 4.0])
+
+    def fun(x):
+        return 0.5 * (scales * x ** 2).sum(), scales * x
+
+    fire = FIRE(gtol=1e-8)
+    res = fire.minimize(fun, np.ones(4))
+    assert res.success
+    np.testing.assert_allclose(res.x, 0, atol=1e-7)
+
+    mask = np.array([True, True, False, True])
+    res = FIRE(gtol=1e-8).minimize(fun, np.ones(4), mask=mask)
+    assert res.success
+    np.testing.assert_allclose(res.x, [0, 0, 1, 0], atol=1e-7)
+
+
+def test_fire_solver():
+    datasets, _ = three_faces_sheet()
+    sheet = Sheet("3faces", datasets, config.geometry.planar_spec(), coords=["x", "y"])
+    sheet.update_specs(model.dimensionalize(config.dynamics.quasistatic_plane_spec()))
+    geom.update_all(sheet)
+    sheet.vert_df.loc[0, "is_active"] = 0
+    fixed = sheet.vert_df.loc[0, sheet.coords].copy()
+
+    ref = sheet.copy()
+    QSSolver().find_energy_min(ref, geom, model, options={"gtol": 1e-6})
+
+    res = QSSolver().find_energy_min(
+        sheet, geom, model, method="FIRE", options={"gtol": 1e-6, "maxiter": 500}
+    )
+    assert res["success"]
+    assert "tracker_id" not in sheet.vert_df
+    assert res["num_evaluations"] > 0
+    np.testing.assert_array_equal(sheet.vert_df.loc[0, sheet.coords], fixed)
+    np.testing.assert_allclose(
+        model.compute_energy(sheet), model.compute_energy(ref), rtol=1e-6
+    )
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+
+from tyssue import Sheet, SheetGeometry as geom, config
+from tyssue.config.geometry import cylindrical_sheet
+from tyssue.dynamics import SheetModel as model
+from tyssue.generation import three_faces_sheet
+from tyssue.io.hdf5 import load_datasets
+from tyssue.solvers import QSSolver, LBFGS
+from tyssue.solvers.base import VertexTracker, remap_coordinates
+from tyssue.stores import stores_dir
+from tyssue.topology.sheet_topology import type1_transition
+
+
+def test_lbfgs_quadratic():
+    scales = np.array([1.0, 2.0, 0.5, 4.0])
+
+    def fun(x):
+        return 0.5 * (scales * x ** 2).sum(), scales * x
+
+    lbfgs = LBFGS(gtol=1e-8, ftol=0)
+    res = lbfgs.minimize(fun, np.ones(4))
+    assert res.success
+    assert res.nfev == lbfgs.nfev
+    np.testing.assert_allclose(res.x, 0, atol=1e-7)
+    assert lbfgs.memory
+
+    # the memory pairs on affected coordinates are zeroed
+    indexer = np.array([1, 0, -1, 3])
+    lbfgs.remap(indexer, affected=np.array([False, False, False, True]))
+    for s, y in lbfgs.memory:
+        assert s[2] == s[3] == y[2] == y[3] == 0
+
+
+def test_vertex_tracker():
+    h5store = os.path.join(stores_dir, "small_hexagonal.hf5")
+    datasets = load_datasets(h5store, data_names=["face", "vert", "edge"])
+    sheet = Sheet("emin", datasets, cylindrical_sheet())
+    geom.update_all(sheet)
+    pos0 = sheet.vert_df[sheet.coords].values.ravel()
+
+    tracker = VertexTracker(sheet)
+    type1_transition(sheet, 84)
+    geom.update_all(sheet)
+    indexer, affected = tracker.remap()
+    pos1 = sheet.vert_df[sheet.coords].values.ravel()
+
+    assert indexer.shape == affected.shape == pos1.shape
+    assert affected.sum() >= 2 * sheet.dim
+    assert (~affected).sum() > sheet.dim
+    np.testing.assert_array_equal(pos0[indexer[~affected]], pos1[~affected])
+    remapped = remap_coordinates(pos0, indexer, affected)
+    np.testing.assert_array_equal(remapped[affected], 0)
+
+    tracker.release()
+    assert VertexTracker.column not in sheet.vert_df
+
+
+def test_lbfgs_solver():
+    sheet = Sheet("3faces", *three_faces_sheet())
+    sheet.update_specs(model.dimensionalize(config.dynamics.quasistatic_sheet_spec()))
+    geom.update_all(sheet)
+
+    ref = sheet.copy()
+    QSSolver().find_energy_min(ref, geom, model, options={"gtol": 1e-6})
+
+    solver = QSSolver(with_t1=True)
+    res = solver.find_energy_min(
+        sheet, geom, model, method="L-BFGS", options={"gtol": 1e-6}
+    )
+    assert res["success"]
+    assert res["num_restarts"] == solver.num_restarts
+    assert res["num_evaluations"] > 0
+    assert res["nfev"] > 0
+    assert VertexTracker.column not in sheet.vert_df
+    np.testing.assert_allclose(
+        model.compute_energy(sheet), model.compute_energy(ref), rtol=1e-4
+    )
@@ -37,3 +37,72 @@ def test_solver():
     new_solver = QSSolver(with_collisions=True, with_t1=True, with_t3=True)
     res = new_solver.find_energy_min(sheet, geom, model, **settings["minimize"])
     assert res["success"]
+
+
+def test_newton_krylov():
+    from tyssue import PlanarGeometry
+    from tyssue.dynamics.planar_vertex_model import PlanarModel
+    from tyssue.generation import three_faces_sheet
+
+    datasets, _ = three_faces_sheet()
+    sheet = Sheet("3faces", datasets, config.geometry.planar_spec(), coords=["x", "y"])
+    sheet.update_specs(
+        PlanarModel.dimensionalize(config.dynamics.quasistatic_plane_spec())
+    )
+    PlanarGeometry.update_all(sheet)
+    ref = sheet.copy()
+    QSSolver().find_energy_min(ref, PlanarGeometry, PlanarModel, options={"gtol": 1e-6})
+
+    qs_solver = QSSolver()
+    res = qs_solver.find_energy_min(
+        sheet,
+        PlanarGeometry,
+        PlanarModel,
+        method="trust-krylov",
+        options={"gtol": 1e-6},
+    )
+    assert res["success"]
+    assert res["nit"] < 20
+    # the analytic Hessian was used
+    assert qs_solver._hessian[1] is not None
+    assert abs(res["fun"] - PlanarModel.compute_energy(ref)) < 1e-8
+
+
+def test_position_cache():
+    import numpy as np
+    from tyssue.generation import three_faces_sheet
+    from tyssue.solvers.quasistatic import PositionCache
+
+    cache = PositionCache(maxsize=2)
+    pos = np.arange(6.0)
+    cache.set(pos, energy=1.0)
+    assert cache.get(pos.copy(), "energy") == 1.0
+    assert cache.get(pos, "grad") is None
+    cache.set(pos + 1, energy=2.0)
+    cache.set(pos + 2, energy=3.0)
+    assert len(cache) == 2
+    assert cache.get(pos, "energy") is None
+
+    sheet = Sheet("3faces", *three_faces_sheet())
+    sheet.update_specs(model.dimensionalize(config.dynamics.quasistatic_sheet_spec()))
+    geom.update_all(sheet)
+    qs_solver = QSSolver()
+    pos0 = sheet.vert_df[sheet.coords].values.ravel()
+    energy, grad = qs_solver._opt_energy_and_grad(pos0, sheet, geom, model)
+    hits = qs_solver.cache.hits
+    assert qs_solver._opt_energy(pos0, sheet, geom, model) == energy
+    np.testing.assert_array_equal(qs_solver._opt_grad(pos0, sheet, geom, model), grad)
+    assert qs_solver.cache.hits == hits + 2
+
+    # the gradient is computed at the requested point, not the last one
+    qs_solver._opt_energy(pos0 * 1.01, sheet, geom, model)
+    qs_solver.cache.clear()
+    np.testing.assert_allclose(qs_solver._opt_grad(pos0, sheet, geom, model), grad)
+
+    res = QSSolver(cache_size=0).find_energy_min(sheet, geom, model)
+    assert res["success"]
+    np.testing.assert_array_equal(
+        sheet.vert_df.loc[sheet.vert_df.is_active.astype(bool), sheet.coords]
+        .values.ravel(),
+        res.x,
+    )
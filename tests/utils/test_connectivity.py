@@ -68,3 +68,26 @@ def test_verts_in_cell_connectivity():
     assert ccc[0][ccc[0] == 9].shape == (18,)
     assert ccc[0][ccc[0] == 18].shape == (6,)
     assert ccc[0][ccc[0] == 27].shape == (1,)
+
+
+def test_elem_adjacency():
+    data, specs = three_faces_sheet()
+    sheet = Sheet("test", data, specs)
+    adj = connectivity.elem_adjacency(sheet, "face")
+    expected = np.array([[0, 1, 1], [1, 0, 1], [1, 1, 0]])
+    np.testing.assert_array_equal(adj.toarray(), expected)
+
+    mono = Monolayer("test", extrude(data), bulk_spec())
+    adj = connectivity.elem_adjacency(mono, "cell")
+    np.testing.assert_array_equal(adj.toarray(), expected)
+
+
+def test_neighborhoods():
+    # a chain 0 - 1 - 2 - 3
+    adj = connectivity.sparse.csr_matrix(
+        np.array([[0, 1, 0, 0], [1, 0, 1, 0], [0, 1, 0, 1], [0, 0, 1, 0]])
+    )
+    seed_pos, neighbors, orders = connectivity.neighborhoods(adj, [0, 2], 2)
+    np.testing.assert_array_equal(seed_pos, [0, 0, 1, 1, 1])
+    np.testing.assert_array_equal(neighbors, [1, 2, 1, 3, 0])
+    np.testing.assert_array_equal(orders, [1, 2, 1, 1, 2])
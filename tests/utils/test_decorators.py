@@ -17,3 +17,15 @@ def test_do_undo():
         bad_action(eptm)
     except:
         assert eptm.edge_df.srce.max() == max_srce
+
+
+def test_time_exe(capsys):
+    from tyssue.utils.decorators import time_exe
+
+    @time_exe
+    def action():
+        return 1
+
+    assert action() == 1
+    assert action.__name__ == "action"
+    assert "function : action" in capsys.readouterr().out
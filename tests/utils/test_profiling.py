@@ -0,0 +1,37 @@
+from tyssue import Sheet, SheetGeometry, config
+from tyssue.dynamics import SheetModel as model
+from tyssue.generation import three_faces_sheet
+from tyssue.solvers import QSSolver
+from tyssue.utils import profiling
+
+
+def test_profile():
+    sheet = Sheet("3faces", *three_faces_sheet())
+    sheet.update_specs(model.dimensionalize(config.dynamics.quasistatic_sheet_spec()))
+    SheetGeometry.update_all(sheet)
+
+    records = []
+    with profiling.profile(callback=lambda *args: records.append(args)) as profiler:
+        assert profiling.active_profiler() is profiler
+        QSSolver().find_energy_min(sheet, SheetGeometry, model)
+    assert profiling.active_profiler() is None
+
+    report = profiler.report()
+    assert set(report.columns) == {"calls", "time", "mean_time"}
+    assert report.loc[("solver", "find_energy_min"), "calls"] == 1
+    assert report.loc[("geometry", "SheetGeometry.update_all"), "calls"] > 0
+    for label in model.labels:
+        assert (report.index.get_level_values("name").str.startswith(label)).any()
+    assert len(records) == report["calls"].sum()
+
+
+def test_profiled_steps():
+    sheet = Sheet("3faces", *three_faces_sheet())
+    geom = SheetGeometry.profiled(steps=True)
+    with profiling.profile() as profiler:
+        geom.update_all(sheet)
+    report = profiler.report()
+    assert report.loc[("geometry", "SheetGeometry.update_length"), "calls"] == 1
+    # no profiler, nothing recorded
+    geom.update_all(sheet)
+    assert profiler.report().equals(report)
@@ -9,6 +9,7 @@ from .core.objects import Epithelium
 from .core.sheet import Sheet
 from .core.monolayer import Monolayer, MonolayerWithLamina
 from .core.multisheet import MultiSheet
+from .core.ensemble import Ensemble, parameter_sweep
 from .core.history import History, HistoryHdf5
 from .geometry.planar_geometry import PlanarGeometry
 from .geometry.sheet_geometry import SheetGeometry, ClosedSheetGeometry
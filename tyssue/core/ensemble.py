@@ -0,0 +1,349 @@
+"""
+Ensembles of replicate epithelia
+================================
+
+An :class:`Ensemble` holds replicates of an epithelium sharing the same
+topology, for example the same initial tissue with different noise or
+parameters. The replicates are stacked as disjoint copies in a single
+epithelium of the same class, so that the geometry, energy and gradient
+of all of them are computed by a single call to the usual geometry and
+model methods, which amortizes the per call overhead for small tissues.
+
+:func:`parameter_sweep` uses an ensemble to evaluate a model for many
+parameter sets at once, from the geometry of a single epithelium.
+
+"""
+import logging
+from copy import deepcopy
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# edge_df columns referencing other elements
+_CONNECTIVITY = {"srce": "vert", "trgt": "vert", "face": "face", "cell": "cell"}
+
+
+class Ensemble:
+    """Replicates of an epithelium with identical topologies.
+
+    The stacked epithelium is stored in the `eptm` attribute, each of
+    its datasets has a `"replicate"` column giving the replicate of each
+    element. The elements of the replicates are stored in contiguous
+    blocks, such that the vertex positions can be seen as an array of
+    shape `(num_replicates, Nv, dim)`.
+
+    Note
+    ----
+    Settings level quantities (e.g. the lumen volume) are shared by
+    the stacked replicates, so the geometries and effectors relying on
+    them are not supported.
+
+    Example
+    -------
+    >>> ensemble = Ensemble(sheet, positions=noisy_positions)
+    >>> ensemble.update_geometry(SheetGeometry)
+    >>> energies = ensemble.compute_energy(model)  # shape (num_replicates,)
+
+    """
+
+    def __init__(self, eptm, num_replicates=None, positions=None):
+        """Creates an ensemble of replicates of `eptm`
+
+        Parameters
+        ----------
+        eptm : a :class:`Epithelium` instance, copied as the template
+          of the replicates
+        num_replicates : int, optional
+          the number of replicates, ignored if `positions` is passed
+        positions : array of shape (num_replicates, eptm.Nv, eptm.dim), optional
+          the vertex positions of each replicate, by default those of `eptm`
+        """
+        template = eptm.copy()
+        template.reset_index()
+        template.topo_changed = False
+        base_pos = template.vert_df[template.coords].to_numpy(dtype=float)
+        if positions is None:
+            if num_replicates is None:
+                raise ValueError("Either `num_replicates` or `positions` is needed")
+            positions = np.broadcast_to(base_pos, (num_replicates,) + base_pos.shape)
+        positions = np.asarray(positions, dtype=float)
+        if positions.ndim != 3 or positions.shape[1:] != base_pos.shape:
+            raise ValueError(
+                f"Expected positions of shape (N, {template.Nv}, {template.dim}), "
+                f"got {positions.shape}"
+            )
+
+        self.template = template
+        self.num_replicates = positions.shape[0]
+        # identifiers of the replicates still in the ensemble
+        self.labels = np.arange(self.num_replicates)
+        self.eptm = type(template)(
+            template.identifier + "_ensemble",
+            _stack_datasets(template, self.num_replicates),
+            deepcopy(template.specs),
+            coords=template.coords,
+        )
+        for elem, df in template.datasets.items():
+            if self.eptm.datasets[elem].shape[0] != self.num_replicates * df.shape[0]:
+                raise ValueError(
+                    f"The {type(template).__name__} constructor changed"
+                    " the stacked topology"
+                )
+        self.positions = positions
+
+    def __len__(self):
+        return self.num_replicates
+
+    @property
+    def positions(self):
+        """The vertex positions, as an array of shape
+        (num_replicates, Nv, dim)
+        """
+        pos = self.eptm.vert_df[self.eptm.coords].to_numpy()
+        return pos.reshape((self.num_replicates, -1, self.eptm.dim))
+
+    @positions.setter
+    def positions(self, positions):
+        pos = np.asarray(positions).reshape((-1, self.eptm.dim))
+        for i, c in enumerate(self.eptm.coords):
+            self.eptm.vert_df[c] = pos[:, i]
+
+    def set_param(self, element, column, values):
+        """Sets the `column` of the `element` dataset for all the
+        replicates.
+
+        Parameters
+        ----------
+        element : {'vert' | 'edge' | 'face' | 'cell'}
+        column : str
+        values : scalar, or array of shape (num_replicates,) with one value
+          per replicate, or (num_replicates, n) with one value per element
+        """
+        df = self.eptm.datasets[element]
+        values = np.asarray(values)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        values = np.broadcast_to(values, (self.num_replicates, self._size(element)))
+        df[column] = values.ravel()
+
+    def update_geometry(self, geom):
+        """Updates the geometry of all the replicates with `geom.update_all`"""
+        geom.update_all(self.eptm)
+
+    def compute_energy(self, model, full_output=False):
+        """Computes the energy of each replicate
+
+        Parameters
+        ----------
+        model : a model class, as returned by `model_factory`
+        full_output : bool, default False
+          if True, returns the per replicate energy of each effector,
+          as an array of shape (num_effectors, num_replicates)
+
+        Returns
+        -------
+        energies : array of shape (num_replicates,)
+        """
+        energies = np.array(
+            [
+                self._per_replicate(energy)
+                for energy in model.compute_energy(self.eptm, full_output=True)
+            ]
+        )
+        if full_output:
+            return energies
+        return energies.sum(axis=0)
+
+    def compute_gradient(self, model):
+        """Computes the energy gradient of each replicate, returned as
+        an array of shape (num_replicates, Nv, dim)
+        """
+        grad = model.compute_gradient(self.eptm)
+        return np.asarray(grad, dtype=float).reshape(
+            (self.num_replicates, -1, self.eptm.dim)
+        )
+
+    def diverged(self):
+        """Returns the indices of the replicates whose topology
+        differs from the template's
+        """
+        num = self.num_replicates
+        diverged = np.zeros(num, dtype=bool)
+        offsets = {}
+        for elem, df in self.eptm.datasets.items():
+            rep = df["replicate"].to_numpy()
+            counts = np.bincount(rep, minlength=num)
+            diverged |= counts != self.template.datasets[elem].shape[0]
+            index = df.index.to_numpy()
+            offsets[elem] = np.full(num, index.max(initial=-1) + 1)
+            np.minimum.at(offsets[elem], rep, index)
+
+        edge_df = self.eptm.edge_df
+        rep = edge_df["replicate"].to_numpy()
+        order = np.argsort(rep, kind="stable")
+        order = order[~diverged[rep[order]]]
+        rep = rep[order]
+        mismatch = np.zeros(order.size, dtype=bool)
+        for col, elem in _CONNECTIVITY.items():
+            if elem not in self.eptm.datasets:
+                continue
+            relative = edge_df[col].to_numpy()[order] - offsets[elem][rep]
+            ref = np.tile(self.template.edge_df[col].to_numpy(), num - diverged.sum())
+            mismatch |= relative != ref
+        diverged[rep[mismatch]] = True
+        return np.flatnonzero(diverged)
+
+    def split(self, replicate):
+        """Removes the `replicate` from the ensemble, e.g. after its
+        topology diverged, and returns it as an independent epithelium.
+
+        The replicates after `replicate` are shifted by one, the
+        original identifiers of the remaining replicates are given
+        by the `labels` attribute.
+        """
+        if not 0 <= replicate < self.num_replicates:
+            raise IndexError(f"No replicate {replicate} in the ensemble")
+        label = self.labels[replicate]
+        datasets = {}
+        for elem, df in list(self.eptm.datasets.items()):
+            rep = df["replicate"].to_numpy()
+            mask = rep == replicate
+            datasets[elem] = df[mask].drop(columns="replicate")
+            rest = df[~mask].copy()
+            rest["replicate"] = rep[~mask] - (rep[~mask] > replicate)
+            self.eptm.datasets[elem] = rest
+        self.eptm.reset_index()
+        self.eptm.reset_topo()
+        self.labels = np.delete(self.labels, replicate)
+        self.num_replicates -= 1
+
+        eptm = type(self.template)(
+            f"{self.template.identifier}_{label}",
+            datasets,
+            deepcopy(self.eptm.specs),
+            coords=self.template.coords,
+        )
+        eptm.reset_index()
+        eptm.reset_topo()
+        log.info("Replicate %d split from the ensemble", label)
+        return eptm
+
+    def _size(self, element):
+        return self.template.datasets[element].shape[0]
+
+    def _per_replicate(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size % self.num_replicates:
+            raise ValueError(
+                "Only element level energies can be computed per replicate"
+            )
+        return values.reshape((self.num_replicates, -1)).sum(axis=1, dtype=np.float64)
+
+
+def parameter_sweep(eptm, model, params, gradients=True, full_output=False):
+    """Computes the energy of `eptm` and its gradient for each of the
+    parameter sets in `params`, with a single evaluation of the model
+    on an :class:`Ensemble` of replicates.
+
+    The geometry does not depend on the parameters, it is computed once
+    and must be up to date in `eptm`.
+
+    Note
+    ----
+    The parameter sets are not broadcast over the shared topology: the
+    ensemble holds `len(params)` full copies of the datasets of `eptm`,
+    geometry included, because the effectors read their parameters as
+    columns of those datasets. Memory and computation time thus grow
+    linearly with the number of parameter sets. The gain over a loop on
+    the parameter sets is the Python and pandas overhead of the model
+    evaluation, paid once instead of once per set.
+
+    Parameters
+    ----------
+    eptm : a :class:`Epithelium` instance
+    model : a model class, as returned by `model_factory`
+    params : :class:`pd.DataFrame`
+      one row per parameter set, the columns give the values of the
+      overridden specs columns, either as `(element, column)` pairs
+      or as the column name when it belongs to a single element of
+      `model.specs`, e.g. `"line_tension"` or `("face", "prefered_area")`
+    gradients : bool, default True
+      whether to compute the gradients
+    full_output : bool, default False
+      if True, returns the energy of each effector
+
+    Returns
+    -------
+    energies : :class:`pd.Series` indexed like `params`, or a
+      :class:`pd.DataFrame` with the effector labels as columns if
+      `full_output` is True
+    grads : array of shape (len(params), eptm.Nv, eptm.dim), with the
+      vertices in the order of `eptm.vert_df`, only if `gradients` is True
+
+    Example
+    -------
+    >>> params = pd.DataFrame({"line_tension": [0.1, 0.12, 0.14]})
+    >>> energies, grads = parameter_sweep(sheet, model, params)
+    """
+    ensemble = Ensemble(eptm, num_replicates=params.shape[0])
+    for column in params.columns:
+        element, name = _param_element(column, model.specs)
+        ensemble.set_param(element, name, params[column].to_numpy())
+
+    energies = ensemble.compute_energy(model, full_output=full_output)
+    if full_output:
+        energies = pd.DataFrame(energies.T, index=params.index, columns=model.labels)
+    else:
+        energies = pd.Series(energies, index=params.index)
+    if not gradients:
+        return energies
+    return energies, ensemble.compute_gradient(model)
+
+
+def _param_element(column, specs):
+    """Returns the `(element, name)` of a `parameter_sweep` column"""
+    if isinstance(column, tuple):
+        element, name = column
+    else:
+        elements = [
+            elem
+            for elem, spec in specs.items()
+            if elem != "settings" and column in spec
+        ]
+        if len(elements) != 1:
+            raise ValueError(
+                f"Can't find a single element for the {column} parameter,"
+                " use an (element, column) pair"
+            )
+        element, name = elements[0], column
+    if element == "settings":
+        raise ValueError("Settings parameters can't be swept")
+    return element, name
+
+
+def _stack_datasets(eptm, num_replicates):
+    """Returns the datasets of `num_replicates` disjoint copies of `eptm`,
+    with a `"replicate"` column. `eptm` must have contiguous indices.
+    """
+    sizes = {elem: df.shape[0] for elem, df in eptm.datasets.items()}
+    replicates = np.arange(num_replicates)
+    datasets = {}
+    for elem, df in eptm.datasets.items():
+        stacked = pd.concat([df] * num_replicates, ignore_index=True)
+        stacked.index.name = df.index.name
+        stacked["replicate"] = np.repeat(replicates, sizes[elem])
+        datasets[elem] = stacked
+
+    edge_df = datasets["edge"]
+    rep = edge_df["replicate"].to_numpy()
+    for col, elem in _CONNECTIVITY.items():
+        if col in edge_df and elem in sizes:
+            edge_df[col] += rep * sizes[elem]
+    if "opposite" in edge_df:
+        opposite = edge_df["opposite"].to_numpy()
+        edge_df["opposite"] = np.where(
+            opposite >= 0, opposite + rep * sizes["edge"], opposite
+        )
+    return datasets
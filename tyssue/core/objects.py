@@ -15,6 +15,8 @@ from ..geometry.sheet_geometry import SheetGeometry
 
 log = logging.getLogger(name=__name__)
 
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
 
 class Epithelium:
     """Base class defining a connective tissue in 2D or 3D."""
@@ -148,6 +150,11 @@ class Epithelium:
         self.position_buffer = None
         self.topo_changed = False
         self.is_ordered = False
+        # incremented at each topology change, see `cached_topo`
+        self.topo_version = 0
+        self._topo_cache = {}
+        # edge index and topology columns the cache was built with
+        self._topo_labels = []
 
     @property
     def vert_df(self):
@@ -185,6 +192,7 @@ class Epithelium:
     @edge_df.setter
     def edge_df(self, value):
         self.datasets["edge"] = value
+        self.update_topo_version()
 
     @property
     def cell_df(self):
@@ -223,36 +231,105 @@ class Epithelium:
         return new
 
     def backup(self):
-        """Creates a copy of self and keeps a reference to it
+        """Takes a snapshot of the datasets and specs and keeps it
         in the self._backups deque.
 
+        See :class:`Snapshot` for the cost of a backup.
         """
         log.info("Backing up")
-        self._backups.append(self.copy(deep_copy=True))
+        self._backups.append(Snapshot(self))
 
     def restore(self):
         """Resets the eptithelium data to its last backed up state
 
-        A copy of the current state prior to restoring is kept in the
-        `_bad` attribute for inspection.
+        The unrestored state is kept in the `_bad` attribute for
+        inspection. It owns its datasets, which are not shared with
+        the restored epithelium.
         Calling this method multiple times (without calling backup) will
         go back in the epithelium backups.
         """
 
         log.info("Restoring")
-        log.info(
-            "a copy of the unrestored epithelium is stored in the `_bad` attribute"
-        )
+        log.info("the unrestored epithelium is stored in the `_bad` attribute")
         bck = self._backups.pop()
-        self._bad = self.copy(deep_copy=True)
-        self.datasets = bck.datasets
-        self.specs = bck.specs
+        # The current datasets are handed over, not copied: the
+        # restored ones are the snapshot's own copies
+        self._bad = type(self)(
+            self.identifier + "_bad", self.datasets, specs=self.specs, coords=self.coords
+        )
+        bck.restore(self)
+        self.update_topo_version()
+        if "is_active" in self.vert_df.columns:
+            self.active_verts = self.vert_df[self.vert_df.is_active == 1].index
 
     @property
     def settings(self):
         """Accesses the `specs['settings']` dictionnary."""
         return self.specs["settings"]
 
+    @property
+    def precision(self):
+        """Floating point precision of the edge, face and cell
+        data, either "float64" (the default) or "float32".
+
+        This is stored in `self.settings["precision"]`. Setting it
+        casts the floating point columns of those datasets, see
+        :meth:`apply_precision`.
+        """
+        return self.settings.get("precision", "float64")
+
+    @precision.setter
+    def precision(self, precision):
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"precision should be one of {list(PRECISIONS)}, got {precision}"
+            )
+        self.settings["precision"] = precision
+        self.apply_precision()
+
+    @property
+    def float_dtype(self):
+        """The numpy dtype corresponding to `self.precision`, with which
+        the geometry classes allocate the edge, face and cell data.
+        """
+        return np.dtype(PRECISIONS[self.precision])
+
+    def apply_precision(self):
+        """Casts the floating point columns of the edge, face and
+        cell datasets to `self.precision`.
+
+        The vertex data, in particular the vertex positions optimized
+        by the solvers, are always kept in double precision. This is
+        called when the precision is set or when new columns are added
+        by `update_specs`: the geometry classes then compute their
+        quantities in double precision and allocate them directly with
+        `self.float_dtype`. Reductions over the edges (`sum_face`,
+        `sum_srce`, ...) and model energies are accumulated in double
+        precision.
+
+        Notes
+        -----
+        In single precision, each stored value has a relative error
+        below the float32 unit roundoff u = 2**-24 (about 6e-8). The
+        gradient terms are products of a few stored values summed in
+        double precision, so the error on a vertex gradient is bounded
+        by about 10 u times the sum of the absolute values of its terms.
+        For a well conditioned tissue, this gives a relative error of
+        order 1e-6 on the gradient, compared to double precision.
+        """
+        dtype = self.float_dtype
+        for element in ("edge", "face", "cell"):
+            if element not in self.datasets:
+                continue
+            df = self.datasets[element]
+            to_cast = {
+                col: dtype
+                for col, col_dtype in df.dtypes.items()
+                if col_dtype.kind == "f" and col_dtype != dtype
+            }
+            if to_cast:
+                self.datasets[element] = df.astype(to_cast, copy=False)
+
     def update_specs(self, new, reset=False):
         """Recursively updates the `self.specs` nested dictionnary,
         and set the new values to the corresponding columns
@@ -261,13 +338,78 @@ class Epithelium:
         """
         spec_updater(self.specs, new)
         set_data_columns(self.datasets, new, reset)
+        if self.precision != "float64":
+            self.apply_precision()
+
+    def update_topo_version(self):
+        """Increments `self.topo_version`, which invalidates the
+        topology derived data cached by `cached_topo`.
+
+        This is called by `reset_index` and `reset_topo`. It is also
+        called by `cached_topo` when the edge index or the `srce`,
+        `trgt`, `face` or `cell` columns were modified in place.
+        """
+        self.topo_version += 1
+
+    def _check_topo_labels(self):
+        """Bumps the topology version if the edge index or the edge
+        topology columns differ from the ones stored at the last call.
+        """
+        edge_df = self.edge_df
+        # the index is immutable and cheap to compare if it is a range
+        labels = [edge_df.index] + [
+            edge_df[col].to_numpy()
+            for col in ("srce", "trgt", "face", "cell")
+            if col in edge_df.columns
+        ]
+        stored = self._topo_labels
+        if (
+            len(labels) == len(stored)
+            and labels[0].equals(stored[0])
+            and all(np.array_equal(new, old) for new, old in zip(labels[1:], stored[1:]))
+        ):
+            return
+        if stored:
+            self.update_topo_version()
+        self._topo_labels = labels[:1] + [label.copy() for label in labels[1:]]
+
+    def cached_topo(self, key, func, *args, **kwargs):
+        """Returns the result of `func(*args, **kwargs)`, memoized
+        until the next topology change.
+
+        The cached value is recomputed when `self.topo_version` or the
+        number of elements changed since it was stored, or when the
+        edge index or the `srce`, `trgt`, `face` or `cell` columns were
+        modified, in place or not.
+
+        Parameters
+        ----------
+        key : hashable, identifies the cached value
+        func : callable computing the value
+
+        Note
+        ----
+        The cached object is returned as is, copy it before modifying it.
+        """
+        self._check_topo_labels()
+        topo_key = (self.topo_version, self.Nv, self.Ne, self.Nf, self.Nc)
+        cached = self._topo_cache.get(key)
+        if (cached is not None) and (cached[0] == topo_key):
+            return cached[1]
+        if self._topo_cache and next(iter(self._topo_cache.values()))[0] != topo_key:
+            self._topo_cache = {}
+        value = func(*args, **kwargs)
+        self._topo_cache[key] = (topo_key, value)
+        return value
 
     def update_num_sides(self):
         """Updates the number of half-edges around the faces.
         The data is registered in the `"num_sides"` column of
         `self.face_df`.
         """
-        self.face_df["num_sides"] = self.edge_df.face.value_counts()
+        self.face_df["num_sides"] = self.cached_topo(
+            "num_sides", self.edge_df["face"].value_counts
+        )
 
     def update_num_faces(self):
         """Updates the number of faces around the cells.
@@ -280,14 +422,14 @@ class Epithelium:
         self.cell_df["num_ridges"] = self.edge_df.cell.value_counts()
 
     def update_rank(self):
-        st_connect = connectivity.srce_trgt_connectivity(self)
-        self.vert_df["rank"] = ((st_connect + st_connect.T) > 0).sum(axis=0)
+        self.vert_df["rank"] = self.cached_topo("rank", _rank, self)
 
     def reset_topo(self):
         """Recomputes the number of sides for the faces and the
         number of faces for the cells.
         """
         log.debug("Resetting topology")
+        self.update_topo_version()
         self.update_num_sides()
         if "is_active" in self.vert_df.columns:
             self.active_verts = self.vert_df[self.vert_df.is_active == 1].index
@@ -316,7 +458,40 @@ class Epithelium:
             return self.face_df.shape[0]
         return self.cell_df.shape[0]
 
-    def _upcast(self, idx, df):
+    def get_buffer(self, name, shape, dtype=np.float64):
+        """Returns a persistent scratch array of the given shape and dtype.
+
+        The same array is returned for the same arguments until the
+        next topology change, its content is not initialized.
+
+        Parameters
+        ----------
+        name : str, identifies the buffer
+        shape : tuple of ints
+        dtype : the buffer data type, default np.float64
+        """
+        return self.cached_topo(
+            ("buffer", name, tuple(shape), np.dtype(dtype)), np.empty, shape, dtype
+        )
+
+    def _upcast(self, idx, df, out=None):
+
+        if out is not None:
+            values = np.asarray(df)
+            if isinstance(out, str):
+                out = self.get_buffer(
+                    out, (idx.size,) + values.shape[1:], values.dtype
+                )
+            idx = np.asarray(idx, dtype=np.intp)
+            num = values.shape[0]
+            if idx.size and (idx.max() >= num or idx.min() < -num):
+                raise IndexError(
+                    f"indices out of bounds for a dataset of length {num}, "
+                    "a reset_index might be needed"
+                )
+            # with the bounds checked, mode="wrap" behaves as the default
+            # mode="raise", without its intermediate copy
+            return np.take(values, idx, axis=0, out=out, mode="wrap")
 
         ## Assumes a flat index
         upcast = df.take(idx)
@@ -329,7 +504,7 @@ class Epithelium:
                 upcast = pd.DataFrame(upcast, index=self.edge_df.index)
         return upcast
 
-    def upcast_cols(self, element, columns):
+    def upcast_cols(self, element, columns, out=None):
         """Syntactic sugar to upcast from the epithelium datasets.
 
         Parameters
@@ -340,15 +515,19 @@ class Epithelium:
            taken form self.vert_df
         columns: index
            the column(s) to be taken from the input dataset.
+        out: str or :class:`np.ndarray`, optional
+           see :meth:`upcast_srce`
 
         """
         if element in ["srce", "trgt"]:
             dataset = "vert"
         else:
             dataset = element
-        return self._upcast(self.edge_df[element], self.datasets[dataset][columns])
+        return self._upcast(
+            self.edge_df[element], self.datasets[dataset][columns], out=out
+        )
 
-    def upcast_srce(self, df):
+    def upcast_srce(self, df, out=None):
         """Reindexes input data to self.edge_df.index
         by repeating the values for each source entry.
 
@@ -357,17 +536,22 @@ class Epithelium:
         df : :class:`pd.DataFrame`, :class:`pd.Series` :class:`np.ndarray` or string
           The data to be upcasted. If array like, should have `self.Nv` elements.
           If a string is passed it should be a column of `self.vert_df`
+        out : str or :class:`np.ndarray`, optional
+          If given, the upcast values are written in this array, or in
+          the scratch buffer with this name (see :meth:`get_buffer`), and
+          returned as an array. The buffer is overwritten at the next call
+          with the same name, so copy the result if it needs to be kept.
 
         Returns
         -------
-        upcast_df : :class:`pd.DataFrame` or :class:`pd.Series`
+        upcast_df : :class:`pd.DataFrame`, :class:`pd.Series` or :class:`np.ndarray`
           The value repeated like the values of `self.edge_df["srce"]`
         """
         if isinstance(df, str):
             df = self.vert_df[df]
-        return self._upcast(self.edge_df["srce"], df)
+        return self._upcast(self.edge_df["srce"], df, out=out)
 
-    def upcast_trgt(self, df):
+    def upcast_trgt(self, df, out=None):
         """Reindexes input data to self.edge_df.index
         by repeating the values for each target entry
 
@@ -376,17 +560,22 @@ class Epithelium:
         df : :class:`pd.DataFrame`, :class:`pd.Series` :class:`np.ndarray` or string
           The data to be upcasted. If array like, should have `self.Nv` elements.
           If a string is passed it should be a column of `self.vert_df`
+        out : str or :class:`np.ndarray`, optional
+          If given, the upcast values are written in this array, or in
+          the scratch buffer with this name (see :meth:`get_buffer`), and
+          returned as an array. The buffer is overwritten at the next call
+          with the same name, so copy the result if it needs to be kept.
 
         Returns
         -------
-        upcast_df : :class:`pd.DataFrame` or :class:`pd.Series`
+        upcast_df : :class:`pd.DataFrame`, :class:`pd.Series` or :class:`np.ndarray`
           The value repeated like the values of `self.edge_df["trgt"]`
         """
         if isinstance(df, str):
             df = self.vert_df[df]
-        return self._upcast(self.edge_df["trgt"], df)
+        return self._upcast(self.edge_df["trgt"], df, out=out)
 
-    def upcast_face(self, df):
+    def upcast_face(self, df, out=None):
         """Reindexes input data to self.edge_df.index
         by repeating the values for each face entry
 
@@ -395,18 +584,23 @@ class Epithelium:
         df : :class:`pd.DataFrame`, :class:`pd.Series` :class:`np.ndarray` or string
           The data to be upcasted. If array like, should have `self.Nf` elements.
           If a string is passed it should be a column of `self.face_df`
+        out : str or :class:`np.ndarray`, optional
+          If given, the upcast values are written in this array, or in
+          the scratch buffer with this name (see :meth:`get_buffer`), and
+          returned as an array. The buffer is overwritten at the next call
+          with the same name, so copy the result if it needs to be kept.
 
         Returns
         -------
-        upcast_df : :class:`pd.DataFrame` or :class:`pd.Series`
+        upcast_df : :class:`pd.DataFrame`, :class:`pd.Series` or :class:`np.ndarray`
           The value repeated like the values of `self.edge_df["face"]`
 
         """
         if isinstance(df, str):
             df = self.face_df[df]
-        return self._upcast(self.edge_df["face"], df)
+        return self._upcast(self.edge_df["face"], df, out=out)
 
-    def upcast_cell(self, df):
+    def upcast_cell(self, df, out=None):
         """Reindexes input data to self.edge_df.index
         by repeating the values for each cell entry
 
@@ -415,17 +609,87 @@ class Epithelium:
         df : :class:`pd.DataFrame`, :class:`pd.Series` :class:`np.ndarray` or string
           The data to be upcasted. If array like, should have `self.Nc` elements.
           If a string is passed it should be a column of `self.cell_df`
+        out : str or :class:`np.ndarray`, optional
+          If given, the upcast values are written in this array, or in
+          the scratch buffer with this name (see :meth:`get_buffer`), and
+          returned as an array. The buffer is overwritten at the next call
+          with the same name, so copy the result if it needs to be kept.
 
         Returns
         -------
-        upcast_df : :class:`pd.DataFrame` or :class:`pd.Series`
+        upcast_df : :class:`pd.DataFrame`, :class:`pd.Series` or :class:`np.ndarray`
           The value repeated like the values of `self.edge_df["cell"]`
         """
         if isinstance(df, str):
             df = self.cell_df[df]
-        return self._upcast(self.edge_df["cell"], df)
+        return self._upcast(self.edge_df["cell"], df, out=out)
+
+    def get_incidence(self, lvl):
+        """Returns the sparse incidence matrix between the edges and
+        the `lvl` elements, as computed by
+        :func:`tyssue.utils.connectivity.edge_incidence`, and the index
+        of the elements with at least one edge.
+
+        Both are cached until the next topology change.
+
+        Parameters
+        ----------
+        lvl : {'srce' | 'trgt' | 'face' | 'cell'}
+
+        Returns
+        -------
+        incidence : :class:`scipy.sparse.csr_matrix` of shape (N, self.Ne)
+        present : np.ndarray of ints, the rows of `incidence` with
+          at least one non zero value
+        """
+        return self.cached_topo(("incidence", lvl), _incidence, self, lvl)
 
     def _lvl_sum(self, df, lvl):
+        if isinstance(df, (pd.Series, pd.DataFrame)):
+            if not (
+                df.index is self.edge_df.index or df.index.equals(self.edge_df.index)
+            ):
+                return self._lvl_groupby_sum(df, lvl)
+            if isinstance(df, pd.Series):
+                if df.name == lvl:
+                    return self._lvl_groupby_sum(df, lvl)
+                df = df.to_frame()
+            elif lvl in df.columns:
+                df = df.drop(columns=lvl)
+            dtypes = df.dtypes
+        else:
+            df = np.asarray(df)
+            dtypes = pd.Series([df.dtype])
+
+        kinds = {dtype.kind for dtype in dtypes}
+        if (
+            (not kinds.issubset("biuf"))
+            or (not self.Ne)
+            or (not np.issubdtype(self.edge_df[lvl].dtype, np.integer))
+        ):
+            return self._lvl_groupby_sum(df, lvl)
+
+        incidence, present = self.get_incidence(lvl)
+        values = np.asarray(df, dtype=float).reshape((self.Ne, -1))
+        summed = incidence @ values
+        if present.size != incidence.shape[0]:
+            summed = summed[present]
+        summed = pd.DataFrame(
+            summed,
+            index=pd.Index(present, name=lvl),
+            columns=df.columns if isinstance(df, pd.DataFrame) else None,
+        )
+        # Integer and boolean data stay integers, as with groupby().sum()
+        int_cols = {
+            col: np.int64
+            for col, dtype in zip(summed.columns, dtypes)
+            if dtype.kind in "biu"
+        }
+        if int_cols:
+            summed = summed.astype(int_cols)
+        return summed
+
+    def _lvl_groupby_sum(self, df, lvl):
         df_ = df
         if isinstance(df, np.ndarray):
             df_ = pd.DataFrame(df, index=self.edge_df.index)
@@ -476,6 +740,58 @@ class Epithelium:
         """
         return self._lvl_sum(df, "cell")
 
+    def mean_face(self, df):
+        """Averages the values of the edge-indexed dataframe `df` grouped by
+        the values of `self.edge_df["face"]`
+
+        Returns
+        -------
+        averaged : :class:`pd.DataFrame` the averaged data, indexed by the faces.
+        """
+        return self._lvl_mean(df, "face")
+
+    def mean_cell(self, df):
+        """Averages the values of the edge-indexed dataframe `df` grouped by
+        the values of `self.edge_df["cell"]`
+
+        Returns
+        -------
+        averaged : :class:`pd.DataFrame` the averaged data, indexed by the cells.
+        """
+        return self._lvl_mean(df, "cell")
+
+    def _lvl_mean(self, df, lvl):
+        """Weighted bincounts of the columns of `df` over `lvl`, divided
+        by the number of edges of each element, taken from the cached
+        incidence matrix. Falls back to groupby for non numerical data
+        or non integer labels.
+        """
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
+        columns = df.columns if isinstance(df, pd.DataFrame) else None
+        values = np.asarray(df)
+        labels = self.edge_df[lvl].to_numpy()
+        if (
+            (values.dtype.kind not in "biuf")
+            or (not self.Ne)
+            or (labels.dtype.kind not in "iu")
+            or (labels.min() < 0)
+        ):
+            df_ = pd.DataFrame(values, index=self.edge_df.index, columns=columns)
+            df_[lvl] = labels
+            return df_.groupby(lvl).mean()
+
+        incidence, present = self.get_incidence(lvl)
+        counts = np.diff(incidence.indptr)[present]
+        values = values.reshape((self.Ne, -1))
+        means = np.column_stack(
+            [
+                np.bincount(labels, weights=col, minlength=incidence.shape[0])[present]
+                for col in values.T
+            ]
+        ) / counts[:, np.newaxis]
+        return pd.DataFrame(means, index=pd.Index(present, name=lvl), columns=columns)
+
     def get_orbits(self, center, periph):
         """Returns a dataframe with a `(center, edge)` MultiIndex with `periph`
         elements.
@@ -501,8 +817,68 @@ class Epithelium:
         Name: srce, dtype: int64
 
         """
-        orbits = self.edge_df.groupby(center).apply(lambda df: df[periph])
-        return orbits
+        centers = self.edge_df[center]
+        if centers.dtype.kind not in "iu" or (centers.size and centers.min() < 0):
+            orbits = self.cached_topo(
+                ("orbits", center, periph),
+                self.edge_df.groupby(center).apply,
+                lambda df: df[periph],
+            )
+            return orbits.copy()
+
+        centers, offsets, values = self.get_ragged_orbits(center, periph)
+        incidence, _ = self.get_incidence(center)
+        index = pd.MultiIndex.from_arrays(
+            [
+                np.repeat(centers, np.diff(offsets)),
+                self.edge_df.index[incidence.indices],
+            ],
+            names=[center, self.edge_df.index.name],
+        )
+        return pd.Series(values, index=index, name=periph)
+
+    def get_ragged_orbits(self, center, periph):
+        """Returns the `periph` elements around each `center` element
+        as a ragged array.
+
+        The values for the ith center element are
+        `values[offsets[i]:offsets[i+1]]`, in the order of the edges
+        in `edge_df`. This relies on the cached incidence matrix
+        (see :meth:`get_incidence`), so no per element Python call is
+        made.
+
+        Parameters
+        ----------
+        center : str,
+            the name of the center element for example 'face', 'srce'
+        periph : str,
+            the column of `edge_df` to gather, for example 'trgt', 'cell'
+
+        Returns
+        -------
+        centers : np.ndarray of shape (N,)
+            the center elements having at least one edge, sorted
+        offsets : np.ndarray of shape (N+1,)
+        values : np.ndarray of shape (Ne,)
+
+        Example
+        -------
+        >>> faces, offsets, verts = sheet.get_ragged_orbits('face', 'srce')
+        >>> verts[offsets[0]:offsets[1]]  # vertices of the first face
+        array([0, 1, 2, 3, 4, 5])
+        """
+        incidence, present = self.get_incidence(center)
+        offsets = np.concatenate(
+            (incidence.indptr[present], incidence.indptr[-1:])
+        )
+        values = self.edge_df[periph].to_numpy()[incidence.indices]
+        return present, offsets, values
+
+    def get_simple_index(self):
+        """Returns the index of the non oriented edges, as computed by
+        :func:`get_simple_index`, cached until the next topology change.
+        """
+        return self.cached_topo("simple_index", get_simple_index, self.edge_df).copy()
 
     def idx_lookup(self, elem_id, element):
         """returns the current index of the element with the `"id"` column equal to `elem_id`
@@ -514,12 +890,71 @@ class Epithelium:
         element : {"vert"|"edge"|"face"|"cell"}
           the corresponding dataset.
         """
-        df = self.datasets[element]["id"]
-        idx = df[df == elem_id].index
-        if len(idx):
-            return idx[0]
-        else:
+        pos = self._id_positions([elem_id], element)[0]
+        if pos < 0:
             return None
+        return self.datasets[element].index[pos]
+
+    def idx_lookups(self, elem_ids, element):
+        """returns the current indices of the elements with the `"id"` column
+        equal to each of `elem_ids`, or -1 for the ids that are not found.
+
+        Parameters
+        ----------
+        elem_ids : sequence of ints
+          ids of the elements to retrieve
+        element : {"vert"|"edge"|"face"|"cell"}
+          the corresponding dataset.
+
+        Returns
+        -------
+        idxs : np.ndarray with the same shape as `elem_ids`
+        """
+        pos = self._id_positions(elem_ids, element)
+        idxs = self.datasets[element].index.to_numpy()[np.maximum(pos, 0)]
+        return np.where(pos < 0, -1, idxs)
+
+    def _id_positions(self, elem_ids, element):
+        """Positions of `elem_ids` in the dataset, through an id -> position
+        table cached until the next topology change.
+
+        As the "id" column can be modified without a topology change,
+        found positions are checked against the current ids, and the
+        table is rebuilt if they do not match, or if an id is missing
+        and the column changed since the table was built.
+        """
+        ids = self.datasets[element]["id"].to_numpy()
+        elem_ids = np.asarray(elem_ids)
+        key = ("id_index", element)
+        for _ in range(2):
+            uniques, first, snapshot = self.cached_topo(key, _id_index, ids)
+            if not uniques.size:
+                return np.full(elem_ids.shape, -1)
+            pos = np.minimum(np.searchsorted(uniques, elem_ids), uniques.size - 1)
+            pos = np.where(uniques[pos] == elem_ids, first[pos], -1)
+            found = pos >= 0
+            if np.array_equal(ids[pos[found]], elem_ids[found]) and (
+                found.all() or np.array_equal(ids, snapshot)
+            ):
+                break
+            self._topo_cache.pop(key, None)
+        return pos
+
+    def get_adjacency(self, elem="cell"):
+        """Returns the sparse adjacency matrix between the elements
+        (cells or faces) sharing an edge, as computed by
+        :func:`tyssue.utils.connectivity.elem_adjacency`. Its rows and
+        columns are the positions of the elements in their dataset.
+
+        The matrix is cached until the next topology change.
+        """
+        return self._adjacency(elem)[0]
+
+    def _adjacency(self, elem):
+        """Returns the cached adjacency matrix and the element index
+        it was built with
+        """
+        return self.cached_topo(("adjacency", elem), _adjacency, self, elem)
 
     def get_neighbors(self, elem_id, elem="cell"):
         """Returns the indexes of the adjacent elements (cells or faces) of
@@ -536,17 +971,12 @@ class Epithelium:
         neghbors : set
             the cells (or faces) sharing an edge with the central cell (face)
         """
-
-        topo = self.edge_df[["srce", "trgt", elem]]
-        edges = self.edge_df[self.edge_df[elem] == elem_id][["srce", "trgt"]]
-
-        neighbors = set(
-            topo[
-                (topo["srce"].isin(edges["srce"]) & topo["trgt"].isin(edges["trgt"]))
-                | (topo["srce"].isin(edges["trgt"]) & topo["trgt"].isin(edges["srce"]))
-            ][elem]
-        )
-        return neighbors - {elem_id}
+        adjacency, index = self._adjacency(elem)
+        pos = index.get_indexer([elem_id])[0]
+        if pos < 0:
+            return set()
+        start, stop = adjacency.indptr[pos], adjacency.indptr[pos + 1]
+        return set(index[adjacency.indices[start:stop]].tolist())
 
     def get_neighborhood(self, elem_id, order, elem="cell"):
         """Returns `elem_id` neighborhood up to a degree of `order`
@@ -560,19 +990,40 @@ class Epithelium:
             of the neighboring cell (face), and it's neighboring order
 
         """
+        neighbors = self.get_neighborhoods([elem_id], order, elem)
+        neighbors.index += 1
+        return neighbors[[elem, "order"]]
 
-        neighbors = pd.DataFrame.from_dict({elem: [elem_id], "order": [0]})
+    def get_neighborhoods(self, elem_ids, order, elem="cell"):
+        """Returns the neighborhoods of each element in `elem_ids` up to
+        a degree of `order`, computed at once by a breadth first search
+        over the cached adjacency matrix.
 
-        for k in range(order + 1):
-            for neigh in neighbors[neighbors["order"] == k - 1][elem]:
-                new_neighs = self.get_neighbors(neigh, elem)
-                new_neighs = set(new_neighs).difference(neighbors[elem])
-                orders = np.ones(len(new_neighs), dtype=np.int) * (k)
-                new_neighs = pd.DataFrame.from_dict(
-                    {elem: list(new_neighs), "order": orders}, dtype=np.int
-                )
-                neighbors = pd.concat([neighbors, new_neighs])
-        return neighbors.reset_index(drop=True).loc[1:]
+        Returns
+        -------
+        neighbors : pd.DataFrame with three colums, the index of the
+            seed element, the index of the neighboring cell (face), and
+            its neighboring order, sorted by seed, order and index.
+            The seeds themselves are not included.
+
+        See Also
+        --------
+        tyssue.utils.connectivity.neighborhoods
+        """
+        elem_ids = np.asarray(elem_ids).ravel()
+        adjacency, index = self._adjacency(elem)
+        seeds = index.get_indexer(elem_ids)
+        known = seeds >= 0
+        seed_pos, neighbors, orders = connectivity.neighborhoods(
+            adjacency, seeds[known], order
+        )
+        return pd.DataFrame(
+            {
+                "seed": elem_ids[known][seed_pos],
+                elem: index[neighbors].to_numpy(),
+                "order": orders,
+            }
+        )
 
     def face_polygons(self, coords=None):
         """Returns a pd.Series of arrays with the coordinates the face polygons
@@ -598,7 +1049,12 @@ class Epithelium:
             for c in coords:
                 self.edge_df["s" + c] = self.upcast_srce(self.vert_df[c])
 
-        polys = self.edge_df.groupby("face").apply(lambda df: df[scoords].to_numpy())
+        faces, offsets, _ = self.get_ragged_orbits("face", "srce")
+        incidence, _ = self.get_incidence("face")
+        points = self.edge_df[scoords].to_numpy()[incidence.indices]
+        polys = pd.Series(
+            np.split(points, offsets[1:-1]), index=pd.Index(faces, name="face")
+        )
         return polys
 
     def validate(self):
@@ -724,35 +1180,28 @@ class Epithelium:
         """
         log.debug("reseting index for %s", self.identifier)
         self.topo_changed = True
+        self.update_topo_version()
         # remove disconnected vertices and faces
-        self.vert_df = self.vert_df.reindex(
-            set(self.edge_df.srce).union(self.edge_df.trgt)
+        srce, trgt = self.edge_df["srce"].to_numpy(), self.edge_df["trgt"].to_numpy()
+        self.vert_df, new_verts = _compact(
+            self.vert_df, np.concatenate((srce, trgt)), "vert"
         )
-        self.face_df = self.face_df.reindex(set(self.edge_df.face))
-
-        new_vidx = pd.Series(np.arange(self.vert_df.shape[0]), index=self.vert_df.index)
-
-        self.edge_df["srce"] = new_vidx.reindex(self.edge_df["srce"]).values.astype(int)
-        self.edge_df["trgt"] = new_vidx.reindex(self.edge_df["trgt"]).values.astype(int)
-
-        new_fidx = pd.Series(np.arange(self.face_df.shape[0]), index=self.face_df.index)
+        if new_verts is not None:
+            self.edge_df["srce"] = new_verts[: srce.size]
+            self.edge_df["trgt"] = new_verts[srce.size :]
 
-        self.edge_df["face"] = new_fidx.loc[self.edge_df["face"]].values.astype(int)
-
-        self.vert_df.reset_index(drop=True, inplace=True)
-        self.vert_df.index.name = "vert"
-
-        self.face_df.reset_index(drop=True, inplace=True)
-        self.face_df.index.name = "face"
+        self.face_df, new_faces = _compact(
+            self.face_df, self.edge_df["face"].to_numpy(), "face"
+        )
+        if new_faces is not None:
+            self.edge_df["face"] = new_faces
 
         if "cell" in self.data_names:
-            self.cell_df = self.cell_df.reindex(set(self.edge_df["cell"]))
-            new_cidx = pd.Series(
-                np.arange(self.cell_df.shape[0]), index=self.cell_df.index
+            self.cell_df, new_cells = _compact(
+                self.cell_df, self.edge_df["cell"].to_numpy(), "cell"
             )
-            self.edge_df["cell"] = new_cidx.loc[self.edge_df["cell"]].values
-            self.cell_df.reset_index(drop=True, inplace=True)
-            self.cell_df.index.name = "cell"
+            if new_cells is not None:
+                self.edge_df["cell"] = new_cells
 
         if order:
             if self.dim == 2:
@@ -770,6 +1219,8 @@ class Epithelium:
 
         self.edge_df.reset_index(drop=True, inplace=True)
         self.edge_df.index.name = "edge"
+        # the incidences cached while ordering the edges are out of date
+        self.update_topo_version()
 
     def triangular_mesh(self, coords=None, return_mask=False):
         """
@@ -834,8 +1285,12 @@ class Epithelium:
 
         """
         vertices = self.vert_df[coords]
-        faces = self.edge_df.groupby("face").apply(lambda df: list(df["srce"]))
-        faces = faces.dropna()
+        _, offsets, srces = self.get_ragged_orbits("face", "srce")
+        srces = srces.tolist()
+        faces = pd.Series(
+            [srces[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])],
+            dtype=object,
+        )
 
         if vertex_normals:
             normals = (
@@ -879,6 +1334,83 @@ class Epithelium:
         self.face_df.loc[face_pairs[:, 1], "opposite"] = face_pairs[:, 0]
 
 
+class Snapshot:
+    """Saved state of an epithelium, as stored by `Epithelium.backup`.
+
+    A snapshot holds copies of the datasets and specs and the
+    `is_ordered` flag, without instanciating a new epithelium.
+
+    The datasets are deep copied, so that no modification of the
+    epithelium, in place or not, reaches the snapshot. When pandas
+    copy-on-write mode is on (pandas 3 and above, or
+    `pd.options.mode.copy_on_write = True`), pandas already copies
+    the data shared between dataframes before modifying it, and
+    the copies are shallow.
+    """
+
+    def __init__(self, eptm):
+        deep = not _copy_on_write()
+        self.datasets = {
+            element: df.copy(deep=deep) for element, df in eptm.datasets.items()
+        }
+        self.specs = deepcopy(eptm.specs)
+        self.is_ordered = eptm.is_ordered
+
+    def restore(self, eptm):
+        """Sets the state of `eptm` to the saved one.
+
+        The datasets are handed over to `eptm`, a snapshot
+        should only be restored once.
+        """
+        eptm.datasets = dict(self.datasets)
+        eptm.specs = self.specs
+        eptm.is_ordered = self.is_ordered
+
+
+def _copy_on_write():
+    """Returns True if pandas copy-on-write mode is always on"""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:
+        # pandas < 1.5
+        return False
+
+
+def _compact(df, labels, name):
+    """Restricts `df` to the sorted unique `labels` and gives it a
+    contiguous index.
+
+    Returns the new dataframe and the labels mapped to their new
+    positions, or None in place of the latter if the index was already
+    contiguous and fully referenced, in which case `df` is returned as is.
+    """
+    if labels.dtype.kind in "iu" and labels.size and labels.min() >= 0:
+        # O(N) alternative to np.unique for non negative integer labels
+        present = np.zeros(labels.max() + 1, dtype=bool)
+        present[labels] = True
+        used = np.flatnonzero(present)
+    else:
+        used = np.unique(labels)
+    index = df.index
+    if (
+        used.size == index.size
+        and (not used.size or (used[0] == 0 and used[-1] == used.size - 1))
+        and (not index.size or (index[0] == 0 and index[-1] == index.size - 1))
+        and index.is_monotonic_increasing
+        and index.is_unique
+    ):
+        df.index.name = name
+        return df, None
+
+    df = df.reindex(used)
+    new_labels = df.index.get_indexer(labels).astype(int)
+    df.reset_index(drop=True, inplace=True)
+    df.index.name = name
+    return df, new_labels
+
+
 def get_opposite_faces(eptm):
     warnings.warn("Deprecated, use `eptm.get_opposite_faces()` instead")
     eptm.get_opposite_faces()
@@ -919,6 +1451,10 @@ def get_next_edges(sheet):
     returns a pd.Series with the index of the next
     edge for each edge
     """
+    return sheet.cached_topo("next_edges", _get_next_edges, sheet).copy()
+
+
+def _get_next_edges(sheet):
     next_e = sheet.edge_df.groupby("face").apply(_next_edge)
     next_e.index = next_e.index.droplevel("face")
     return next_e.sort_index()
@@ -926,14 +1462,38 @@ def get_next_edges(sheet):
 
 def get_prev_edges(sheet):
     """
-    returns a pd.Series with the index of the next
+    returns a pd.Series with the index of the previous
     edge for each edge
     """
+    return sheet.cached_topo("prev_edges", _get_prev_edges, sheet).copy()
+
+
+def _get_prev_edges(sheet):
     prev_e = sheet.edge_df.groupby("face").apply(_prev_edge)
     prev_e.index = prev_e.index.droplevel("face")
     return prev_e.sort_index()
 
 
+def _incidence(eptm, lvl):
+    incidence = connectivity.edge_incidence(eptm, lvl)
+    present = np.flatnonzero(np.diff(incidence.indptr))
+    return incidence, present
+
+
+def _adjacency(eptm, elem):
+    return connectivity.elem_adjacency(eptm, elem), eptm.datasets[elem].index
+
+
+def _id_index(ids):
+    uniques, first = np.unique(ids, return_index=True)
+    return uniques, first, ids.copy()
+
+
+def _rank(eptm):
+    st_connect = connectivity.srce_trgt_connectivity(eptm)
+    return ((st_connect + st_connect.T) > 0).sum(axis=0)
+
+
 def get_simple_index(edge_df):
     """
     returns a subset of the edge_df index corresponding
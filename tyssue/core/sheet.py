@@ -56,10 +56,16 @@ class Sheet(Epithelium):
     def reset_topo(self):
         super().reset_topo()
         if "opposite" in self.edge_df.columns:
-            self.edge_df["opposite"] = get_opposite(self.edge_df)
+            self.get_opposite()
 
     def get_opposite(self):
-        self.edge_df["opposite"] = get_opposite(self.edge_df)
+        """Sets the `"opposite"` column of `self.edge_df`, see
+        :func:`get_opposite`. The result is cached until the next
+        topology change.
+        """
+        self.edge_df["opposite"] = self.cached_topo(
+            "opposite", get_opposite, self.edge_df
+        )
 
     def get_neighbors(self, face, elem="face"):
         """Returns the faces adjacent to `face`."""
@@ -110,6 +116,9 @@ class Sheet(Epithelium):
           with 1 at the free and east half-edges and -1
           at the opposite half-edges.
 
+        Those indices are cached and only recomputed after a
+        topology change.
+
         Notes
         -----
 
@@ -125,7 +134,15 @@ class Sheet(Epithelium):
           we'll just assert it worked.
         """
 
-        self.edge_df["opposite"] = get_opposite(self.edge_df)
+        extra_indices = self.cached_topo("extra_indices", self._get_extra_indices)
+        for name, value in extra_indices.items():
+            setattr(self, name, value)
+        if "opposite" not in self.edge_df.columns:
+            self.get_opposite()
+
+    def _get_extra_indices(self):
+
+        self.get_opposite()
 
         # noise to avoid degeneracies
         noise = np.random.normal(loc=1.0, scale=1e-10, size=(self.Ne, self.dim))
@@ -181,6 +198,22 @@ class Sheet(Epithelium):
         self.anti_sym = pd.Series(np.ones(self.Ne), index=self.edge_df.index)
         self.anti_sym.loc[self.west_edges] = -1
         self.edge_df[self.dcoords] /= noise
+        return {
+            name: getattr(self, name)
+            for name in (
+                "dble_edges",
+                "east_edges",
+                "west_edges",
+                "free_edges",
+                "sgle_edges",
+                "srtd_edges",
+                "wrpd_edges",
+                "Ni",
+                "Nd",
+                "No",
+                "anti_sym",
+            )
+        }
 
     def sort_edges_eastwest(self):
         """reorder edges such the free edges are first,
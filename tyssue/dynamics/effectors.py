@@ -1,8 +1,12 @@
 """
 Generic forces and energies
 """
+import re
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
+from scipy import sparse
 
 from ..utils import to_nd
 from . import units
@@ -13,10 +17,80 @@ from .sheet_gradients import height_grad, area_grad
 from .bulk_gradients import volume_grad, lumen_volume_grad
 
 
+@lru_cache(maxsize=None)
+def _parse_product(expr):
+    """Parses a product of columns and numbers such as
+    `"length_elasticity * is_active / 2"`.
+
+    Returns a tuple `(factor, numerator columns, denominator columns)`,
+    or None if `expr` is not such a product.
+    """
+    tokens = re.split(r"\s*([*/])\s*", expr.strip())
+    factor = 1.0
+    num, den = [], []
+    operator = "*"
+    for i, token in enumerate(tokens):
+        if i % 2:
+            operator = token
+            continue
+        try:
+            value = float(token)
+        except ValueError:
+            if not token.isidentifier():
+                return None
+            (num if operator == "*" else den).append(token)
+            continue
+        factor = factor * value if operator == "*" else factor / value
+    return factor, tuple(num), tuple(den)
+
+
+def column_product(element_df, expr):
+    """Evaluates the product of columns `expr` (see `_parse_product`)
+    on `element_df` with numpy, without going through `DataFrame.eval`.
+    Other expressions are passed to `element_df.eval`.
+
+    Returns
+    -------
+    values : np.ndarray
+    """
+    parsed = _parse_product(expr)
+    if parsed is None:
+        return element_df.eval(expr).to_numpy()
+    factor, num, den = parsed
+    if num:
+        values = element_df[num[0]].to_numpy()
+        # always returns a new floating point array
+        values = values.astype(values.dtype if values.dtype.kind == "f" else float)
+    else:
+        values = np.ones(element_df.shape[0])
+    for col in num[1:]:
+        values = values * element_df[col].to_numpy()
+    for col in den:
+        values = values / element_df[col].to_numpy()
+    if factor != 1.0:
+        values = values * factor
+    return values
+
+
 def elastic_force(element_df, var, elasticity, prefered):
-    params = {"x": var, "K": elasticity, "x0": prefered}
-    force = element_df.eval("{K} * ({x} - {x0})".format(**params))
-    return force
+    force = column_product(element_df, elasticity) * (
+        column_product(element_df, var) - column_product(element_df, prefered)
+    )
+    return pd.Series(force, index=element_df.index)
+
+
+def elastic_terms(element_df, var, elasticity, prefered):
+    """Returns the results of `elastic_energy` and `elastic_force`,
+    computing the elasticity and deviation arrays only once.
+    """
+    elasticity = column_product(element_df, elasticity)
+    deviation = column_product(element_df, var) - column_product(element_df, prefered)
+    energy = 0.5 * elasticity * deviation ** 2
+    force = elasticity * deviation
+    return (
+        pd.Series(energy, index=element_df.index),
+        pd.Series(force, index=element_df.index),
+    )
 
 
 def _elastic_force(element_df, x, elasticity, prefered):
@@ -25,9 +99,13 @@ def _elastic_force(element_df, x, elasticity, prefered):
 
 
 def elastic_energy(element_df, var, elasticity, prefered):
-    params = {"x": var, "K": elasticity, "x0": prefered}
-    energy = element_df.eval("0.5 * {K} * ({x} - {x0}) ** 2".format(**params))
-    return energy
+    energy = (
+        0.5
+        * column_product(element_df, elasticity)
+        * (column_product(element_df, var) - column_product(element_df, prefered))
+        ** 2
+    )
+    return pd.Series(energy, index=element_df.index)
 
 
 def _elastic_energy(element_df, x, elasticity, prefered):
@@ -35,6 +113,120 @@ def _elastic_energy(element_df, x, elasticity, prefered):
     return np.array(energy)
 
 
+def _vert_positions(eptm, col):
+    """Positions in `vert_df` of the source or target (`col`) vertices"""
+    return eptm.vert_df.index.get_indexer(eptm.edge_df[col])
+
+
+def _unit_vectors(eptm):
+    """Returns the edges unit vectors and lengths, computed
+    from the current `dcoords`
+    """
+    dcoords = eptm.edge_df[eptm.dcoords].to_numpy(dtype=float)
+    length = np.linalg.norm(dcoords, axis=1)
+    safe = np.where(length > 0, length, 1.0)
+    return dcoords / safe[:, np.newaxis], length
+
+
+def _face_edge_pairs(eptm):
+    """Returns the positions of all the ordered pairs of edges
+    of the same face
+    """
+    face = eptm.edge_df["face"].to_numpy()
+    order = np.argsort(face, kind="stable")
+    _, start, counts = np.unique(face[order], return_index=True, return_counts=True)
+    sizes = counts ** 2
+    pair_face = np.repeat(np.arange(counts.size), sizes)
+    offset = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    num = counts[pair_face]
+    first = order[start[pair_face] + offset // num]
+    second = order[start[pair_face] + offset % num]
+    return first, second
+
+
+def _edge_blocks(eptm, d_energy, d2_energy):
+    """Hessian blocks of an energy sum_e E_e(l_e) of the edge lengths,
+    given the first and second derivatives of E_e as arrays over the edges.
+
+    Returns
+    -------
+    rows, cols, blocks : lists of arrays, see `_assemble_hessian`
+    """
+    u, length = _unit_vectors(eptm)
+    uu = u[:, :, np.newaxis] * u[:, np.newaxis, :]
+    d_energy = np.where(length > 0, d_energy / np.where(length > 0, length, 1.0), 0)
+    blocks = np.asarray(d2_energy)[:, np.newaxis, np.newaxis] * uu + d_energy[
+        :, np.newaxis, np.newaxis
+    ] * (np.eye(eptm.dim) - uu)
+    srce = _vert_positions(eptm, "srce")
+    trgt = _vert_positions(eptm, "trgt")
+    return (
+        [srce, trgt, srce, trgt],
+        [srce, trgt, trgt, srce],
+        [blocks, blocks, -blocks, -blocks],
+    )
+
+
+def _face_outer_blocks(eptm, d2_energy, grad_srce, grad_trgt):
+    """Hessian blocks E_f'' grad(Q_f) grad(Q_f)^T of an energy sum_f E_f(Q_f)
+    of a face quantity Q_f, given the second derivative of E_f as an array
+    over the faces, and the gradient of Q_f as the contributions of each
+    of its edges to their source and target vertices (arrays of shape
+    (Ne, dim)).
+    """
+    first, second = eptm.cached_topo("face_edge_pairs", _face_edge_pairs, eptm)
+    d2_energy = eptm.upcast_face(
+        pd.Series(d2_energy, index=eptm.face_df.index)
+    ).to_numpy()[first]
+    verts = {
+        "srce": _vert_positions(eptm, "srce"),
+        "trgt": _vert_positions(eptm, "trgt"),
+    }
+    grads = {"srce": np.asarray(grad_srce), "trgt": np.asarray(grad_trgt)}
+    rows, cols, blocks = [], [], []
+    for a in verts:
+        for b in verts:
+            rows.append(verts[a][first])
+            cols.append(verts[b][second])
+            blocks.append(
+                d2_energy[:, np.newaxis, np.newaxis]
+                * grads[a][first, :, np.newaxis]
+                * grads[b][second, np.newaxis, :]
+            )
+    return rows, cols, blocks
+
+
+def _assemble_hessian(eptm, rows, cols, blocks):
+    """Assembles the (dim, dim) `blocks` coupling the vertices at positions
+    `rows` and `cols` of `vert_df` in a sparse matrix of shape
+    (Nv * dim, Nv * dim), summing the duplicated blocks.
+    """
+    dim = eptm.dim
+    size = eptm.Nv * dim
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    blocks = np.concatenate(blocks)
+    offsets = np.arange(dim)
+    row_idx = rows[:, np.newaxis, np.newaxis] * dim + offsets[np.newaxis, :, np.newaxis]
+    col_idx = cols[:, np.newaxis, np.newaxis] * dim + offsets[np.newaxis, np.newaxis, :]
+    row_idx, col_idx = np.broadcast_arrays(row_idx, col_idx)
+    return sparse.coo_matrix(
+        (blocks.ravel(), (row_idx.ravel(), col_idx.ravel())), shape=(size, size)
+    ).tocsr()
+
+
+def _perimeter_hessian(eptm, d_energy, d2_energy):
+    """Hessian of an energy sum_f E_f(P_f) of the face perimeters, given
+    the first and second derivatives of E_f as arrays over the faces.
+    """
+    u, _ = _unit_vectors(eptm)
+    d_edge = eptm.upcast_face(pd.Series(d_energy, index=eptm.face_df.index))
+    edge_blocks = _edge_blocks(eptm, d_edge.to_numpy(), np.zeros(eptm.Ne))
+    outer_blocks = _face_outer_blocks(eptm, d2_energy, -u, u)
+    return _assemble_hessian(
+        eptm, *(e + o for e, o in zip(edge_blocks, outer_blocks))
+    )
+
+
 class AbstractEffector:
     """ The effector class is used by model factories
     to construct a model.
@@ -49,6 +241,9 @@ class AbstractEffector:
 
     label = "Abstract effector"
     element = None  # cell, face, edge or vert
+    # geometrical quantities read by the effector, per element,
+    # see `BaseGeometry.update_plan`; None if unknown
+    requires = None
     specs = {"cell": {}, "face": {}, "edge": {}, "vert": {}}
 
     @staticmethod
@@ -63,6 +258,26 @@ class AbstractEffector:
     def get_nrj_norm(specs):
         raise NotImplementedError
 
+    @staticmethod
+    def hessian(eptm):
+        """Returns the Hessian of the effector's energy as a sparse matrix
+        of shape (eptm.Nv * eptm.dim, eptm.Nv * eptm.dim), the vertices
+        being ordered as in `vert_df` and their coordinates contiguous.
+
+        This is optional, effectors without an analytic Hessian raise
+        NotImplementedError.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def energy_and_gradient(cls, eptm):
+        """Returns the energy and the gradient of the effector.
+
+        Effectors can override this method to share the intermediate
+        quantities of both computations.
+        """
+        return cls.energy(eptm), cls.gradient(eptm)
+
 
 #     @classmethod
 #     @property
@@ -82,6 +297,7 @@ class LengthElasticity(AbstractEffector):
     label = "Length elasticity"
     magnitude = "length_elasticity"
     element = "edge"
+    requires = {"edge": ("length", "ucoords")}
     spatial_ref = "prefered_length", units.length
 
     specs = {
@@ -113,9 +329,30 @@ class LengthElasticity(AbstractEffector):
         kl_l0 = elastic_force(
             eptm.edge_df, "length", "length_elasticity * is_active", "prefered_length"
         )
-        grad = eptm.edge_df[eptm.ucoords] * to_nd(kl_l0, eptm.dim)
-        grad.columns = ["g" + u for u in eptm.coords]
-        return -grad, grad
+        return _length_gradient(eptm, kl_l0)
+
+    @staticmethod
+    def energy_and_gradient(eptm):
+        energy, kl_l0 = elastic_terms(
+            eptm.edge_df, "length", "length_elasticity * is_active", "prefered_length"
+        )
+        return energy, _length_gradient(eptm, kl_l0)
+
+    @staticmethod
+    def hessian(eptm):
+        elasticity = column_product(eptm.edge_df, "length_elasticity * is_active")
+        kl_l0 = elastic_force(
+            eptm.edge_df, "length", "length_elasticity * is_active", "prefered_length"
+        )
+        return _assemble_hessian(
+            eptm, *_edge_blocks(eptm, kl_l0.to_numpy(), elasticity)
+        )
+
+
+def _length_gradient(eptm, kl_l0):
+    grad = eptm.edge_df[eptm.ucoords] * to_nd(kl_l0, eptm.dim)
+    grad.columns = ["g" + u for u in eptm.coords]
+    return -grad, grad
 
 
 class PerimeterElasticity(AbstractEffector):
@@ -126,6 +363,7 @@ class PerimeterElasticity(AbstractEffector):
     magnitude = "perimeter_elasticity"
     label = "Perimeter Elasticity"
     element = "face"
+    requires = {"face": ("perimeter",), "edge": ("ucoords",)}
     specs = {
         "face": {
             "is_alive": 1,
@@ -139,24 +377,56 @@ class PerimeterElasticity(AbstractEffector):
 
     @staticmethod
     def energy(eptm):
-        return eptm.face_df.eval(
-            "0.5 * is_alive"
-            "* perimeter_elasticity"
-            "* (perimeter - prefered_perimeter)** 2"
+        return elastic_energy(
+            eptm.face_df,
+            "perimeter",
+            "is_alive * perimeter_elasticity",
+            "prefered_perimeter",
         )
 
     @staticmethod
     def gradient(eptm):
 
-        gamma_ = eptm.face_df.eval(
-            "perimeter_elasticity * is_alive" "*  (perimeter - prefered_perimeter)"
+        gamma_ = elastic_force(
+            eptm.face_df,
+            "perimeter",
+            "perimeter_elasticity * is_alive",
+            "prefered_perimeter",
         )
-        gamma = eptm.upcast_face(gamma_)
+        return _tension_gradient(eptm, gamma_)
+
+    @staticmethod
+    def energy_and_gradient(eptm):
+        energy, gamma_ = elastic_terms(
+            eptm.face_df,
+            "perimeter",
+            "is_alive * perimeter_elasticity",
+            "prefered_perimeter",
+        )
+        return energy, _tension_gradient(eptm, gamma_)
+
+    @staticmethod
+    def hessian(eptm):
+        elasticity = column_product(eptm.face_df, "perimeter_elasticity * is_alive")
+        gamma_ = elastic_force(
+            eptm.face_df,
+            "perimeter",
+            "perimeter_elasticity * is_alive",
+            "prefered_perimeter",
+        )
+        return _perimeter_hessian(eptm, gamma_.to_numpy(), elasticity)
 
-        grad_srce = -eptm.edge_df[eptm.ucoords] * to_nd(gamma, len(eptm.coords))
-        grad_srce.columns = ["g" + u for u in eptm.coords]
-        grad_trgt = -grad_srce
-        return grad_srce, grad_trgt
+
+def _tension_gradient(eptm, gamma_):
+    """Gradient of a face level line tension `gamma_`
+    applied to the face edges
+    """
+    gamma = eptm.upcast_face(gamma_, out="face_factor")
+
+    grad_srce = -eptm.edge_df[eptm.ucoords] * to_nd(gamma, len(eptm.coords))
+    grad_srce.columns = ["g" + u for u in eptm.coords]
+    grad_trgt = -grad_srce
+    return grad_srce, grad_trgt
 
 
 class FaceAreaElasticity(AbstractEffector):
@@ -166,6 +436,10 @@ class FaceAreaElasticity(AbstractEffector):
     magnitude = "area_elasticity"
     label = "Area elasticity"
     element = "face"
+    requires = {
+        "face": ("area",),
+        "edge": ("sub_area", "scoords", "tcoords", "fcoords", "ncoords"),
+    }
     specs = {
         "face": {
             "is_alive": 1,
@@ -193,20 +467,58 @@ class FaceAreaElasticity(AbstractEffector):
         ka_a0_ = elastic_force(
             eptm.face_df, "area", "area_elasticity * is_alive", "prefered_area"
         )
-        ka_a0 = to_nd(eptm.upcast_face(ka_a0_), len(eptm.coords))
+        return _face_area_gradient(eptm, ka_a0_)
 
-        if len(eptm.coords) == 2:
-            grad_a_srce, grad_a_trgt = area_grad2d(eptm)
-        elif len(eptm.coords) == 3:
-            grad_a_srce, grad_a_trgt = area_grad(eptm)
+    @staticmethod
+    def energy_and_gradient(eptm):
+        energy, ka_a0_ = elastic_terms(
+            eptm.face_df, "area", "area_elasticity * is_alive", "prefered_area"
+        )
+        return energy, _face_area_gradient(eptm, ka_a0_)
 
-        grad_a_srce = ka_a0 * grad_a_srce
-        grad_a_trgt = ka_a0 * grad_a_trgt
+    @staticmethod
+    def hessian(eptm):
+        if eptm.dim != 2:
+            raise NotImplementedError(
+                "The area elasticity Hessian is only available in 2D"
+            )
+        elasticity = column_product(eptm.face_df, "area_elasticity * is_alive")
+        ka_a0_ = elastic_force(
+            eptm.face_df, "area", "area_elasticity * is_alive", "prefered_area"
+        )
+        # the area of a face is the sum of (srce x trgt) / 2 over its edges
+        srce = _vert_positions(eptm, "srce")
+        trgt = _vert_positions(eptm, "trgt")
+        pos = eptm.vert_df[eptm.coords].to_numpy(dtype=float)
+        grad_srce = np.column_stack([pos[trgt, 1], -pos[trgt, 0]]) / 2
+        grad_trgt = np.column_stack([-pos[srce, 1], pos[srce, 0]]) / 2
+        rows, cols, blocks = _face_outer_blocks(
+            eptm, elasticity, grad_srce, grad_trgt
+        )
 
-        grad_a_srce.columns = ["g" + u for u in eptm.coords]
-        grad_a_trgt.columns = ["g" + u for u in eptm.coords]
+        ka_a0 = eptm.upcast_face(ka_a0_).to_numpy()
+        cross = ka_a0[:, np.newaxis, np.newaxis] * np.array([[0.0, 0.5], [-0.5, 0.0]])
+        rows += [srce, trgt]
+        cols += [trgt, srce]
+        blocks += [cross, cross.transpose(0, 2, 1)]
+        return _assemble_hessian(eptm, rows, cols, blocks)
 
-        return grad_a_srce, grad_a_trgt
+
+def _face_area_gradient(eptm, ka_a0_):
+    ka_a0 = to_nd(eptm.upcast_face(ka_a0_, out="face_factor"), len(eptm.coords))
+
+    if len(eptm.coords) == 2:
+        grad_a_srce, grad_a_trgt = area_grad2d(eptm)
+    elif len(eptm.coords) == 3:
+        grad_a_srce, grad_a_trgt = area_grad(eptm)
+
+    grad_a_srce = ka_a0 * grad_a_srce
+    grad_a_trgt = ka_a0 * grad_a_trgt
+
+    grad_a_srce.columns = ["g" + u for u in eptm.coords]
+    grad_a_trgt.columns = ["g" + u for u in eptm.coords]
+
+    return grad_a_srce, grad_a_trgt
 
 
 class FaceVolumeElasticity(AbstractEffector):
@@ -215,6 +527,11 @@ class FaceVolumeElasticity(AbstractEffector):
     magnitude = "vol_elasticity"
     label = "Volume elasticity"
     element = "face"
+    requires = {
+        "face": ("vol",),
+        "vert": ("rho", "height"),
+        "edge": ("sub_area", "scoords", "tcoords", "fcoords", "ncoords"),
+    }
     specs = {
         "face": {"is_alive": 1, "vol": 1.0, "vol_elasticity": 1.0, "prefered_vol": 1.0},
         "vert": {"height": 1.0},
@@ -238,22 +555,34 @@ class FaceVolumeElasticity(AbstractEffector):
         kv_v0_ = elastic_force(
             eptm.face_df, "vol", "vol_elasticity * is_alive", "prefered_vol"
         )
+        return _face_volume_gradient(eptm, kv_v0_)
 
-        kv_v0 = to_nd(eptm.upcast_face(kv_v0_), 3)
+    @staticmethod
+    def energy_and_gradient(eptm):
+        energy, kv_v0_ = elastic_terms(
+            eptm.face_df, "vol", "vol_elasticity * is_alive", "prefered_vol"
+        )
+        return energy, _face_volume_gradient(eptm, kv_v0_)
 
-        edge_h = to_nd(eptm.upcast_srce(eptm.vert_df["height"]), 3)
-        area_ = eptm.edge_df["sub_area"]
-        area = to_nd(area_, 3)
-        grad_a_srce, grad_a_trgt = area_grad(eptm)
-        grad_h = eptm.upcast_srce(height_grad(eptm))
 
-        grad_v_srce = kv_v0 * (edge_h * grad_a_srce + area * grad_h)
-        grad_v_trgt = kv_v0 * (edge_h * grad_a_trgt)
+def _face_volume_gradient(eptm, kv_v0_):
+    kv_v0 = to_nd(eptm.upcast_face(kv_v0_, out="face_factor"), 3)
 
-        grad_v_srce.columns = ["g" + u for u in eptm.coords]
-        grad_v_trgt.columns = ["g" + u for u in eptm.coords]
+    edge_h = to_nd(
+        eptm.upcast_srce(eptm.vert_df["height"], out="srce_height"), 3
+    )
+    area_ = eptm.edge_df["sub_area"]
+    area = to_nd(area_, 3)
+    grad_a_srce, grad_a_trgt = area_grad(eptm)
+    grad_h = eptm.upcast_srce(height_grad(eptm))
 
-        return grad_v_srce, grad_v_trgt
+    grad_v_srce = kv_v0 * (edge_h * grad_a_srce + area * grad_h)
+    grad_v_trgt = kv_v0 * (edge_h * grad_a_trgt)
+
+    grad_v_srce.columns = ["g" + u for u in eptm.coords]
+    grad_v_trgt.columns = ["g" + u for u in eptm.coords]
+
+    return grad_v_srce, grad_v_trgt
 
 
 class CellAreaElasticity(AbstractEffector):
@@ -262,6 +591,10 @@ class CellAreaElasticity(AbstractEffector):
     magnitude = "area_elasticity"
     label = "Area elasticity"
     element = "cell"
+    requires = {
+        "cell": ("area",),
+        "edge": ("sub_area", "scoords", "tcoords", "fcoords", "ncoords"),
+    }
     specs = {
         "cell": {
             "is_alive": 1,
@@ -286,7 +619,7 @@ class CellAreaElasticity(AbstractEffector):
             eptm.cell_df, "area", "area_elasticity * is_alive", "prefered_area"
         )
 
-        ka_a0 = to_nd(eptm.upcast_cell(ka_a0_), 3)
+        ka_a0 = to_nd(eptm.upcast_cell(ka_a0_, out="cell_factor"), 3)
 
         grad_a_srce, grad_a_trgt = area_grad(eptm)
 
@@ -304,6 +637,7 @@ class CellVolumeElasticity(AbstractEffector):
     magnitude = "vol_elasticity"
     label = "Volume elasticity"
     element = "cell"
+    requires = {"cell": ("vol",), "edge": ("scoords", "tcoords", "fcoords", "ccoords")}
     spatial_ref = "prefered_vol", units.vol
 
     specs = {
@@ -324,7 +658,7 @@ class CellVolumeElasticity(AbstractEffector):
             eptm.cell_df, "vol", "vol_elasticity * is_alive", "prefered_vol"
         )
 
-        kv_v0 = to_nd(eptm.upcast_cell(kv_v0_), 3)
+        kv_v0 = to_nd(eptm.upcast_cell(kv_v0_, out="cell_factor"), 3)
         grad_v_srce, grad_v_trgt = volume_grad(eptm)
         grad_v_srce = kv_v0 * grad_v_srce
         grad_v_trgt = kv_v0 * grad_v_trgt
@@ -345,6 +679,10 @@ class LumenVolumeElasticity(AbstractEffector):
     magnitude = "lumen_vol_elasticity"
     label = "Lumen volume elasticity"
     element = "settings"
+    requires = {
+        "settings": ("lumen_vol",),
+        "edge": ("scoords", "tcoords", "fcoords"),
+    }
     spatial_ref = "lumen_prefered_vol", units.vol
 
     specs = {
@@ -391,24 +729,45 @@ class LineTension(AbstractEffector):
     magnitude = "line_tension"
     label = "Line tension"
     element = "edge"
+    requires = {"edge": ("length", "ucoords")}
     specs = {"edge": {"is_active": 1, "line_tension": 1.0}}
 
     spatial_ref = "mean_length", units.length
 
     @staticmethod
     def energy(eptm):
-        return eptm.edge_df.eval(
-            "line_tension" "* is_active" "* length / 2"
+        return pd.Series(
+            column_product(eptm.edge_df, "line_tension * is_active * length / 2"),
+            index=eptm.edge_df.index,
         )  # accounts for half edges
 
     @staticmethod
     def gradient(eptm):
-        grad_srce = -eptm.edge_df[eptm.ucoords] * to_nd(
-            eptm.edge_df.eval("line_tension * is_active/2"), len(eptm.coords)
+        return _line_tension_gradient(
+            eptm, column_product(eptm.edge_df, "line_tension * is_active / 2")
         )
-        grad_srce.columns = ["g" + u for u in eptm.coords]
-        grad_trgt = -grad_srce
-        return grad_srce, grad_trgt
+
+    @staticmethod
+    def energy_and_gradient(eptm):
+        tension = column_product(eptm.edge_df, "line_tension * is_active / 2")
+        energy = pd.Series(
+            tension * eptm.edge_df["length"].to_numpy(), index=eptm.edge_df.index
+        )
+        return energy, _line_tension_gradient(eptm, tension)
+
+    @staticmethod
+    def hessian(eptm):
+        tension = column_product(eptm.edge_df, "line_tension * is_active / 2")
+        return _assemble_hessian(
+            eptm, *_edge_blocks(eptm, tension, np.zeros(eptm.Ne))
+        )
+
+
+def _line_tension_gradient(eptm, tension):
+    grad_srce = -eptm.edge_df[eptm.ucoords] * to_nd(tension, len(eptm.coords))
+    grad_srce.columns = ["g" + u for u in eptm.coords]
+    grad_trgt = -grad_srce
+    return grad_srce, grad_trgt
 
 
 class FaceContractility(AbstractEffector):
@@ -417,24 +776,40 @@ class FaceContractility(AbstractEffector):
     magnitude = "contractility"
     label = "Contractility"
     element = "face"
+    requires = {"face": ("perimeter",), "edge": ("ucoords",)}
     specs = {"face": {"is_alive": 1, "perimeter": 1.0, "contractility": 1.0}}
 
     spatial_ref = "mean_perimeter", units.length
 
     @staticmethod
     def energy(eptm):
-        return eptm.face_df.eval("0.5 * is_alive * contractility * perimeter ** 2")
+        return pd.Series(
+            column_product(
+                eptm.face_df, "0.5 * is_alive * contractility * perimeter * perimeter"
+            ),
+            index=eptm.face_df.index,
+        )
 
     @staticmethod
     def gradient(eptm):
 
-        gamma_ = eptm.face_df.eval("contractility * perimeter * is_alive")
-        gamma = eptm.upcast_face(gamma_)
+        gamma_ = column_product(eptm.face_df, "contractility * perimeter * is_alive")
+        return _tension_gradient(eptm, gamma_)
 
-        grad_srce = -eptm.edge_df[eptm.ucoords] * to_nd(gamma, len(eptm.coords))
-        grad_srce.columns = ["g" + u for u in eptm.coords]
-        grad_trgt = -grad_srce
-        return grad_srce, grad_trgt
+    @staticmethod
+    def energy_and_gradient(eptm):
+        gamma_ = column_product(eptm.face_df, "contractility * perimeter * is_alive")
+        energy = pd.Series(
+            0.5 * gamma_ * eptm.face_df["perimeter"].to_numpy(),
+            index=eptm.face_df.index,
+        )
+        return energy, _tension_gradient(eptm, gamma_)
+
+    @staticmethod
+    def hessian(eptm):
+        contractility = column_product(eptm.face_df, "contractility * is_alive")
+        gamma_ = contractility * eptm.face_df["perimeter"].to_numpy()
+        return _perimeter_hessian(eptm, gamma_, contractility)
 
 
 class SurfaceTension(AbstractEffector):
@@ -446,17 +821,27 @@ class SurfaceTension(AbstractEffector):
 
     label = "Surface tension"
     element = "face"
+    requires = {
+        "face": ("area",),
+        "edge": ("sub_area", "scoords", "tcoords", "fcoords", "ncoords"),
+    }
     specs = {"face": {"is_active": 1, "surface_tension": 1.0, "area": 1.0}}
 
     @staticmethod
     def energy(eptm):
 
-        return eptm.face_df.eval("surface_tension * area")
+        return pd.Series(
+            column_product(eptm.face_df, "surface_tension * area"),
+            index=eptm.face_df.index,
+        )
 
     @staticmethod
     def gradient(eptm):
 
-        G = to_nd(eptm.upcast_face(eptm.face_df["surface_tension"]), len(eptm.coords))
+        G = to_nd(
+            eptm.upcast_face(eptm.face_df["surface_tension"], out="face_factor"),
+            len(eptm.coords),
+        )
         grad_a_srce, grad_a_trgt = area_grad(eptm)
 
         grad_a_srce = G * grad_a_srce
@@ -474,6 +859,7 @@ class LineViscosity(AbstractEffector):
 
     label = "Linear viscosity"
     element = "edge"
+    requires = {}
     spatial_ref = "mean_length", units.length
     temporal_ref = "dt", units.time
     specs = {"edge": {"is_active": 1, "edge_viscosity": 1.0}}
@@ -492,6 +878,7 @@ class BorderElasticity(AbstractEffector):
     label = "Border edges elasticity"
     magnitude = "border_elasticity"
     element = "edge"
+    requires = {"edge": ("length", "ucoords")}
     spatial_ref = "prefered_length", units.length
 
     specs = {
@@ -530,7 +917,32 @@ class BorderElasticity(AbstractEffector):
         )
         grad = eptm.edge_df[eptm.ucoords] * to_nd(kl_l0, eptm.dim)
         grad.columns = ["g" + u for u in eptm.coords]
-        return grad / 2, -grad / 2
+        return -grad / 2, grad / 2
+
+    @staticmethod
+    def energy_and_gradient(eptm):
+        energy, kl_l0 = elastic_terms(
+            eptm.edge_df,
+            "length",
+            "border_elasticity * is_active * is_border / 2",
+            "prefered_length",
+        )
+        return energy, _length_gradient(eptm, kl_l0)
+
+    @staticmethod
+    def hessian(eptm):
+        elasticity = column_product(
+            eptm.edge_df, "border_elasticity * is_active * is_border / 2"
+        )
+        kl_l0 = elastic_force(
+            eptm.edge_df,
+            "length",
+            "border_elasticity * is_active * is_border / 2",
+            "prefered_length",
+        )
+        return _assemble_hessian(
+            eptm, *_edge_blocks(eptm, kl_l0.to_numpy(), elasticity)
+        )
 
 
 class LumenAreaElasticity(AbstractEffector):
@@ -544,6 +956,7 @@ class LumenAreaElasticity(AbstractEffector):
     label = "Lumen volume constraint"
     magnitude = "lumen_elasticity"
     element = "settings"
+    requires = {"settings": ("lumen_vol",), "edge": ("scoords", "tcoords")}
     spatial_ref = "lumen_prefered_vol", units.area
 
     specs = {
@@ -579,16 +992,20 @@ class RadialTension(AbstractEffector):
     magnitude = "radial_tension"
     label = "Apical basal tension"
     element = "face"
+    requires = {"face": ("height",), "vert": ("rho",)}
     specs = {"face": {"height": 1.0, "radial_tension": 1.0}}
 
     @staticmethod
     def energy(eptm):
-        return eptm.face_df.eval("height * radial_tension")
+        return pd.Series(
+            column_product(eptm.face_df, "height * radial_tension"),
+            index=eptm.face_df.index,
+        )
 
     @staticmethod
     def gradient(eptm):
         upcast_tension = eptm.upcast_face(
-            eptm.face_df.eval("radial_tension / num_sides")
+            column_product(eptm.face_df, "radial_tension / num_sides")
         )
 
         upcast_height = eptm.upcast_srce(height_grad(eptm))
@@ -606,18 +1023,24 @@ class BarrierElasticity(AbstractEffector):
     magnitude = "barrier_elasticity"
     label = "Barrier elasticity"
     element = "vert"
+    requires = {"vert": ("rho",)}
     specs = {
         "vert": {"barrier_elasticity": 1.0, "is_active": 1, "delta_rho": 0.0}
     }  # distance to a barrier membrane
 
     @staticmethod
     def energy(eptm):
-        return eptm.vert_df.eval("delta_rho**2 * barrier_elasticity/2")
+        return pd.Series(
+            column_product(
+                eptm.vert_df, "delta_rho * delta_rho * barrier_elasticity / 2"
+            ),
+            index=eptm.vert_df.index,
+        )
 
     @staticmethod
     def gradient(eptm):
         grad = height_grad(eptm) * to_nd(
-            eptm.vert_df.eval("barrier_elasticity * delta_rho"), 3
+            column_product(eptm.vert_df, "barrier_elasticity * delta_rho"), 3
         )
         grad.columns = ["g" + c for c in eptm.coords]
         return grad, None
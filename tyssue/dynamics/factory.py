@@ -1,11 +1,13 @@
 import warnings
 import numpy as np
+import pandas as pd
 from copy import deepcopy
 
 from .effectors import dimensionalize as dimensionalize
 from .effectors import normalize as normalize
 
 from ..utils import to_nd
+from ..utils import profiling
 
 
 def model_factory(effectors, ref_effector=None):
@@ -39,9 +41,17 @@ def model_factory(effectors, ref_effector=None):
         }
 
         _effectors = effectors
+        # geometrical quantities needed by the effectors,
+        # see `BaseGeometry.update_plan`
+        requires = {}
 
         for f in effectors:
             labels.append(f.label)
+            if getattr(f, "requires", None) is None or requires is None:
+                requires = None
+            else:
+                for k, names in f.requires.items():
+                    requires.setdefault(k, set()).update(names)
             try:
                 for k in specs:
                     specs[k].update(f.specs.get(k, {}))
@@ -92,36 +102,153 @@ Setting all default values to 1.0 for now
 
         @staticmethod
         def compute_energy(eptm, full_output=False):
-            energies = [f.energy(eptm) for f in effectors]
+            energies = [
+                profiling.call("effector", f"{f.label}.energy", f.energy, eptm)
+                for f in effectors
+            ]
             norm_factor = eptm.specs["settings"].get("nrj_norm_factor", 1)
             if full_output:
                 return [E / norm_factor for E in energies]
 
-            return sum(E.sum() for E in energies) / norm_factor
+            # accumulate in double precision, see `Epithelium.apply_precision`
+            return (
+                sum(np.asarray(E).sum(dtype=np.float64) for E in energies)
+                / norm_factor
+            )
 
         @staticmethod
         def compute_gradient(eptm, components=False):
             norm_factor = eptm.specs["settings"].get("nrj_norm_factor", 1)
-            grads = [f.gradient(eptm) for f in effectors]
+            grads = [
+                profiling.call("effector", f"{f.label}.gradient", f.gradient, eptm)
+                for f in effectors
+            ]
             if components:
                 return grads
+            grad = profiling.call(
+                "model", "accumulate_gradients", accumulate_gradients, eptm, grads
+            )
+            return grad / norm_factor
 
-            grad_s, grad_t, grad_v = None, None, None
-
-            srce_grads = [g[0] for g in grads if g[0].shape[0] == eptm.Ne]
-            if srce_grads:
-                grad_s = eptm.sum_srce(sum(srce_grads))
-            trgt_grads = [
-                g[1] for g in grads if (g[1] is not None) and (g[1].shape[0] == eptm.Ne)
-            ]
-            if trgt_grads:
-                grad_t = eptm.sum_trgt(sum(trgt_grads))
-            vert_grads = [g[0] for g in grads if g[0].shape[0] == eptm.Nv]
-            if vert_grads:
-                grad_v = sum(vert_grads)
+        @staticmethod
+        def compute_energy_and_gradient(eptm, full_output=False):
+            """Computes the energy and its gradient in a single pass,
+            sharing the intermediate quantities of each effector.
+
+            Returns
+            -------
+            energy, grad : the results of `compute_energy(eptm, full_output)`
+              and of `compute_gradient(eptm, components=full_output)`
+            """
+            norm_factor = eptm.specs["settings"].get("nrj_norm_factor", 1)
+            energies, grads = [], []
+            for f in effectors:
+                if hasattr(f, "energy_and_gradient"):
+                    energy, grad = profiling.call(
+                        "effector",
+                        f"{f.label}.energy_and_gradient",
+                        f.energy_and_gradient,
+                        eptm,
+                    )
+                else:
+                    energy = profiling.call(
+                        "effector", f"{f.label}.energy", f.energy, eptm
+                    )
+                    grad = profiling.call(
+                        "effector", f"{f.label}.gradient", f.gradient, eptm
+                    )
+                energies.append(energy)
+                grads.append(grad)
+            if full_output:
+                return [E / norm_factor for E in energies], grads
 
-            grad_i = sum([g for g in (grad_s, grad_t, grad_v) if g is not None])
+            energy = (
+                sum(np.asarray(E).sum(dtype=np.float64) for E in energies)
+                / norm_factor
+            )
+            grad = profiling.call(
+                "model", "accumulate_gradients", accumulate_gradients, eptm, grads
+            )
+            return energy, grad / norm_factor
 
-            return grad_i / norm_factor
+        @staticmethod
+        def compute_hessian(eptm):
+            """Returns the Hessian of the energy as a sparse matrix of shape
+            (eptm.Nv * eptm.dim, eptm.Nv * eptm.dim), see
+            :meth:`AbstractEffector.hessian`.
+
+            Raises NotImplementedError if one of the effectors doesn't
+            provide an analytic Hessian.
+            """
+            norm_factor = eptm.specs["settings"].get("nrj_norm_factor", 1)
+            hessian = sum(
+                profiling.call("effector", f"{f.label}.hessian", f.hessian, eptm)
+                for f in effectors
+            )
+            return hessian / norm_factor
 
     return NewModel
+
+
+def accumulate_gradients(eptm, grads):
+    """Sums the gradients of the effectors on the vertices.
+
+    The edge level contributions are accumulated in a source and a
+    target buffer of shape (eptm.Ne, eptm.dim), each scattered once to
+    the vertices, and the vertex level contributions are added to the
+    result.
+
+    Parameters
+    ----------
+    eptm : a :class:`Epithelium` instance
+    grads : list of `(grad_srce, grad_trgt)` pairs, as returned by the
+      effectors `gradient` method
+
+    Returns
+    -------
+    grad : :class:`pd.DataFrame` indexed by the vertices
+    """
+    buffers = {"srce": None, "trgt": None}
+    vert_grads = []
+    for grad_srce, grad_trgt in grads:
+        for lvl, grad in (("srce", grad_srce), ("trgt", grad_trgt)):
+            if (grad is None) or (grad.shape[0] != eptm.Ne):
+                continue
+            if buffers[lvl] is None:
+                buffers[lvl] = eptm.get_buffer(f"grad_{lvl}", (eptm.Ne, eptm.dim))
+                buffers[lvl][:] = np.asarray(grad)
+            else:
+                buffers[lvl] += np.asarray(grad)
+        if grad_srce.shape[0] == eptm.Nv:
+            vert_grads.append(grad_srce)
+
+    columns = ["g" + c for c in eptm.coords]
+    summed = [(lvl, buffer) for lvl, buffer in buffers.items() if buffer is not None]
+    if not summed:
+        return sum(vert_grads)
+
+    if all(eptm.edge_df[lvl].dtype.kind in "iu" for lvl, _ in summed):
+        scattered = []
+        for lvl, buffer in summed:
+            incidence, present = eptm.get_incidence(lvl)
+            scattered.append((incidence @ buffer, present))
+        total = np.zeros((max(s.shape[0] for s, _ in scattered), eptm.dim))
+        for values, _ in scattered:
+            total[: values.shape[0]] += values
+        index = np.unique(np.concatenate([present for _, present in scattered]))
+        grad = pd.DataFrame(
+            total[index],
+            index=pd.Index(index, name=eptm.vert_df.index.name),
+            columns=columns,
+        )
+    else:
+        grad = sum(
+            eptm._lvl_sum(
+                pd.DataFrame(buffer, index=eptm.edge_df.index, columns=columns), lvl
+            )
+            for lvl, buffer in summed
+        )
+
+    if vert_grads:
+        grad = grad + sum(vert_grads)
+    return grad
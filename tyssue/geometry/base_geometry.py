@@ -1,4 +1,5 @@
 import numpy as np
+from ..utils import profiling
 from ..utils.utils import to_nd
 
 
@@ -6,10 +7,138 @@ class BaseGeometry:
     """
     """
 
+    # The steps of `update_all`, in order, with the steps they depend on
+    update_steps = {}
+    # The geometrical quantities, as `(element, name)` pairs, and the step
+    # computing them. Coordinate columns are named after the corresponding
+    # epithelium attribute, e.g. `("edge", "ucoords")` for the unit vectors
+    # and `("face", "coords")` for the face centroids
+    computed_by = {}
+
     @staticmethod
     def update_all(sheet):
         raise NotImplementedError
 
+    @classmethod
+    def update_plan(cls, requires):
+        """Returns the minimal list of update steps computing the
+        quantities in `requires`, in the order of `update_all`.
+
+        Parameters
+        ----------
+        requires : dict or None
+            the required geometrical quantities for each element, e.g.
+            `{"edge": ["length", "ucoords"], "face": ["area"]}`, as
+            declared by the effectors `requires` attribute
+
+        Returns
+        -------
+        plan : list of str, the names of the update steps, or None if
+          a full `update_all` is needed, for example because a quantity
+          is unknown or `update_all` is overridden without declaring
+          its steps.
+        """
+        if requires is None or not issubclass(
+            _owner(cls, "update_steps"), _owner(cls, "update_all")
+        ):
+            return None
+        needed = set()
+        for element, names in requires.items():
+            for name in names:
+                step = cls.computed_by.get((element, name))
+                if step is None:
+                    return None
+                needed.add(step)
+        pending = list(needed)
+        while pending:
+            for dep in cls.update_steps[pending.pop()]:
+                if dep not in needed:
+                    needed.add(dep)
+                    pending.append(dep)
+        return [step for step in cls.update_steps if step in needed]
+
+    @classmethod
+    def restrict(cls, requires):
+        """Returns a geometry class whose `update_all` method only runs
+        the steps needed to compute `requires` (see `update_plan`),
+        or `cls` itself if all the steps are needed.
+
+        The quantities that are not required are left untouched by
+        the restricted `update_all`, and might thus be out of date.
+        """
+        plan = cls.update_plan(requires)
+        if plan is None or len(plan) == len(cls.update_steps):
+            return cls
+        return type(
+            cls.__name__,
+            (cls,),
+            {
+                "update_all": classmethod(_planned_update_all),
+                "update_steps": {step: cls.update_steps[step] for step in plan},
+                "__doc__": f"{cls.__name__} restricted to the {', '.join(plan)} steps",
+            },
+        )
+
+    @classmethod
+    def profiled(cls, steps=False):
+        """Returns a geometry class recording the calls and durations of
+        its `update_all` method in the active profiler (see
+        :mod:`tyssue.utils.profiling`), in the "geometry" category.
+
+        If `steps` is True, each of the `update_steps` is also recorded,
+        which disables the fused single pass updates of the geometries
+        implementing them.
+        """
+        name = cls.__name__
+
+        def update_all(klass, eptm):
+            return profiling.call(
+                "geometry",
+                f"{name}.update_all",
+                super(profiled_cls, klass).update_all,
+                eptm,
+            )
+
+        attrs = {
+            "update_all": classmethod(update_all),
+            "__doc__": f"{name} with profiled updates",
+        }
+        if steps:
+            for step in cls.update_steps:
+                attrs[step] = staticmethod(
+                    profiling.timed("geometry", f"{name}.{step}")(getattr(cls, step))
+                )
+        profiled_cls = type(name, (cls,), attrs)
+        return profiled_cls
+
+    @classmethod
+    def update_local(cls, sheet, verts, check=False):
+        """Updates the geometry after a displacement of the vertices
+        `verts` only.
+
+        Geometries that support it only recompute the edges, faces and
+        cells around those vertices, others fall back to `update_all`.
+        The geometry is assumed to be up to date for the other vertices.
+
+        Parameters
+        ----------
+        sheet : a :class:`Epithelium` instance
+        verts : sequence of ints, the indices of the moved vertices
+        check : bool, default False
+            if True, compares the result with a full update on a copy of
+            `sheet`, and raises a ValueError if they differ
+        """
+        if check:
+            ref = sheet.copy()
+            cls.update_all(ref)
+        cls._update_local(sheet, np.unique(np.asarray(verts, dtype=int)))
+        if check:
+            _check_geometry(sheet, ref)
+
+    @classmethod
+    def _update_local(cls, sheet, verts):
+        cls.update_all(sheet)
+
     @staticmethod
     def scale(sheet, delta, coords):
         """ Scales the coordinates `coords`
@@ -29,12 +158,17 @@ class BaseGeometry:
         vertices
         """
         if sheet.settings.get("boundaries") is None:
-            data = sheet.vert_df[sheet.coords]
-            srce_pos = sheet.upcast_srce(data)
-            trgt_pos = sheet.upcast_trgt(data)
-            sheet.edge_df[["s" + c for c in sheet.coords]] = srce_pos
-            sheet.edge_df[["t" + c for c in sheet.coords]] = trgt_pos
-            sheet.edge_df[sheet.dcoords] = trgt_pos - srce_pos
+            dtype = sheet.float_dtype
+            data = sheet.vert_df[sheet.coords].to_numpy()
+            srce_pos = sheet.upcast_srce(data, out="srce_pos")
+            trgt_pos = sheet.upcast_trgt(data, out="trgt_pos")
+            dpos = np.subtract(
+                trgt_pos, srce_pos, out=sheet.get_buffer("dpos", srce_pos.shape, dtype)
+            )
+            edge_df = sheet.edge_df
+            _write_columns(edge_df, ["s" + c for c in sheet.coords], srce_pos, dtype)
+            _write_columns(edge_df, ["t" + c for c in sheet.coords], trgt_pos, dtype)
+            _write_columns(edge_df, sheet.dcoords, dpos, dtype)
         else:
             update_periodic_dcoords(sheet)
 
@@ -56,7 +190,9 @@ class BaseGeometry:
         """
         Updates the perimeter of each face.
         """
-        sheet.face_df["perimeter"] = sheet.sum_face(sheet.edge_df["length"])
+        sheet.face_df["perimeter"] = sheet.sum_face(sheet.edge_df["length"]).astype(
+            sheet.float_dtype, copy=False
+        )
 
     @staticmethod
     def update_centroid(sheet):
@@ -66,10 +202,12 @@ class BaseGeometry:
         with their upcasted values
         """
         scoords = ["s" + c for c in sheet.coords]
-        sheet.face_df[sheet.coords] = sheet.edge_df.groupby("face")[scoords].mean()
-        face_pos = sheet.upcast_face(sheet.face_df[sheet.coords])
-        for c in sheet.coords:
-            sheet.edge_df["f" + c] = face_pos[c]
+        sheet.face_df[sheet.coords] = sheet.mean_face(sheet.edge_df[scoords]).astype(
+            sheet.float_dtype, copy=False
+        )
+        face_pos = sheet.upcast_face(sheet.face_df[sheet.coords], out="face_pos")
+        for i, c in enumerate(sheet.coords):
+            sheet.edge_df["f" + c] = face_pos[:, i]
             sheet.edge_df["r" + c] = sheet.edge_df["s" + c] - sheet.edge_df["f" + c]
 
     @staticmethod
@@ -113,36 +251,94 @@ class BaseGeometry:
 def update_periodic_dcoords(sheet):
     """ Updates the coordinates for periodic boundary conditions.
 
+    Vertices out of the box are wrapped back in, edge vectors follow
+    the minimal image convention, and for faces straddling a boundary
+    (flagged in the `at_{u}_boundary` columns), the upcast positions
+    on the lower half of the box are shifted by one period. All the
+    periodic axes are handled at once.
     """
-    for u, boundary in sheet.settings["boundaries"].items():
-        period = boundary[1] - boundary[0]
-        shift = period * (
-            -(sheet.vert_df[u] > boundary[1]).astype(float)
-            + (sheet.vert_df[u] <= boundary[0]).astype(float)
-        )
-        sheet.vert_df[u] = sheet.vert_df[u] + shift
-
-    srce_pos = sheet.upcast_srce(sheet.vert_df[sheet.coords])
-    trgt_pos = sheet.upcast_trgt(sheet.vert_df[sheet.coords])
-    sheet.edge_df[["s" + u for u in sheet.coords]] = srce_pos
-    sheet.edge_df[["t" + u for u in sheet.coords]] = trgt_pos
-    sheet.edge_df[sheet.dcoords] = trgt_pos - srce_pos
-    for u, boundary in sheet.settings["boundaries"].items():
-        period = boundary[1] - boundary[0]
-        center = boundary[1] - period / 2
-        shift = period * (
-            -(sheet.edge_df["d" + u] >= period / 2).astype(float)
-            + (sheet.edge_df["d" + u] < -period / 2).astype(float)
+    boundaries = sheet.settings["boundaries"]
+    axes = list(boundaries)
+    cols = [sheet.coords.index(u) for u in axes]
+    lower, upper = np.array([boundaries[u] for u in axes], dtype=float).T
+    period = upper - lower
+    center = upper - period / 2
+
+    pos = sheet.vert_df[sheet.coords].to_numpy(dtype=float)
+    wrapped = pos[:, cols]
+    wrapped += period * ((wrapped <= lower).astype(float) - (wrapped > upper))
+    pos[:, cols] = wrapped
+    for u, values in zip(axes, wrapped.T):
+        sheet.vert_df[u] = values
+
+    srce_pos = sheet.upcast_srce(pos, out="srce_pos")
+    trgt_pos = sheet.upcast_trgt(pos, out="trgt_pos")
+    dpos = trgt_pos - srce_pos
+    dwrap = dpos[:, cols]
+    shift = period * (
+        (dwrap < -period / 2).astype(float) - (dwrap >= period / 2)
+    )
+    dpos[:, cols] = dwrap + shift
+    at_boundary = shift != 0
+
+    # faces with at least one edge across the boundary, per axis
+    incidence, _ = sheet.get_incidence("face")
+    face_labels = sheet.face_df.index.to_numpy()
+    num_rows = max(incidence.shape[0], face_labels.max(initial=-1) + 1)
+    face_at_boundary = np.zeros((num_rows, len(axes)), dtype=bool)
+    face_at_boundary[: incidence.shape[0]] = (incidence @ at_boundary) > 0
+    edge_at_boundary = face_at_boundary[sheet.edge_df["face"].to_numpy()]
+    srce_pos[:, cols] += edge_at_boundary * (srce_pos[:, cols] < center) * period
+    trgt_pos[:, cols] += edge_at_boundary * (trgt_pos[:, cols] < center) * period
+
+    dtype = sheet.float_dtype
+    _write_columns(sheet.edge_df, ["s" + c for c in sheet.coords], srce_pos, dtype)
+    _write_columns(sheet.edge_df, ["t" + c for c in sheet.coords], trgt_pos, dtype)
+    _write_columns(sheet.edge_df, sheet.dcoords, dpos, dtype)
+    for i, u in enumerate(axes):
+        sheet.edge_df[f"at_{u}_boundary"] = at_boundary[:, i]
+        sheet.face_df[f"at_{u}_boundary"] = face_at_boundary[face_labels, i]
+
+
+def _write_columns(df, columns, values, dtype):
+    """Writes the columns of the 2D array `values` to `df` with the
+    floating point `dtype` of the epithelium (see `Epithelium.float_dtype`)
+    """
+    for i, col in enumerate(columns):
+        df[col] = values[:, i].astype(dtype, copy=False)
+
+
+def _planned_update_all(cls, eptm):
+    for step in cls.update_steps:
+        getattr(cls, step)(eptm)
+
+
+def _owner(cls, name):
+    """Returns the class of `cls` MRO where `name` is defined"""
+    return next(klass for klass in cls.__mro__ if name in vars(klass))
+
+
+def _check_geometry(eptm, ref, rtol=1e-10, atol=1e-12):
+    """Raises a ValueError if the floating point data of `eptm`
+    differs from the one of `ref`
+    """
+    wrong = []
+    for elem, ref_df in ref.datasets.items():
+        df = eptm.datasets[elem]
+        for col, dtype in ref_df.dtypes.items():
+            if dtype.kind != "f":
+                continue
+            if col not in df or not np.allclose(
+                df[col], ref_df[col], rtol=rtol, atol=atol, equal_nan=True
+            ):
+                wrong.append(f"{elem}.{col}")
+    for key, value in ref.settings.items():
+        if isinstance(value, float) and not np.isclose(
+            eptm.settings.get(key, np.nan), value, rtol=rtol, atol=atol
+        ):
+            wrong.append(f"settings.{key}")
+    if wrong:
+        raise ValueError(
+            "The local geometry update differs from the full update for "
+            + ", ".join(wrong)
         )
-        sheet.edge_df["d" + u] = sheet.edge_df["d" + u] + shift
-        sheet.edge_df[f"at_{u}_boundary"] = shift != 0
-
-        sheet.face_df[f"at_{u}_boundary"] = sheet.edge_df.groupby("face")[
-            f"at_{u}_boundary"
-        ].apply(any)
-        f_at_boundary = sheet.upcast_face(sheet.face_df[f"at_{u}_boundary"]).astype(int)
-        period = boundary[1] - boundary[0]
-        srce_shift = f_at_boundary * (sheet.edge_df["s" + u] < center) * period
-        trgt_shift = f_at_boundary * (sheet.edge_df["t" + u] < center) * period
-        sheet.edge_df["s" + u] += srce_shift
-        sheet.edge_df["t" + u] += trgt_shift
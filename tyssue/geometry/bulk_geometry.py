@@ -1,17 +1,52 @@
 import warnings
 import numpy as np
+import pandas as pd
 
+from .base_geometry import BaseGeometry, _owner, _write_columns
 from .sheet_geometry import SheetGeometry
+from .planar_geometry import PlanarGeometry
 
 from .utils import rotation_matrix
 from ..utils import _to_3d
 from ..core.sheet import Sheet
 
 
+# steps of BulkGeometry.update_all computed at once when not overridden
+_FUSED_STEPS = (
+    "update_dcoords",
+    "update_length",
+    "update_ucoords",
+    "update_perimeters",
+    "update_centroid",
+    "update_normals",
+    "update_vol",
+    "update_areas",
+)
+
+
 class BulkGeometry(SheetGeometry):
     """Geometry functions for 3D cell arangements
     """
 
+    update_steps = {
+        "update_dcoords": (),
+        "update_length": ("update_dcoords",),
+        "update_ucoords": ("update_dcoords", "update_length"),
+        "update_perimeters": ("update_length",),
+        "update_centroid": ("update_dcoords",),
+        "update_normals": ("update_centroid",),
+        "update_vol": ("update_normals",),
+        "update_areas": ("update_normals",),
+    }
+    computed_by = {
+        **PlanarGeometry.computed_by,
+        ("cell", "coords"): "update_centroid",
+        ("edge", "ccoords"): "update_centroid",
+        ("cell", "area"): "update_areas",
+        ("edge", "sub_vol"): "update_vol",
+        ("cell", "vol"): "update_vol",
+    }
+
     @classmethod
     def update_all(cls, eptm):
         """
@@ -25,16 +60,126 @@ class BulkGeometry(SheetGeometry):
         * the vertices heights (depends on geometry)
         * the face volumes (depends on geometry)
 
+        When none of those steps is overridden by `cls` (apart from the
+        length weighted centroids of `RNRGeometry`), all the quantities
+        are computed in a single pass over the face and cell sorted
+        edges (see `_fused_incidences`), with the same results.
         """
+        incidences = cls._fused_incidences(eptm)
+        if incidences is not None:
+            weighted = _owner(cls, "update_centroid") is RNRGeometry
+            cls._update_all_fused(eptm, *incidences, weighted=weighted)
+            return
+
         cls.update_dcoords(eptm)
-        cls.update_ucoords(eptm)
         cls.update_length(eptm)
+        cls.update_ucoords(eptm)
         cls.update_perimeters(eptm)
         cls.update_centroid(eptm)
         cls.update_normals(eptm)
         cls.update_vol(eptm)
         cls.update_areas(eptm)
 
+    @classmethod
+    def _fused_incidences(cls, eptm):
+        """Returns the face and cell incidence matrices if the fused
+        geometry update can be used for `eptm`, None otherwise.
+        """
+        for name in _FUSED_STEPS:
+            if _owner(cls, name) not in _FUSED_OWNERS:
+                return None
+        if (
+            (eptm.dim != 3)
+            or (eptm.settings.get("boundaries") is not None)
+            or (not eptm.Ne)
+        ):
+            return None
+        incidences = []
+        for lvl, df in (("face", eptm.face_df), ("cell", eptm.cell_df)):
+            if eptm.edge_df[lvl].dtype.kind not in "iu":
+                return None
+            incidence, present = eptm.get_incidence(lvl)
+            # every element has edges and the index is contiguous
+            if not (
+                present.size == incidence.shape[0] == df.shape[0]
+                and np.array_equal(df.index, present)
+            ):
+                return None
+            incidences.append(incidence)
+        return incidences
+
+    @staticmethod
+    def _update_all_fused(eptm, face_incidence, cell_incidence, weighted=False):
+        """Computes all the quantities of `update_all` in one pass,
+        with sums over the face and cell sorted edges given by the
+        incidence matrices. If `weighted` is True, the face centroids
+        are weighted by the edge lengths, as in `RNRGeometry`.
+
+        As in `SheetGeometry._update_all_fused`, the edge vectors are
+        allocated with `eptm.float_dtype`.
+        """
+        coords = eptm.coords
+        edge_df, face_df, cell_df = eptm.edge_df, eptm.face_df, eptm.cell_df
+        pos = eptm.vert_df[coords].to_numpy(dtype=float)
+        num_edges = eptm.Ne
+        dtype = eptm.float_dtype
+
+        srce_pos = eptm.upcast_srce(pos, out="srce_pos")
+        trgt_pos = eptm.upcast_trgt(pos, out="trgt_pos")
+        dpos = np.subtract(
+            trgt_pos, srce_pos, out=eptm.get_buffer("dpos", (num_edges, 3), dtype)
+        )
+        length = np.linalg.norm(dpos, axis=1)
+        upos = dpos / length[:, np.newaxis]
+        perimeter = face_incidence @ length
+
+        if weighted:
+            mid_pos = (srce_pos + trgt_pos) / 2
+            face_means = (
+                face_incidence @ (mid_pos * length[:, np.newaxis])
+            ) / perimeter[:, np.newaxis]
+        else:
+            face_counts = np.diff(face_incidence.indptr)[:, np.newaxis]
+            face_means = (face_incidence @ srce_pos) / face_counts
+        cell_counts = np.diff(cell_incidence.indptr)[:, np.newaxis]
+        cell_means = (cell_incidence @ srce_pos) / cell_counts
+
+        face_pos = eptm.upcast_face(face_means, out="face_pos")
+        cell_pos = eptm.upcast_cell(cell_means, out="cell_pos")
+        rpos = np.subtract(
+            srce_pos, face_pos, out=eptm.get_buffer("rpos", (num_edges, 3), dtype)
+        )
+        normals = np.cross(rpos, dpos)
+        sub_vol = np.einsum("ij,ij->i", face_pos - cell_pos, normals) / 6
+        sub_area = np.linalg.norm(normals, axis=1) / 2
+        face_area = face_incidence @ sub_area
+        cell_sums = cell_incidence @ np.column_stack((sub_vol, sub_area))
+
+        edge_columns = (
+            (["s" + c for c in coords], srce_pos),
+            (["t" + c for c in coords], trgt_pos),
+            (eptm.dcoords, dpos),
+            (eptm.ucoords, upos),
+            (["length"], length[:, np.newaxis]),
+            (["f" + c for c in coords], face_pos),
+            (["r" + c for c in coords], rpos),
+            (["c" + c for c in coords], cell_pos),
+            (eptm.ncoords, normals),
+            (["sub_vol", "sub_area"], np.column_stack((sub_vol, sub_area))),
+        )
+        for columns, values in edge_columns:
+            _write_columns(edge_df, columns, values, dtype)
+
+        face_columns = (
+            (["perimeter"], perimeter[:, np.newaxis]),
+            (coords, face_means),
+            (["area"], face_area[:, np.newaxis]),
+        )
+        for columns, values in face_columns:
+            _write_columns(face_df, columns, values, dtype)
+        _write_columns(cell_df, coords, cell_means, dtype)
+        _write_columns(cell_df, ["vol", "area"], cell_sums, dtype)
+
     @staticmethod
     def update_dcoords(eptm):
         SheetGeometry.update_dcoords(eptm)
@@ -52,10 +197,14 @@ class BulkGeometry(SheetGeometry):
         cell_pos = eptm.edge_df[["c" + c for c in eptm.coords]].values
 
         eptm.edge_df["sub_vol"] = (
-            np.sum((face_pos - cell_pos) * eptm.edge_df[eptm.ncoords].values, axis=1)
+            np.einsum(
+                "ij,ij->i", face_pos - cell_pos, eptm.edge_df[eptm.ncoords].to_numpy()
+            )
             / 6
         )
-        eptm.cell_df["vol"] = eptm.sum_cell(eptm.edge_df["sub_vol"])
+        eptm.cell_df["vol"] = eptm.sum_cell(eptm.edge_df["sub_vol"]).astype(
+            eptm.float_dtype, copy=False
+        )
 
     @staticmethod
     def update_areas(eptm):
@@ -64,42 +213,45 @@ class BulkGeometry(SheetGeometry):
         eptm.edge_df["sub_area"] = (
             np.linalg.norm(eptm.edge_df[eptm.ncoords], axis=1) / 2
         )
-        eptm.face_df["area"] = eptm.sum_face(eptm.edge_df["sub_area"])
-        eptm.cell_df["area"] = eptm.sum_cell(eptm.edge_df["sub_area"])
+        dtype = eptm.float_dtype
+        eptm.face_df["area"] = eptm.sum_face(eptm.edge_df["sub_area"]).astype(
+            dtype, copy=False
+        )
+        eptm.cell_df["area"] = eptm.sum_cell(eptm.edge_df["sub_area"]).astype(
+            dtype, copy=False
+        )
 
     @staticmethod
     def update_centroid(eptm):
-        scoords = ["s" + c for c in eptm.coords]
-        eptm.face_df[eptm.coords] = eptm.edge_df.groupby("face")[scoords].mean()
-        face_pos = eptm.upcast_face(eptm.face_df[eptm.coords])
-        for c in eptm.coords:
-            eptm.edge_df["f" + c] = face_pos[c]
-            eptm.edge_df["r" + c] = eptm.edge_df["s" + c] - eptm.edge_df["f" + c]
-
-        eptm.cell_df[eptm.coords] = eptm.edge_df.groupby("cell")[scoords].mean()
-        cell_pos = eptm.upcast_cell(eptm.cell_df[eptm.coords]).values
-        eptm.edge_df[["c" + c for c in eptm.coords]] = cell_pos
+        SheetGeometry.update_centroid(eptm)
+        _update_cell_centroid(eptm)
 
     @staticmethod
     def validate_face_norms(eptm):
-
+        """Returns a boolean Series indexed by the faces, True
+        if the face normal points away from the cell center.
+        """
         fcoords = ["f" + c for c in eptm.coords]
         ccoords = ["c" + c for c in eptm.coords]
 
-        face_pos = eptm.edge_df[fcoords].values
-        cell_pos = eptm.edge_df[ccoords].values
-
-        r_cf = face_pos - cell_pos
-        r_cf["face"] = eptm.edge_df["face"]
-        r_cf = r_cf.groupby("face").mean()
-        face_norm = eptm.edge_df.groupby("face")[eptm.ncoords].mean()
-
-        proj = (face_norm * r_cf.values).sum(axis=1)
-        is_outward = proj >= 0
+        r_cf = eptm.edge_df[fcoords].to_numpy() - eptm.edge_df[ccoords].to_numpy()
+        face_means = eptm.mean_face(
+            np.concatenate((r_cf, eptm.edge_df[eptm.ncoords].to_numpy()), axis=1)
+        )
+        r_cf, face_norm = np.split(face_means.to_numpy(), 2, axis=1)
+        proj = np.einsum("ij,ij->i", face_norm, r_cf)
+        is_outward = pd.Series(proj >= 0, index=face_means.index)
         return is_outward
 
 
 class RNRGeometry(BulkGeometry):
+
+    # the face centroids are weighted by the edge lengths
+    update_steps = {
+        **BulkGeometry.update_steps,
+        "update_centroid": ("update_dcoords", "update_perimeters"),
+    }
+
     @staticmethod
     def update_centroid(eptm):
         scoords = ["s" + c for c in eptm.coords]
@@ -111,16 +263,14 @@ class RNRGeometry(BulkGeometry):
         weighted_pos = eptm.sum_face(mid_pos * _to_3d(eptm.edge_df["length"]))
         eptm.face_df[eptm.coords] = (
             weighted_pos.values / eptm.face_df["perimeter"].values[:, np.newaxis]
-        )
+        ).astype(eptm.float_dtype, copy=False)
 
-        face_pos = eptm.upcast_face(eptm.face_df[eptm.coords])
-        for c in eptm.coords:
-            eptm.edge_df["f" + c] = face_pos[c]
+        face_pos = eptm.upcast_face(eptm.face_df[eptm.coords], out="face_pos")
+        for i, c in enumerate(eptm.coords):
+            eptm.edge_df["f" + c] = face_pos[:, i]
             eptm.edge_df["r" + c] = eptm.edge_df["s" + c] - eptm.edge_df["f" + c]
 
-        eptm.cell_df[eptm.coords] = eptm.edge_df.groupby("cell")[scoords].mean()
-        cell_pos = eptm.upcast_cell(eptm.cell_df[eptm.coords]).values
-        eptm.edge_df[["c" + c for c in eptm.coords]] = cell_pos
+        _update_cell_centroid(eptm)
 
 
 class MonolayerGeometry(RNRGeometry):
@@ -168,6 +318,16 @@ class MonoLayerGeometry(MonolayerGeometry):
 
 
 class ClosedMonolayerGeometry(MonolayerGeometry):
+
+    update_steps = {
+        **MonolayerGeometry.update_steps,
+        "update_lumen_vol": ("update_normals",),
+    }
+    computed_by = {
+        **MonolayerGeometry.computed_by,
+        ("settings", "lumen_vol"): "update_lumen_vol",
+    }
+
     @classmethod
     def update_all(cls, eptm):
         """
@@ -190,11 +350,37 @@ class ClosedMonolayerGeometry(MonolayerGeometry):
         """
 
         """
-        lumen_edges = eptm.edge_df[
-            eptm.edge_df.segment == eptm.settings.get("lumen_side", "basal")
-        ].copy()
-        lumen_pos_faces = lumen_edges[["f" + c for c in eptm.coords]].values
+        lumen_edges = (
+            eptm.edge_df["segment"] == eptm.settings.get("lumen_side", "basal")
+        ).to_numpy()
+        lumen_pos_faces = eptm.edge_df[["f" + c for c in eptm.coords]].to_numpy()
+        normals = eptm.edge_df[eptm.ncoords].to_numpy()
         lumen_sub_vol = (
-            np.sum((lumen_pos_faces) * lumen_edges[eptm.ncoords].values, axis=1) / 6
+            np.einsum(
+                "ij,ij->i", lumen_pos_faces[lumen_edges], normals[lumen_edges]
+            )
+            / 6
         )
         eptm.settings["lumen_vol"] = -lumen_sub_vol.sum()
+
+
+def _update_cell_centroid(eptm):
+    """Updates the cell_df `coords` columns as the mean of the cell's
+    edges source positions, and the upcasted edge_df `c{coord}` columns
+    """
+    scoords = ["s" + c for c in eptm.coords]
+    eptm.cell_df[eptm.coords] = eptm.mean_cell(eptm.edge_df[scoords]).astype(
+        eptm.float_dtype, copy=False
+    )
+    cell_pos = eptm.upcast_cell(eptm.cell_df[eptm.coords], out="cell_pos")
+    for i, c in enumerate(eptm.coords):
+        eptm.edge_df["c" + c] = cell_pos[:, i]
+
+
+_FUSED_OWNERS = (
+    BulkGeometry,
+    RNRGeometry,
+    SheetGeometry,
+    PlanarGeometry,
+    BaseGeometry,
+)
@@ -6,6 +6,30 @@ class PlanarGeometry(BaseGeometry):
     """Geomtetry methods for 2D planar cell arangements
     """
 
+    update_steps = {
+        "update_dcoords": (),
+        "update_length": ("update_dcoords",),
+        "update_ucoords": ("update_dcoords", "update_length"),
+        "update_centroid": ("update_dcoords",),
+        "update_normals": ("update_centroid",),
+        "update_areas": ("update_normals",),
+        "update_perimeters": ("update_length",),
+    }
+    computed_by = {
+        ("edge", "scoords"): "update_dcoords",
+        ("edge", "tcoords"): "update_dcoords",
+        ("edge", "dcoords"): "update_dcoords",
+        ("edge", "ucoords"): "update_ucoords",
+        ("edge", "length"): "update_length",
+        ("face", "coords"): "update_centroid",
+        ("edge", "fcoords"): "update_centroid",
+        ("edge", "rcoords"): "update_centroid",
+        ("edge", "ncoords"): "update_normals",
+        ("edge", "sub_area"): "update_areas",
+        ("face", "area"): "update_areas",
+        ("face", "perimeter"): "update_perimeters",
+    }
+
     @classmethod
     def update_all(cls, sheet):
         """
@@ -18,8 +42,8 @@ class PlanarGeometry(BaseGeometry):
         """
 
         cls.update_dcoords(sheet)
-        cls.update_ucoords(sheet)
         cls.update_length(sheet)
+        cls.update_ucoords(sheet)
         cls.update_centroid(sheet)
         cls.update_normals(sheet)
         cls.update_areas(sheet)
@@ -40,7 +64,9 @@ class PlanarGeometry(BaseGeometry):
         Updates the normal coordinate of each (srce, trgt, face) face.
         """
         sheet.edge_df["sub_area"] = sheet.edge_df["nz"] / 2
-        sheet.face_df["area"] = sheet.sum_face(sheet.edge_df["sub_area"])
+        sheet.face_df["area"] = sheet.sum_face(sheet.edge_df["sub_area"]).astype(
+            sheet.float_dtype, copy=False
+        )
 
     @staticmethod
     def face_projected_pos(sheet, face, psi):
@@ -120,7 +146,7 @@ class WeightedPerimeterPlanarGeometry(PlanarGeometry):
         eptm.edge_df["weighted_length"] = eptm.edge_df.weight * \
             eptm.edge_df.length
         eptm.face_df["perimeter"] = eptm.sum_face(
-            eptm.edge_df["weighted_length"])
+            eptm.edge_df["weighted_length"]).astype(eptm.float_dtype, copy=False)
 
     @staticmethod
     def normalize_weights(sheet):
@@ -1,14 +1,50 @@
 import numpy as np
 import pandas as pd
 
+from .base_geometry import BaseGeometry, _owner, _write_columns
 from .planar_geometry import PlanarGeometry
 from .utils import rotation_matrix, rotation_matrices
 
+# steps of SheetGeometry.update_all computed at once when not overridden
+_FUSED_STEPS = (
+    "update_dcoords",
+    "update_length",
+    "update_ucoords",
+    "update_centroid",
+    "update_height",
+    "update_normals",
+    "update_areas",
+    "update_perimeters",
+    "update_vol",
+)
+_FUSED_GEOMETRIES = ("cylindrical", "flat", "spherical", "surfacic")
+
 
 class SheetGeometry(PlanarGeometry):
     """Geometry definitions for 2D sheets in 3D
     """
 
+    update_steps = {
+        "update_dcoords": (),
+        "update_length": ("update_dcoords",),
+        "update_ucoords": ("update_dcoords", "update_length"),
+        "update_centroid": ("update_dcoords",),
+        "update_height": (),
+        "update_normals": ("update_centroid",),
+        "update_areas": ("update_normals",),
+        "update_perimeters": ("update_length",),
+        "update_vol": ("update_height", "update_areas"),
+    }
+    computed_by = {
+        **PlanarGeometry.computed_by,
+        ("vert", "rho"): "update_height",
+        ("vert", "height"): "update_height",
+        ("face", "rho"): "update_height",
+        ("face", "height"): "update_height",
+        ("edge", "sub_vol"): "update_vol",
+        ("face", "vol"): "update_vol",
+    }
+
     @classmethod
     def update_all(cls, sheet):
         """
@@ -21,10 +57,19 @@ class SheetGeometry(PlanarGeometry):
         * the vertices heights (depends on geometry)
         * the face volumes (depends on geometry)
 
+        When none of those steps is overridden by `cls` and the sheet
+        has a plain layout (see `_fused_incidence`), all the quantities
+        are computed in a single pass over the position arrays, with
+        the same results.
         """
+        incidence = cls._fused_incidence(sheet)
+        if incidence is not None:
+            cls._update_all_fused(sheet, incidence)
+            return
+
         cls.update_dcoords(sheet)
-        cls.update_ucoords(sheet)
         cls.update_length(sheet)
+        cls.update_ucoords(sheet)
         cls.update_centroid(sheet)
         cls.update_height(sheet)
         cls.update_normals(sheet)
@@ -32,6 +77,213 @@ class SheetGeometry(PlanarGeometry):
         cls.update_perimeters(sheet)
         cls.update_vol(sheet)
 
+    @classmethod
+    def _fused_incidence(cls, sheet):
+        """Returns the face incidence matrix if the fused geometry update
+        can be used for `sheet`, None otherwise.
+        """
+        for name in _FUSED_STEPS:
+            if _owner(cls, name) not in (SheetGeometry, PlanarGeometry, BaseGeometry):
+                return None
+        settings = sheet.settings
+        if (
+            (sheet.dim != 3)
+            or (settings.get("boundaries") is not None)
+            or (settings.get("geometry", "cylindrical") not in _FUSED_GEOMETRIES)
+            or ("basal_shift" not in sheet.vert_df)
+            or (not sheet.Ne)
+            or (sheet.edge_df["face"].dtype.kind not in "iu")
+        ):
+            return None
+        incidence, _ = sheet.get_incidence("face")
+        # every face has edges and the face index is contiguous
+        if not sheet.cached_topo("contiguous_faces", _contiguous_faces, sheet):
+            return None
+        return incidence
+
+    @staticmethod
+    def _update_all_fused(sheet, incidence):
+        """Computes all the quantities of `update_all` in one pass,
+        writing the intermediate arrays in the sheet's scratch buffers.
+
+        The edge vectors are allocated with `sheet.float_dtype`, such
+        that the quantities derived from them are computed with the
+        sheet precision, while positions and sums over the edges are
+        computed in double precision.
+        """
+        coords = sheet.coords
+        edge_df, face_df, vert_df = sheet.edge_df, sheet.face_df, sheet.vert_df
+        pos = vert_df[coords].to_numpy(dtype=float)
+        num_edges = sheet.Ne
+        dtype = sheet.float_dtype
+
+        srce_pos = sheet.upcast_srce(pos, out="srce_pos")
+        trgt_pos = sheet.upcast_trgt(pos, out="trgt_pos")
+        dpos = np.subtract(
+            trgt_pos, srce_pos, out=sheet.get_buffer("dpos", (num_edges, 3), dtype)
+        )
+        length = np.linalg.norm(dpos, axis=1)
+        upos = dpos / length[:, np.newaxis]
+
+        # vertex heights, as in update_height
+        w = sheet.settings.get("height_axis", "z")
+        geometry = sheet.settings.get("geometry", "cylindrical")
+        u, v = (coords.index(c) for c in coords if c != w)
+        if geometry == "cylindrical":
+            rho = np.hypot(pos[:, v], pos[:, u])
+        elif geometry == "flat":
+            rho = pos[:, coords.index(w)].copy()
+        elif geometry == "spherical":
+            rho = np.linalg.norm(pos, axis=1)
+        else:  # surfacic
+            rho = np.ones(pos.shape[0])
+        height = rho - vert_df["basal_shift"].to_numpy()
+
+        counts = np.diff(incidence.indptr)[:, np.newaxis]
+        srce_height = sheet.upcast_srce(height, out="srce_height")
+        srce_rho = sheet.upcast_srce(rho, out="srce_rho")
+        face_means = (
+            incidence @ np.column_stack((srce_pos, srce_height, srce_rho))
+        ) / counts
+        face_pos = sheet.upcast_face(face_means[:, :3], out="face_pos")
+        rpos = np.subtract(
+            srce_pos, face_pos, out=sheet.get_buffer("rpos", (num_edges, 3), dtype)
+        )
+        normals = np.cross(rpos, dpos)
+        sub_area = np.linalg.norm(normals, axis=1) / 2
+        sub_vol = srce_height * sub_area
+        face_sums = incidence @ np.column_stack((sub_area, length, sub_vol))
+
+        edge_columns = (
+            (["s" + c for c in coords], srce_pos),
+            (["t" + c for c in coords], trgt_pos),
+            (sheet.dcoords, dpos),
+            (sheet.ucoords, upos),
+            (["length"], length[:, np.newaxis]),
+            (["f" + c for c in coords], face_pos),
+            (["r" + c for c in coords], rpos),
+            (sheet.ncoords, normals),
+            (["sub_area", "sub_vol"], np.column_stack((sub_area, sub_vol))),
+        )
+        for columns, values in edge_columns:
+            _write_columns(edge_df, columns, values, dtype)
+
+        vert_df["rho"] = rho
+        vert_df["height"] = height
+
+        face_columns = (
+            (coords, face_means[:, :3]),
+            (["height", "rho"], face_means[:, 3:]),
+            (["area", "perimeter", "vol"], face_sums),
+        )
+        for columns, values in face_columns:
+            _write_columns(face_df, columns, values, dtype)
+
+    @classmethod
+    def _update_local(cls, sheet, verts):
+        """Updates the edges and faces around `verts` with the fused
+        kernel, or falls back to `update_all` when it can't be used.
+        """
+        incidence = cls._fused_incidence(sheet)
+        if (
+            incidence is None
+            or _owner(cls, "update_all") is not _owner(cls, "_update_local")
+            or not _is_flat(sheet.vert_df.index)
+            or any(col not in sheet.vert_df for col in ("rho", "height"))
+            or any(col not in sheet.edge_df for col in _local_edge_columns(sheet))
+            or any(col not in sheet.face_df for col in _local_face_columns(sheet))
+        ):
+            cls.update_all(sheet)
+            return
+        cls._update_local_fused(sheet, verts, incidence)
+
+    @staticmethod
+    def _update_local_fused(sheet, verts, incidence):
+        """Same computations as `_update_all_fused`, restricted to the
+        vertices `verts`, the faces they belong to and those faces' edges.
+        """
+        verts = verts[(verts >= 0) & (verts < sheet.Nv)]
+        if not verts.size:
+            return
+        coords = sheet.coords
+        edge_df, face_df, vert_df = sheet.edge_df, sheet.face_df, sheet.vert_df
+
+        # only the columns' views are indexed, such that the work
+        # is proportional to the number of edges of the dirty faces
+        moved = np.concatenate(
+            [_csr_rows(sheet.get_incidence(lvl)[0], verts) for lvl in ("srce", "trgt")]
+        )
+        faces = np.unique(edge_df["face"].to_numpy()[moved])
+        sub = incidence[faces]
+        edges = sub.indices
+        starts = sub.indptr[:-1]
+        counts = np.diff(sub.indptr)
+        srce = edge_df["srce"].to_numpy()[edges]
+        trgt = edge_df["trgt"].to_numpy()[edges]
+
+        columns = [vert_df[c].to_numpy() for c in coords]
+        w = sheet.settings.get("height_axis", "z")
+        geometry = sheet.settings.get("geometry", "cylindrical")
+        u, v = (coords.index(c) for c in coords if c != w)
+        moved_pos = np.column_stack([col[verts] for col in columns]).astype(float)
+        if geometry == "cylindrical":
+            moved_rho = np.hypot(moved_pos[:, v], moved_pos[:, u])
+        elif geometry == "flat":
+            moved_rho = moved_pos[:, coords.index(w)]
+        elif geometry == "spherical":
+            moved_rho = np.linalg.norm(moved_pos, axis=1)
+        else:  # surfacic
+            moved_rho = np.ones(verts.size)
+        moved_height = moved_rho - vert_df["basal_shift"].to_numpy()[verts]
+        vert_cols = vert_df.columns.get_indexer(["rho", "height"])
+        vert_df.iloc[verts, vert_cols] = np.column_stack((moved_rho, moved_height))
+
+        srce_pos = np.column_stack([col[srce] for col in columns]).astype(float)
+        trgt_pos = np.column_stack([col[trgt] for col in columns]).astype(float)
+        # same precision as in `_update_all_fused`
+        dtype = sheet.float_dtype
+        dpos = (trgt_pos - srce_pos).astype(dtype, copy=False)
+        length = np.linalg.norm(dpos, axis=1)
+        upos = dpos / length[:, np.newaxis]
+        srce_height = vert_df["height"].to_numpy()[srce]
+
+        face_means = (
+            np.add.reduceat(
+                np.column_stack(
+                    (srce_pos, srce_height, vert_df["rho"].to_numpy()[srce])
+                ),
+                starts,
+                axis=0,
+            )
+            / counts[:, np.newaxis]
+        )
+        face_pos = np.repeat(face_means[:, :3], counts, axis=0)
+        rpos = (srce_pos - face_pos).astype(dtype, copy=False)
+        normals = np.cross(rpos, dpos)
+        sub_area = np.linalg.norm(normals, axis=1) / 2
+        sub_vol = srce_height * sub_area
+        face_sums = np.add.reduceat(
+            np.column_stack((sub_area, length, sub_vol)), starts, axis=0
+        )
+
+        edge_cols = edge_df.columns.get_indexer(_local_edge_columns(sheet))
+        face_cols = face_df.columns.get_indexer(_local_face_columns(sheet))
+        edge_df.iloc[edges, edge_cols] = np.column_stack(
+            (
+                srce_pos,
+                trgt_pos,
+                dpos,
+                upos,
+                length,
+                face_pos,
+                rpos,
+                normals,
+                sub_area,
+                sub_vol,
+            )
+        )
+        face_df.iloc[faces, face_cols] = np.column_stack((face_means, face_sums))
+
     @staticmethod
     def update_normals(sheet):
         """
@@ -52,7 +304,9 @@ class SheetGeometry(PlanarGeometry):
         sheet.edge_df["sub_area"] = (
             np.linalg.norm(sheet.edge_df[sheet.ncoords], axis=1) / 2
         )
-        sheet.face_df["area"] = sheet.sum_face(sheet.edge_df["sub_area"])
+        sheet.face_df["area"] = sheet.sum_face(sheet.edge_df["sub_area"]).astype(
+            sheet.float_dtype, copy=False
+        )
 
     @staticmethod
     def update_vol(sheet):
@@ -61,11 +315,14 @@ class SheetGeometry(PlanarGeometry):
         module.
 
         """
+        dtype = sheet.float_dtype
         sheet.edge_df["sub_vol"] = (
             sheet.upcast_srce(
                 sheet.vert_df["height"]) * sheet.edge_df["sub_area"]
+        ).astype(dtype, copy=False)
+        sheet.face_df["vol"] = sheet.sum_face(sheet.edge_df["sub_vol"]).astype(
+            dtype, copy=False
         )
-        sheet.face_df["vol"] = sheet.sum_face(sheet.edge_df["sub_vol"])
 
     @classmethod
     def update_height(cls, sheet):
@@ -106,19 +363,17 @@ class SheetGeometry(PlanarGeometry):
 
             a, b = sheet.settings["ab"]
             w0 = b - a
-            sheet.vert_df["rho"] = np.linalg.norm(
-                sheet.vert_df[[u, v]], axis=1)
-            sheet.vert_df["left_tip"] = sheet.vert_df[w] < -w0
-            sheet.vert_df["right_tip"] = sheet.vert_df[w] > w0
-            l_mask = sheet.vert_df[sheet.vert_df["left_tip"] == 1].index
-            r_mask = sheet.vert_df[sheet.vert_df["right_tip"] == 1].index
-
-            sheet.vert_df.loc[l_mask, "rho"] = cls.dist_to_point(
-                sheet.vert_df.loc[l_mask], [0, 0, -w0], [u, v, w]
-            )
-            sheet.vert_df.loc[r_mask, "rho"] = cls.dist_to_point(
-                sheet.vert_df.loc[r_mask], [0, 0, w0], [u, v, w]
+            axial = sheet.vert_df[w].to_numpy()
+            radial = np.hypot(sheet.vert_df[u].to_numpy(), sheet.vert_df[v].to_numpy())
+            left_tip = axial < -w0
+            right_tip = axial > w0
+            # distance to the closest focus on the tips
+            focus = np.where(left_tip, -w0, w0)
+            sheet.vert_df["rho"] = np.where(
+                left_tip | right_tip, np.hypot(radial, axial - focus), radial
             )
+            sheet.vert_df["left_tip"] = left_tip
+            sheet.vert_df["right_tip"] = right_tip
 
         elif sheet.settings["geometry"] == "surfacic":
             sheet.vert_df["rho"] = 1.0
@@ -127,8 +382,9 @@ class SheetGeometry(PlanarGeometry):
             "rho"] - sheet.vert_df["basal_shift"]
 
         edge_height = sheet.upcast_srce(sheet.vert_df[["height", "rho"]])
-        edge_height.set_index(sheet.edge_df["face"], append=True, inplace=True)
-        sheet.face_df[["height", "rho"]] = edge_height.mean(level="face")
+        sheet.face_df[["height", "rho"]] = sheet.mean_face(edge_height).astype(
+            sheet.float_dtype, copy=False
+        )
 
     @classmethod
     def reset_scafold(cls, sheet):
@@ -322,6 +578,11 @@ class ClosedSheetGeometry(SheetGeometry):
         super().update_all(sheet)
         cls.update_lumen_vol(sheet)
 
+    @classmethod
+    def _update_local(cls, sheet, verts):
+        super()._update_local(sheet, verts)
+        cls.update_lumen_vol(sheet)
+
     @staticmethod
     def update_lumen_vol(sheet):
         lumen_pos_faces = sheet.edge_df[
@@ -411,6 +672,53 @@ class WeightedPerimeterEllipsoidLameGeometry(ClosedSheetGeometry):
         eptm.vert_df["height"] = eptm.vert_df["rho"]
 
 
+def _is_flat(index):
+    """True if `index` is 0, 1, ..., len(index) - 1"""
+    return (
+        index.is_monotonic_increasing
+        and index.is_unique
+        and (not len(index) or (index[0] == 0 and index[-1] == len(index) - 1))
+    )
+
+
+def _contiguous_faces(sheet):
+    """True if every face of `sheet` has edges and the face index
+    is contiguous
+    """
+    incidence, present = sheet.get_incidence("face")
+    return present.size == incidence.shape[0] == sheet.Nf and np.array_equal(
+        sheet.face_df.index, present
+    )
+
+
+def _csr_rows(matrix, rows):
+    """Returns the column indices of the non zero values of a CSR
+    matrix over `rows`, ignoring rows out of its shape.
+    """
+    return matrix[rows[rows < matrix.shape[0]]].indices
+
+
+def _local_edge_columns(sheet):
+    """The edge columns written by the local update, in order"""
+    coords = sheet.coords
+    return (
+        ["s" + c for c in coords]
+        + ["t" + c for c in coords]
+        + list(sheet.dcoords)
+        + list(sheet.ucoords)
+        + ["length"]
+        + ["f" + c for c in coords]
+        + ["r" + c for c in coords]
+        + list(sheet.ncoords)
+        + ["sub_area", "sub_vol"]
+    )
+
+
+def _local_face_columns(sheet):
+    """The face columns written by the local update, in order"""
+    return list(sheet.coords) + ["height", "rho", "area", "perimeter", "vol"]
+
+
 def face_svd_(faces):
 
     rel_pos = faces[["rx", "ry", "rz"]]
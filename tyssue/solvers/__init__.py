@@ -1,2 +1,4 @@
 """ solvers """
 from .quasistatic import QSSolver
+from .fire import FIRE
+from .lbfgs import LBFGS
@@ -1,4 +1,7 @@
 import logging
+
+import numpy as np
+
 from ..topology import TopologyChangeError
 
 log = logging.getLogger(__name__)
@@ -19,3 +22,101 @@ def set_pos(eptm, geom, pos):
         (-1, eptm.dim)
     )
     geom.update_all(eptm)
+
+
+class VertexTracker:
+    """Follows the active vertices of an epithelium through topology
+    changes, such that the state of a minimizer over their coordinates
+    can be mapped onto the new vertices.
+
+    The vertices are tagged with an identifier column (removed by
+    `release`), which is carried along by the topology changes.
+    """
+
+    column = "tracker_id"
+
+    def __init__(self, eptm):
+        self.eptm = eptm
+        self.tag()
+
+    def tag(self):
+        """Tags the current vertices and records their connectivity"""
+        eptm = self.eptm
+        eptm.vert_df[self.column] = np.arange(eptm.Nv, dtype=float)
+        self.ids, self.edges = self._snapshot()
+
+    def release(self):
+        """Removes the identifier column"""
+        self.eptm.vert_df.drop(columns=self.column, inplace=True, errors="ignore")
+
+    def remap(self):
+        """Matches the active vertices with the ones of the previous
+        call (or of the creation of the tracker), and tags them anew.
+
+        Returns
+        -------
+        indexer : int array with the size of the active coordinates,
+          the position of each coordinate among the previous ones,
+          or -1 for the coordinates of new vertices
+        affected : bool array with the size of the active coordinates,
+          True for the coordinates of the new vertices and of the
+          vertices whose neighbours changed
+        """
+        ids, edges = self._snapshot()
+        changed = np.setxor1d(self.edges, edges)
+        affected_ids = np.union1d(changed // _ID_SHIFT, changed % _ID_SHIFT)
+        affected = (ids < 0) | np.isin(ids, affected_ids)
+
+        position = np.full(max(self.ids.max(initial=-1), ids.max(initial=-1)) + 1, -1)
+        position[self.ids[self.ids >= 0]] = np.flatnonzero(self.ids >= 0)
+        vert_indexer = np.where(ids >= 0, position[np.maximum(ids, 0)], -1)
+        affected |= vert_indexer < 0
+
+        dim = self.eptm.dim
+        indexer = np.where(
+            vert_indexer[:, np.newaxis] >= 0,
+            vert_indexer[:, np.newaxis] * dim + np.arange(dim),
+            -1,
+        ).ravel()
+        self.tag()
+        return indexer, np.repeat(affected, dim)
+
+    def _snapshot(self):
+        """Returns the identifiers of the active vertices, -1 for the
+        untagged or duplicated ones, and the sorted keys of the
+        identifiers pairs of the edges
+        """
+        vert_df, edge_df = self.eptm.vert_df, self.eptm.edge_df
+        if self.column not in vert_df:
+            # the tags were lost (e.g. the vertex table was rebuilt)
+            vert_df[self.column] = np.nan
+        tags = vert_df[self.column].to_numpy(dtype=float)
+        tags = np.where(np.isnan(tags), -1, tags).astype(np.int64)
+        _, inverse, counts = np.unique(tags, return_inverse=True, return_counts=True)
+        tags[counts[inverse] > 1] = -1
+
+        srce = tags[vert_df.index.get_indexer(edge_df["srce"])]
+        trgt = tags[vert_df.index.get_indexer(edge_df["trgt"])]
+        valid = (srce >= 0) & (trgt >= 0)
+        low = np.minimum(srce, trgt)[valid]
+        high = np.maximum(srce, trgt)[valid]
+        edges = np.unique(low * _ID_SHIFT + high)
+
+        active = vert_df["is_active"].to_numpy().astype(bool)
+        return tags[active], edges
+
+
+# multiplier encoding the pairs of vertex identifiers
+_ID_SHIFT = 2 ** 31
+
+
+def remap_coordinates(values, indexer, affected=None):
+    """Maps the `values` over previous coordinates onto new ones,
+    see :meth:`VertexTracker.remap`, the new and `affected`
+    coordinates being set to 0.
+    """
+    values = np.asarray(values)
+    remapped = np.where(indexer >= 0, values[np.maximum(indexer, 0)], 0.0)
+    if affected is not None:
+        remapped[affected] = 0.0
+    return remapped
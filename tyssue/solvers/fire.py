@@ -0,0 +1,195 @@
+"""FIRE minimizer
+
+The Fast Inertial Relaxation Engine of Bitzek et al. [1]_, with the
+semi-implicit Euler integration of Guénolé et al. [2]_, relaxes the
+system with a damped dynamics whose velocity is steered towards the
+force. It only needs the gradient and has no line search, which suits
+the large and nearly flat energy landscapes of jammed vertex models.
+
+.. [1] Bitzek et al., Phys. Rev. Lett. 97, 170201 (2006)
+   https://doi.org/10.1103/PhysRevLett.97.170201
+.. [2] Guénolé et al., Comput. Mater. Sci. 175, 109584 (2020)
+   https://doi.org/10.1016/j.commatsci.2020.109584
+
+"""
+import logging
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from .base import remap_coordinates
+
+log = logging.getLogger(__name__)
+
+
+class FIRE:
+    """FIRE minimizer
+
+    The time step, mixing factor and velocity are kept by the instance
+    between calls to `minimize`, such that a minimization interrupted
+    (e.g. by a topology change) can be resumed where it stopped, after
+    mapping the velocity on the new coordinates with `remap`.
+
+    Parameters
+    ----------
+    dt : float, default 0.1
+      initial time step
+    dt_max : float, default 1.0
+      maximum time step
+    dt_min : float, default 1e-4
+      minimum time step
+    n_delay : int, default 5
+      number of steps with a positive power before increasing the time step
+    f_inc : float, default 1.1
+      time step increase factor
+    f_dec : float, default 0.5
+      time step decrease factor
+    alpha_start : float, default 0.1
+      initial velocity mixing factor
+    f_alpha : float, default 0.99
+      mixing factor decrease factor
+    max_step : float, default 0.1
+      maximum displacement of a coordinate in one step
+    gtol : float, default 1e-3
+      the minimization stops when the maximum absolute value of the
+      gradient is below `gtol`
+    maxiter : int, default 10000
+      maximum number of iterations
+    disp : bool, default False
+      if True, logs the convergence message at the info level
+    ftol : ignored
+      accepted for compatibility with the default L-BFGS-B options
+    """
+
+    def __init__(
+        self,
+        dt=0.1,
+        dt_max=1.0,
+        dt_min=1e-4,
+        n_delay=5,
+        f_inc=1.1,
+        f_dec=0.5,
+        alpha_start=0.1,
+        f_alpha=0.99,
+        max_step=0.1,
+        gtol=1e-3,
+        maxiter=10000,
+        disp=False,
+        ftol=None,
+    ):
+        self.dt_start = dt
+        self.dt_max = dt_max
+        self.dt_min = dt_min
+        self.n_delay = n_delay
+        self.f_inc = f_inc
+        self.f_dec = f_dec
+        self.alpha_start = alpha_start
+        self.f_alpha = f_alpha
+        self.max_step = max_step
+        self.gtol = gtol
+        self.maxiter = maxiter
+        self.disp = disp
+        self.velocity = None
+        self.nfev = 0
+        self.reset()
+
+    def reset(self):
+        """Resets the time step and mixing factor to their initial values"""
+        self.dt = self.dt_start
+        self.alpha = self.alpha_start
+        self.n_pos = 0
+
+    def remap(self, indexer, affected=None):
+        """Maps the velocity onto new coordinates, the velocity of the
+        new and `affected` coordinates being set to 0 (see
+        :meth:`VertexTracker.remap`)
+        """
+        if self.velocity is not None:
+            self.velocity = remap_coordinates(self.velocity, indexer, affected)
+
+    def minimize(self, fun, x0, args=(), mask=None, velocity=None):
+        """Minimizes `fun` from `x0`
+
+        Parameters
+        ----------
+        fun : callable, `fun(x, *args)` returns the energy and its
+          gradient, as with `jac=True` in `scipy.optimize.minimize`
+        x0 : 1D array, the initial positions
+        args : tuple, extra arguments passed to `fun`
+        mask : boolean array with the shape of `x0`, optional
+          only the coordinates where `mask` is True are moved
+        velocity : 1D array, optional
+          initial velocity, by default the one stored from a previous
+          call if its shape matches, zero otherwise
+
+        Returns
+        -------
+        res : :class:`scipy.optimize.OptimizeResult`, with the final
+          velocity in the `velocity` attribute
+        """
+        x = np.array(x0, dtype=float)
+        if mask is None:
+            mask = np.ones(x.shape, dtype=bool)
+        if velocity is None:
+            velocity = self.velocity
+        if velocity is None or np.shape(velocity) != x.shape:
+            velocity = np.zeros_like(x)
+        v = np.where(mask, velocity, 0.0)
+        self.velocity = v
+
+        self.nfev = 0
+        energy, grad = fun(x, *args)
+        self.nfev += 1
+        force = np.where(mask, -np.asarray(grad, dtype=float), 0.0)
+        success, message = False, "Maximum number of iterations reached"
+        for nit in range(self.maxiter + 1):
+            if np.abs(force).max(initial=0.0) < self.gtol:
+                success, message = True, "Converged (|grad|_max < gtol)"
+                break
+            if nit == self.maxiter:
+                break
+            power = force @ v
+            if power > 0:
+                self.n_pos += 1
+                if self.n_pos > self.n_delay:
+                    self.dt = min(self.dt * self.f_inc, self.dt_max)
+                    self.alpha *= self.f_alpha
+            elif power < 0:
+                # uphill: step back half way, stop and slow down
+                x -= 0.5 * self.dt * v
+                v[:] = 0.0
+                self.n_pos = 0
+                self.dt = max(self.dt * self.f_dec, self.dt_min)
+                self.alpha = self.alpha_start
+
+            v += self.dt * force
+            f_norm = np.linalg.norm(force)
+            if f_norm > 0:
+                v = (1 - self.alpha) * v + self.alpha * np.linalg.norm(v) * (
+                    force / f_norm
+                )
+            step = self.dt * v
+            largest = np.abs(step).max(initial=0.0)
+            if largest > self.max_step:
+                step *= self.max_step / largest
+            x += step
+            # stored before the evaluation, which might be interrupted
+            self.velocity = v
+
+            energy, grad = fun(x, *args)
+            self.nfev += 1
+            force = np.where(mask, -np.asarray(grad, dtype=float), 0.0)
+
+        if self.disp:
+            log.info("FIRE: %s after %d iterations", message, nit)
+        return OptimizeResult(
+            x=x,
+            fun=energy,
+            jac=np.asarray(grad),
+            nit=nit,
+            nfev=self.nfev,
+            success=success,
+            status=0 if success else 1,
+            message=message,
+            velocity=v,
+        )
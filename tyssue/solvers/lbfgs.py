@@ -0,0 +1,181 @@
+"""Resumable L-BFGS minimizer
+
+A limited memory BFGS minimizer with a backtracking line search, whose
+memory of position and gradient differences is kept between calls to
+`minimize`. After a topology change, the memory is mapped onto the new
+vertices instead of being lost as with a fresh `scipy.optimize.minimize`
+call, see :meth:`LBFGS.remap`.
+
+"""
+import logging
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from .base import remap_coordinates
+
+log = logging.getLogger(__name__)
+
+
+class LBFGS:
+    """L-BFGS minimizer with a remappable memory
+
+    Parameters
+    ----------
+    maxcor : int, default 10
+      number of (position, gradient) difference pairs kept in memory
+    gtol : float, default 1e-3
+      the minimization stops when the maximum absolute value of the
+      gradient is below `gtol`
+    ftol : float, default 2.2e-9
+      the minimization stops when the relative energy decrease of
+      an iteration is below `ftol` (the default is the one of
+      scipy's L-BFGS-B)
+    maxiter : int, default 15000
+      maximum number of iterations
+    max_step : float, default 0.1
+      maximum displacement of a coordinate in the first trial of a
+      line search
+    c1 : float, default 1e-4
+      sufficient decrease parameter of the line search
+    max_ls : int, default 20
+      maximum number of backtracking steps in the line search
+    disp : bool, default False
+      if True, logs the convergence message at the info level
+    """
+
+    def __init__(
+        self,
+        maxcor=10,
+        gtol=1e-3,
+        ftol=2.220446049250313e-09,
+        maxiter=15000,
+        max_step=0.1,
+        c1=1e-4,
+        max_ls=20,
+        disp=False,
+    ):
+        self.maxcor = maxcor
+        self.gtol = gtol
+        self.ftol = ftol
+        self.maxiter = maxiter
+        self.max_step = max_step
+        self.c1 = c1
+        self.max_ls = max_ls
+        self.disp = disp
+        # position and gradient differences
+        self.memory = []
+        self.nfev = 0
+
+    def remap(self, indexer, affected=None):
+        """Maps the memory pairs onto new coordinates (see
+        :meth:`VertexTracker.remap`), dropping their entries on the
+        new and `affected` coordinates, and the pairs left without
+        positive curvature.
+        """
+        memory = []
+        for s, y in self.memory:
+            s = remap_coordinates(s, indexer, affected)
+            y = remap_coordinates(y, indexer, affected)
+            if s @ y > 1e-10 * (y @ y):
+                memory.append((s, y))
+        log.info("kept %d of %d memory pairs", len(memory), len(self.memory))
+        self.memory = memory
+
+    def direction(self, grad):
+        """Returns the L-BFGS descent direction for `grad`
+        (two loops recursion)
+        """
+        q = -grad
+        alphas = []
+        for s, y in reversed(self.memory):
+            alpha = (s @ q) / (y @ s)
+            q = q - alpha * y
+            alphas.append(alpha)
+        if self.memory:
+            s, y = self.memory[-1]
+            q = q * (s @ y) / (y @ y)
+        for (s, y), alpha in zip(self.memory, reversed(alphas)):
+            beta = (y @ q) / (y @ s)
+            q = q + s * (alpha - beta)
+        return q
+
+    def minimize(self, fun, x0, args=()):
+        """Minimizes `fun` from `x0`, starting with the current memory
+        if it matches the shape of `x0`
+
+        Parameters
+        ----------
+        fun : callable, `fun(x, *args)` returns the energy and its
+          gradient, as with `jac=True` in `scipy.optimize.minimize`
+        x0 : 1D array, the initial positions
+        args : tuple, extra arguments passed to `fun`
+
+        Returns
+        -------
+        res : :class:`scipy.optimize.OptimizeResult`
+        """
+        x = np.array(x0, dtype=float)
+        if any(s.shape != x.shape for s, _ in self.memory):
+            self.memory = []
+
+        self.nfev = 0
+        energy, grad = fun(x, *args)
+        grad = np.asarray(grad, dtype=float)
+        self.nfev += 1
+        success, message = False, "Maximum number of iterations reached"
+        for nit in range(self.maxiter + 1):
+            if np.abs(grad).max(initial=0.0) < self.gtol:
+                success, message = True, "Converged (|grad|_max < gtol)"
+                break
+            if nit == self.maxiter:
+                break
+            direction = self.direction(grad)
+            slope = grad @ direction
+            if slope >= 0:
+                # not a descent direction, forget the memory
+                self.memory = []
+                direction = -grad
+                slope = grad @ direction
+            step = 1.0
+            largest = np.abs(direction).max()
+            if not self.memory and largest > self.max_step:
+                step = self.max_step / largest
+
+            for _ in range(self.max_ls):
+                new_x = x + step * direction
+                new_energy, new_grad = fun(new_x, *args)
+                new_grad = np.asarray(new_grad, dtype=float)
+                self.nfev += 1
+                if new_energy <= energy + self.c1 * step * slope:
+                    break
+                step /= 2
+            else:
+                message = "Line search failed"
+                break
+
+            s, y = new_x - x, new_grad - grad
+            if s @ y > 1e-10 * (y @ y):
+                self.memory.append((s, y))
+                if len(self.memory) > self.maxcor:
+                    self.memory.pop(0)
+            converged = energy - new_energy <= self.ftol * max(
+                abs(energy), abs(new_energy), 1.0
+            )
+            x, energy, grad = new_x, new_energy, new_grad
+            if converged:
+                success, message = True, "Converged (relative energy decrease < ftol)"
+                break
+
+        if self.disp:
+            log.info("L-BFGS: %s after %d iterations", message, nit)
+        return OptimizeResult(
+            x=x,
+            fun=energy,
+            jac=grad,
+            nit=nit,
+            nfev=self.nfev,
+            success=success,
+            status=0 if success else 1,
+            message=message,
+        )
@@ -1,21 +1,82 @@
 """Quasistatic solver for vertex models
 
 """
+import hashlib
 import numpy as np
 import logging
+from collections import OrderedDict
 from itertools import count
 
 from scipy import optimize
 from .. import config
 from ..collisions import auto_collisions
 from ..topology import auto_t1, auto_t3
+from ..utils import profiling
 
-from .base import TopologyChangeError, set_pos
+from .base import TopologyChangeError, VertexTracker, set_pos
+from .fire import FIRE
+from .lbfgs import LBFGS
 
 log = logging.getLogger(__name__)
 
 MAX_ITER = 100
 
+# scipy.optimize.minimize methods using Hessian-vector products
+HESSIAN_METHODS = ("newton-cg", "trust-ncg", "trust-krylov", "trust-constr")
+
+# minimizers whose state is carried across topology changes
+RESUMABLE_METHODS = {"FIRE": FIRE, "L-BFGS": LBFGS}
+
+
+class PositionCache:
+    """Least recently used cache of the energies and gradients
+    evaluated at given positions.
+
+    The entries are keyed by a hash of the position vector (including
+    the box size for periodic tissues), such that repeated evaluations
+    at the same point, for example by a line search, are free.
+    """
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(pos):
+        pos = np.ascontiguousarray(pos, dtype=float)
+        return pos.shape, hashlib.blake2b(pos.tobytes(), digest_size=16).digest()
+
+    def get(self, pos, name):
+        """Returns the cached `name` value (e.g. "energy" or "grad")
+        at `pos`, or None
+        """
+        key = self.key(pos)
+        entry = self._entries.get(key)
+        if entry is None or name not in entry:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[name]
+
+    def set(self, pos, **values):
+        """Stores the `values` evaluated at `pos`"""
+        if not self.maxsize:
+            return
+        key = self.key(pos)
+        self._entries.setdefault(key, {}).update(values)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
 
 class QSSolver:
     """Quasistatic solver performing a gradient descent on a :class:`tyssue.Epithelium`
@@ -30,7 +91,14 @@ class QSSolver:
       by the model
     """
 
-    def __init__(self, with_collisions=False, with_t1=False, with_t3=False):
+    def __init__(
+        self,
+        with_collisions=False,
+        with_t1=False,
+        with_t3=False,
+        minimal_geometry=False,
+        cache_size=8,
+    ):
         """Creates a quasistatic gradient descent solver with optional
         type1, type3 and collision detection and solving routines.
 
@@ -45,6 +113,14 @@ class QSSolver:
             whether or not to solve type 3 transitions
             (i.e. elimnation of small triangular faces) at each
             iteration.
+        minimal_geometry : bool, default False
+            if True, only the geometrical quantities needed by the model's
+            effectors are updated during the minimization (see
+            `BaseGeometry.update_plan`), and the full geometry is updated
+            once at the end.
+        cache_size : int, default 8
+            number of evaluations at distinct positions kept in the solver's
+            :class:`PositionCache`, 0 disables the cache.
 
         Those corrections are applied in this order: first the type 1, then the
         type 3, then the collisions
@@ -59,8 +135,13 @@ class QSSolver:
             self.set_pos = auto_collisions(self.set_pos)
         self.restart = True
         self.rearange = with_t1 or with_t3
+        self.minimal_geometry = minimal_geometry
         self.res = {"success": False, "message": "Not Started"}
         self.num_restarts = 0
+        self.num_evaluations = 0
+        # (positions, active Hessian) of the last Hessian evaluation
+        self._hessian = None
+        self.cache = PositionCache(cache_size)
 
     def find_energy_min(self, eptm, geom, model, periodic=False, **minimize_kw):
         """Energy minimization function.
@@ -77,17 +158,60 @@ class QSSolver:
         model : a model class
             model must provide `compute_energy` and `compute_gradient` methods
             that take `eptm` as first and unique positional argument.
+            If the model also provides a `compute_energy_and_gradient` method,
+            it is used to evaluate both in a single call (`jac=True`).
+
+        With `method="FIRE"` or `method="L-BFGS"` (see `RESUMABLE_METHODS`),
+        the :class:`FIRE` or :class:`LBFGS` minimizer is used instead of
+        `scipy.optimize.minimize`, with the parameters passed in `options`
+        (periodic tissues are not supported). After a topology change, the
+        minimization resumes with the minimizer's state (velocity or memory
+        pairs) mapped onto the new vertices, only the entries on the
+        vertices involved in the rearrangement being dropped.
+
+        With a Newton or trust region `method` (see `HESSIAN_METHODS`),
+        Hessian-vector products are computed from the model's
+        `compute_hessian` method if available, by finite differences of
+        the gradient otherwise. Those methods rely on the gradient being
+        the exact derivative of the energy, which is not the case of the
+        area and volume gradients of 3D sheets, as they neglect the
+        displacement of the face centroids.
+
+        The number of restarts due to topology changes and the number of
+        model evaluations are stored in the `num_restarts` and
+        `num_evaluations` keys of the returned result.
 
         """
         log.info("initial number of vertices: %i", eptm.Nv)
         settings = config.solvers.quasistatic()
         settings.update(**minimize_kw)
-        if periodic == False:
-            res = self._minimize(eptm, geom, model, **settings)
-        else:
-            res = self._minimize_pbc(eptm, geom, model, **settings)
+        full_geom = geom
+        if self.minimal_geometry:
+            geom = geom.restrict(getattr(model, "requires", None))
+        restricted = geom is not full_geom
+        self.cache.clear()
+        self.num_restarts = 0
+        self.num_evaluations = 0
+        if profiling.active_profiler() is not None and hasattr(geom, "profiled"):
+            geom = geom.profiled()
+        with profiling.section("solver", "find_energy_min"):
+            method = str(settings.get("method")).upper()
+            if method in RESUMABLE_METHODS:
+                if periodic:
+                    raise ValueError(
+                        f"The {method} method doesn't support periodic tissues"
+                    )
+                minimizer = RESUMABLE_METHODS[method](**settings.get("options", {}))
+                res = self._minimize_resumable(eptm, geom, model, minimizer)
+            elif periodic == False:
+                res = self._minimize(eptm, geom, model, **settings)
+            else:
+                res = self._minimize_pbc(eptm, geom, model, **settings)
+        if restricted:
+            full_geom.update_all(eptm)
         log.info("final number of vertices: %i", eptm.Nv)
-
+        res["num_restarts"] = self.num_restarts
+        res["num_evaluations"] = self.num_evaluations
         return res
 
     def _minimize(self, eptm, geom, model, **kwargs):
@@ -97,33 +221,184 @@ class QSSolver:
             pos0 = eptm.vert_df.loc[
                 eptm.vert_df.is_active.astype(bool), eptm.coords
             ].values.flatten()
+            if hasattr(model, "compute_energy_and_gradient"):
+                fun, jac = self._opt_energy_and_grad, True
+            else:
+                fun, jac = self._opt_energy, self._opt_grad
+            if str(kwargs.get("method", "")).lower() in HESSIAN_METHODS:
+                kwargs.setdefault("hessp", self._opt_hessp)
+            self._hessian = None
+            self.cache.clear()
             try:
                 self.res = optimize.minimize(
-                    self._opt_energy,
-                    pos0,
-                    args=(eptm, geom, model),
-                    jac=self._opt_grad,
-                    **kwargs
+                    fun, pos0, args=(eptm, geom, model), jac=jac, **kwargs
                 )
+                # the last evaluation might not be at the solution
+                self._sync(self.res.x, eptm, geom)
                 return self.res
             except TopologyChangeError:
                 log.info("TopologyChange")
+                profiling.count("solver", "topology_change")
                 self.num_restarts = i + 1
 
+    def _minimize_resumable(self, eptm, geom, model, minimizer):
+        """Minimization with one of the `RESUMABLE_METHODS`, whose state
+        is remapped on the new vertices after each topology change.
+        """
+        if hasattr(model, "compute_energy_and_gradient"):
+            fun = self._opt_energy_and_grad
+        else:
+
+            def fun(pos, *args):
+                return self._opt_energy(pos, *args), self._opt_grad(pos, *args)
+
+        tracker = VertexTracker(eptm)
+        nfev = 0
+        try:
+            for i in count():
+                if i == MAX_ITER:
+                    break
+                pos0 = self._current_pos(eptm)
+                self._hessian = None
+                self.cache.clear()
+                try:
+                    self.res = minimizer.minimize(
+                        fun, pos0, args=(eptm, geom, model)
+                    )
+                    self._sync(self.res.x, eptm, geom)
+                    # evaluations over all the restarts
+                    self.res["nfev"] = nfev + minimizer.nfev
+                    break
+                except TopologyChangeError:
+                    log.info("TopologyChange")
+                    profiling.count("solver", "topology_change")
+                    self.num_restarts = i + 1
+                    nfev += minimizer.nfev
+                    indexer, affected = tracker.remap()
+                    minimizer.remap(indexer, affected)
+        finally:
+            tracker.release()
+        return self.res
+
+    def _sync(self, pos, eptm, geom, periodic=False):
+        """Moves the vertices (and the periodic box) to `pos` if they are
+        elsewhere, e.g. after the evaluation of a rejected trial step
+        """
+        if np.array_equal(self._current_pos(eptm, periodic), pos):
+            return
+        if periodic:
+            self._set_box(eptm, pos[-1])
+            pos = pos[:-1]
+        profiling.call("solver", "set_pos", set_pos, eptm, geom, pos)
+
+    @staticmethod
+    def _current_pos(eptm, periodic=False):
+        pos = eptm.vert_df.loc[
+            eptm.vert_df.is_active.astype(bool), eptm.coords
+        ].values.ravel()
+        if periodic:
+            for u in eptm.settings["boundaries"]:
+                size = eptm.specs["settings"]["boundaries"][u][1]
+            pos = np.append(pos, size)
+        return pos
+
+    @staticmethod
+    def _set_box(eptm, size):
+        for u, boundary in eptm.settings["boundaries"].items():
+            eptm.specs["settings"]["boundaries"][u] = [boundary[0], size]
+
+    @staticmethod
+    def _active_grad(eptm, model):
+        grad_i = profiling.call("solver", "gradient", model.compute_gradient, eptm)
+        return grad_i.loc[eptm.vert_df.is_active.astype(bool)].values.ravel()
+
+    def _opt_energy_and_grad(self, pos, eptm, geom, model):
+        energy = self.cache.get(pos, "energy")
+        grad = self.cache.get(pos, "grad")
+        if energy is not None and grad is not None:
+            return energy, grad.copy()
+        if self.rearange and eptm.topo_changed:
+            # reset switch
+            eptm.topo_changed = False
+            raise TopologyChangeError("Topology changed before energy evaluation")
+        profiling.call("solver", "set_pos", self.set_pos, eptm, geom, pos)
+        if self.rearange and eptm.topo_changed:
+            # the gradient can't be mapped back on the previous vertices
+            eptm.topo_changed = False
+            raise TopologyChangeError("Topology changed before gradient evaluation")
+        energy, grad_i = profiling.call(
+            "solver", "energy_and_gradient", model.compute_energy_and_gradient, eptm
+        )
+        self.num_evaluations += 1
+        grad = grad_i.loc[eptm.vert_df.is_active.astype(bool)].values.ravel()
+        self.cache.set(pos, energy=energy, grad=grad)
+        return energy, grad.copy()
+
     def _opt_energy(self, pos, eptm, geom, model):
+        energy = self.cache.get(pos, "energy")
+        if energy is not None:
+            return energy
         if self.rearange and eptm.topo_changed:
             # reset switch
             eptm.topo_changed = False
             raise TopologyChangeError("Topology changed before energy evaluation")
-        self.set_pos(eptm, geom, pos)
-        return model.compute_energy(eptm)
+        profiling.call("solver", "set_pos", self.set_pos, eptm, geom, pos)
+        energy = profiling.call("solver", "energy", model.compute_energy, eptm)
+        self.num_evaluations += 1
+        self.cache.set(pos, energy=energy)
+        return energy
 
-    # The unused arguments bellow are legit, we need the same signature as _opt_energy
     def _opt_grad(self, pos, eptm, geom, model):
+        grad = self.cache.get(pos, "grad")
+        if grad is not None:
+            return grad.copy()
         if self.rearange and eptm.topo_changed:
             raise TopologyChangeError("Topology changed before gradient evaluation")
-        grad_i = model.compute_gradient(eptm)
-        return grad_i.loc[eptm.vert_df.is_active.astype(bool)].values.ravel()
+        self._sync(pos, eptm, geom)
+        grad = self._active_grad(eptm, model)
+        self.cache.set(pos, grad=grad)
+        return grad.copy()
+
+    def _opt_hessp(self, pos, vector, eptm, geom, model):
+        if self.rearange and eptm.topo_changed:
+            raise TopologyChangeError("Topology changed before Hessian evaluation")
+        if self._hessian is None or not np.array_equal(self._hessian[0], pos):
+            self._sync(pos, eptm, geom)
+            hessian = profiling.call(
+                "solver", "hessian", self._active_hessian, eptm, model
+            )
+            self._hessian = (pos.copy(), hessian)
+        profiling.count("solver", "hessp")
+        hessian = self._hessian[1]
+        if hessian is not None:
+            return hessian.dot(vector)
+        # finite differences of the gradient along `vector`
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return np.zeros_like(pos)
+        step = np.sqrt(np.finfo(float).eps) * (1 + np.linalg.norm(pos)) / norm
+        grads = []
+        try:
+            for sign in (1, -1):
+                set_pos(eptm, geom, pos + sign * step * vector)
+                grads.append(self._active_grad(eptm, model))
+        finally:
+            set_pos(eptm, geom, pos)
+        return (grads[0] - grads[1]) / (2 * step)
+
+    @staticmethod
+    def _active_hessian(eptm, model):
+        """Returns the model's Hessian restricted to the active vertices,
+        or None if it isn't available
+        """
+        if not hasattr(model, "compute_hessian"):
+            return None
+        try:
+            hessian = model.compute_hessian(eptm)
+        except NotImplementedError:
+            return None
+        active = np.repeat(eptm.vert_df.is_active.to_numpy().astype(bool), eptm.dim)
+        return hessian.tocsr()[active][:, active]
 
     def approx_grad(self, eptm, geom, model):
         pos0 = eptm.vert_df.loc[
@@ -152,6 +427,7 @@ class QSSolver:
             for u in eptm.settings["boundaries"]:
                 size = eptm.specs["settings"]["boundaries"][u][1]
             pos0 = np.append(pos0, size)
+            self.cache.clear()
             try:
                 self.res = optimize.minimize(
                     self._opt_energy_pbc,
@@ -160,22 +436,28 @@ class QSSolver:
                     jac=self._opt_grad_pbc,
                     **kwargs
                 )
+                self._sync(self.res.x, eptm, geom, periodic=True)
                 return self.res
             except TopologyChangeError:
                 log.info("TopologyChange")
+                profiling.count("solver", "topology_change")
                 self.num_restarts = i + 1
 
     def _opt_energy_pbc(self, pos, eptm, geom, model):
+        energy = self.cache.get(pos, "energy")
+        if energy is not None:
+            return energy
         if self.rearange and eptm.topo_changed:
             # reset switch
             eptm.topo_changed = False
             raise TopologyChangeError("Topology changed before energy evaluation")
-        for u, boundary in eptm.settings["boundaries"].items():
-            eptm.specs["settings"]["boundaries"][u] = [boundary[0], pos[-1]]
-        self.set_pos(eptm, geom, pos[0:-1])
-        geom.update_all(eptm)
-        e = model.compute_energy(eptm)
-        return e
+        self._set_box(eptm, pos[-1])
+        # set_pos updates the geometry with the new box size
+        profiling.call("solver", "set_pos", self.set_pos, eptm, geom, pos[0:-1])
+        energy = profiling.call("solver", "energy", model.compute_energy, eptm)
+        self.num_evaluations += 1
+        self.cache.set(pos, energy=energy)
+        return energy
 
     def _opt_grad_pbc(self, pos, eptm, geom, model, box_increment=0.0001):
         """Gradient calculation for vertices along with an approximation for box size variable
@@ -193,26 +475,25 @@ class QSSolver:
         box_increment: size of displacement of box size to approximate gradient of box size variable
 
         """
+        grad = self.cache.get(pos, "grad")
+        if grad is not None:
+            return grad.copy()
         if self.rearange and eptm.topo_changed:
             raise TopologyChangeError("Topology changed before gradient evaluation")
-        grad_i = model.compute_gradient(eptm)
-        energy_before_increment = model.compute_energy(eptm)
-        for u, boundary in eptm.settings["boundaries"].items():
-            eptm.specs["settings"]["boundaries"][u] = [
-                boundary[0],
-                boundary[1] + box_increment,
-            ]
+        self._sync(pos, eptm, geom, periodic=True)
+        grad_i = self._active_grad(eptm, model)
+        energy_before_increment = self.cache.get(pos, "energy")
+        if energy_before_increment is None:
+            energy_before_increment = model.compute_energy(eptm)
+        self._set_box(eptm, pos[-1] + box_increment)
         geom.update_all(eptm)
         energy_after_increment = model.compute_energy(eptm)
         grad_of_box_size_variable = (
             energy_after_increment - energy_before_increment
         ) / box_increment
-        for u, boundary in eptm.settings["boundaries"].items():
-            eptm.specs["settings"]["boundaries"][u] = [
-                boundary[0],
-                boundary[1] - box_increment,
-            ]
-        return np.append(
-            grad_i.loc[eptm.vert_df.is_active.astype(bool)].values.ravel(),
-            grad_of_box_size_variable,
-        )
+        # restores the geometry of the box at `pos`
+        self._set_box(eptm, pos[-1])
+        geom.update_all(eptm)
+        grad = np.append(grad_i, grad_of_box_size_variable)
+        self.cache.set(pos, energy=energy_before_increment, grad=grad)
+        return grad.copy()
@@ -14,6 +14,7 @@ from scipy.integrate import solve_ivp
 from ..core.history import History
 from ..behaviors.event_manager import EventManager
 from ..behaviors.sheet.basic_events import reconnect
+from ..utils import profiling
 
 
 log = logging.getLogger(__name__)
@@ -124,23 +125,25 @@ class EulerSolver:
         self.eptm.settings["dt"] = dt
         for t in np.arange(self.prev_t, tf + dt, dt):
             pos = self.current_pos
-            dot_r = self.ode_func(t, pos)
+            dot_r = profiling.call("solver", "ode_func", self.ode_func, t, pos)
             if self.bounds is not None:
                 dot_r = np.clip(dot_r, *self.bounds)
             pos = pos + dot_r * dt
-            self.set_pos(pos)
+            profiling.call("solver", "set_pos", self.set_pos, pos)
             self.prev_t = t
             if self.manager is not None:
-                self.manager.execute(self.eptm)
-                self.geom.update_all(self.eptm)
-                self.manager.update()
+                with profiling.section("solver", "events"):
+                    self.manager.execute(self.eptm)
+                    self.geom.update_all(self.eptm)
+                    self.manager.update()
 
             if self.eptm.topo_changed:
                 log.info("Topology changed")
                 if on_topo_change is not None:
                     on_topo_change(*topo_change_args)
                 self.eptm.topo_changed = False
-            self.record(t)
+                profiling.count("solver", "topology_change")
+            profiling.call("solver", "record", self.record, t)
 
     def ode_func(self, t, pos):
         """Computes the models' gradient.
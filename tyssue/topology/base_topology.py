@@ -54,6 +54,7 @@ def split_vert(sheet, vert, face, to_rewire, epsilon, recenter=False):
     sheet.edge_df.loc[to_rewire.index] = to_rewire.replace(
         {"srce": vert, "trgt": vert}, new_vert
     )
+    sheet.update_topo_version()
 
 
 def add_vert(eptm, edge):
@@ -134,6 +135,7 @@ def add_vert(eptm, edge):
         eptm.edge_df.loc[new_opp_edge, "srce"] = trgt
         new_opp_edges.append(new_opp_edge)
 
+    eptm.update_topo_version()
     # ## Sheet special case
     if len(new_edges) == 1:
         new_edges = new_edges[0]
@@ -169,6 +171,7 @@ def close_face(eptm, face):
     eptm.edge_df.index.name = "edge"
     new_edge = eptm.edge_df.index[-1]
     eptm.edge_df.loc[new_edge, ["srce", "trgt"]] = single_trgt, single_srce
+    eptm.update_topo_version()
 
 
 def drop_two_sided_faces(eptm):
@@ -187,6 +190,7 @@ def drop_two_sided_faces(eptm):
     edges = eptm.edge_df[eptm.edge_df["face"].isin(two_sided)].index
     eptm.edge_df.drop(edges, axis=0, inplace=True)
     eptm.face_df.drop(two_sided, axis=0, inplace=True)
+    eptm.update_topo_version()
 
 
 def remove_face(sheet, face):
@@ -258,6 +262,8 @@ def collapse_edge(sheet, edge, reindex=True, allow_two_sided=False):
     if reindex:
         sheet.reset_index()
         sheet.reset_topo()
+    else:
+        sheet.update_topo_version()
     return 0
 
 
@@ -122,3 +122,129 @@ def verts_in_cell_connectivity(eptm):
     ).toarray()
     cst_connect[np.arange(eptm.Nv), np.arange(eptm.Nv)] = 0
     return cst_connect
+
+
+def edge_incidence(eptm, element):
+    """Returns a sparse CSR matrix of shape (N, eptm.Ne) with
+    I_ij = 1 iff `eptm.edge_df[element]` is equal to i for edge j,
+    where N is the largest such index plus one.
+
+    Summing edge data over `element` (e.g. 'srce' or 'face') is then
+    the matrix product `I @ data`.
+
+    Parameters
+    ----------
+    eptm: a :class:`tyssue.Epithelium` instance
+    element: {'srce' | 'trgt' | 'face' | 'cell'}
+        the edge_df column over which the edges are grouped
+
+    """
+    idx = eptm.edge_df[element].to_numpy()
+    num_rows = idx.max() + 1 if idx.size else 0
+    counts = np.bincount(idx, minlength=num_rows)
+    indptr = np.concatenate(([0], np.cumsum(counts)))
+    indices = np.argsort(idx, kind="stable")
+    return sparse.csr_matrix(
+        (np.ones(idx.size), indices, indptr), shape=(num_rows, idx.size)
+    )
+
+
+def elem_adjacency(eptm, elem):
+    """Returns a sparse CSR matrix of shape (N, N) with
+    A_ij = 1 iff the elements i and j share at least one edge
+    (i.e. a pair of vertices, regardless of the orientation),
+    where N is the number of elements. The rows and columns are
+    the positions of the elements in `eptm.datasets[elem]`, not
+    their indices.
+
+    Parameters
+    ----------
+    eptm: a :class:`tyssue.Epithelium` instance
+    elem: {'face' | 'cell'}
+        the edge_df column of the elements
+
+    """
+    num_elems = eptm.datasets[elem].shape[0]
+    pos = eptm.datasets[elem].index.get_indexer(eptm.edge_df[elem])
+    # edges of elements absent from the dataset are ignored
+    known = pos >= 0
+    srce = eptm.edge_df["srce"].to_numpy()[known]
+    trgt = eptm.edge_df["trgt"].to_numpy()[known]
+    pos = pos[known]
+    if not pos.size:
+        return sparse.csr_matrix((num_elems, num_elems))
+
+    low, high = np.minimum(srce, trgt), np.maximum(srce, trgt)
+    _, keys = np.unique(low * (high.max() + 1) + high, return_inverse=True)
+    # (full edge, element) incidence
+    incidence = sparse.csr_matrix(
+        (np.ones(pos.size), (keys, pos)), shape=(keys.max() + 1, num_elems)
+    )
+    shared = (incidence.T @ incidence).tocoo()
+    off_diag = shared.row != shared.col
+    return sparse.csr_matrix(
+        (
+            np.ones(off_diag.sum()),
+            (shared.row[off_diag], shared.col[off_diag]),
+        ),
+        shape=(num_elems, num_elems),
+    )
+
+
+def neighborhoods(adjacency, seeds, order):
+    """Breadth first search from several seed elements at once
+
+    Parameters
+    ----------
+    adjacency: sparse matrix of shape (N, N)
+        as returned by :func:`elem_adjacency`
+    seeds: sequence of ints
+        the seed elements
+    order: int
+        the maximum neighborhood order
+
+    Returns
+    -------
+    seed_pos: np.ndarray of ints
+        position of the seed in `seeds` for each neighbor
+    neighbors: np.ndarray of ints
+        the neighboring elements
+    orders: np.ndarray of ints
+        the neighborhood order of each neighbor, i.e. the
+        number of steps from the seed (starting from 1,
+        the seeds themselves are not returned)
+
+    The results are sorted by seed position, order and
+    element index.
+    """
+    seeds = np.asarray(seeds, dtype=int).ravel()
+    num_seeds, num_elems = seeds.size, adjacency.shape[0]
+    frontier = sparse.csr_matrix(
+        (np.ones(num_seeds), (np.arange(num_seeds), seeds)),
+        shape=(num_seeds, num_elems),
+    )
+    visited = frontier.copy()
+    seed_pos, neighbors, orders = [], [], []
+    for k in range(1, order + 1):
+        reached = frontier @ adjacency
+        reached.data[:] = 1.0
+        frontier = reached - reached.multiply(visited)
+        frontier.eliminate_zeros()
+        if not frontier.nnz:
+            break
+        visited = visited + frontier
+        rows, cols = frontier.nonzero()
+        seed_pos.append(rows)
+        neighbors.append(cols)
+        orders.append(np.full(rows.size, k))
+
+    if not seed_pos:
+        empty = np.zeros(0, dtype=int)
+        return empty, empty.copy(), empty.copy()
+    seed_pos, neighbors, orders = (
+        np.concatenate(seed_pos),
+        np.concatenate(neighbors),
+        np.concatenate(orders),
+    )
+    srt = np.lexsort((neighbors, orders, seed_pos))
+    return seed_pos[srt], neighbors[srt], orders[srt]
@@ -57,12 +57,17 @@ invalid epithelium as the `_bad` attribute of the restored one"""
 
 
 def time_exe(func):
+    """Decorator printing the execution time of `func`, see
+    :mod:`tyssue.utils.profiling` for structured timings.
+    """
+
+    @wraps(func)
     def with_time_exe(*args, **kwargs):
-        start = time.time()
+        start = time.perf_counter()
         result = func(*args, **kwargs)
-        end = time.time()
+        end = time.perf_counter()
 
-        print("function : {} \ttime: {2:2f}sec".format(func.__name__, end - start))
+        print("function : {} \ttime: {:.2f}sec".format(func.__name__, end - start))
 
         return result
 
@@ -0,0 +1,148 @@
+"""
+Opt-in profiling
+================
+
+Counts the calls and accumulates the wall times of the effectors,
+geometry updates and solver phases while a :class:`Profiler` is active:
+
+>>> with profiling.profile() as profiler:
+...     solver.find_energy_min(sheet, geom, model)
+>>> profiler.report()
+
+The timings are recorded by category (e.g. `"effector"`, `"geometry"`
+or `"solver"`) and name. When no profiler is active, the instrumented
+code only pays for a global variable lookup.
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+_active = None
+
+
+class Profiler:
+    """Call counters and cumulative wall times of the profiled sections
+
+    Parameters
+    ----------
+    callback : callable, optional
+      called as `callback(category, name, elapsed)` each time a
+      section is recorded, with `elapsed` in seconds
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.counts = defaultdict(int)
+        self.times = defaultdict(float)
+
+    def record(self, category, name, elapsed=0.0):
+        """Records a call of the `name` section of `category`, which
+        lasted `elapsed` seconds. Pure counters are recorded with
+        the default `elapsed` of 0.
+        """
+        key = (category, name)
+        self.counts[key] += 1
+        self.times[key] += elapsed
+        if self.callback is not None:
+            self.callback(category, name, elapsed)
+
+    def reset(self):
+        self.counts.clear()
+        self.times.clear()
+
+    def report(self):
+        """Returns the recorded counts and times as a DataFrame indexed
+        by `(category, name)`, with the `calls`, `time` (cumulated, in
+        seconds) and `mean_time` columns, sorted by decreasing time
+        within each category.
+        """
+        keys = list(self.counts)
+        if keys:
+            index = pd.MultiIndex.from_tuples(keys, names=["category", "name"])
+        else:
+            index = pd.MultiIndex.from_arrays([[], []], names=["category", "name"])
+        report = pd.DataFrame(
+            {
+                "calls": [self.counts[key] for key in keys],
+                "time": [self.times[key] for key in keys],
+            },
+            index=index,
+        )
+        report["mean_time"] = report["time"] / report["calls"]
+        return report.sort_values(["category", "time"], ascending=[True, False])
+
+
+def active_profiler():
+    """Returns the active :class:`Profiler`, or None"""
+    return _active
+
+
+@contextmanager
+def profile(callback=None, profiler=None):
+    """Activates a profiler in the enclosed block and yields it.
+
+    Parameters
+    ----------
+    callback : callable, optional, see :class:`Profiler`
+    profiler : :class:`Profiler`, optional
+      an existing profiler to accumulate in, by default a new one
+    """
+    global _active
+    previous = _active
+    _active = profiler if profiler is not None else Profiler(callback)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def call(category, name, func, *args, **kwargs):
+    """Returns `func(*args, **kwargs)`, recording its duration
+    if a profiler is active
+    """
+    profiler = _active
+    if profiler is None:
+        return func(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.record(category, name, time.perf_counter() - start)
+
+
+def count(category, name):
+    """Increments the `name` counter of `category` if a profiler is active"""
+    if _active is not None:
+        _active.record(category, name)
+
+
+@contextmanager
+def section(category, name):
+    """Records the duration of the enclosed block if a profiler is active"""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record(category, name, time.perf_counter() - start)
+
+
+def timed(category, name):
+    """Decorator recording the duration of the decorated function
+    calls if a profiler is active
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def with_timing(*args, **kwargs):
+            return call(category, name, func, *args, **kwargs)
+
+        return with_timing
+
+    return decorator
@@ -59,3 +59,72 @@ def model_tester(eptm, model):
     gradient = model.compute_gradient(eptm, components=False)
     assert gradient.shape == eptm.vert_df[eptm.coords].shape
     assert np.all(np.isfinite(gradient))
+
+
+def precision_tester(eptm, effector, rtol=1e-5):
+    """Checks that the gradient of `effector` computed with
+    single precision edge, face and cell data (see
+    :meth:`Epithelium.apply_precision`) is close to the double
+    precision gradient, up to `rtol` relative to its maximum.
+    """
+    grads = effector.gradient(eptm)
+
+    eptm32 = eptm.copy()
+    eptm32.precision = "float32"
+    grads32 = effector.gradient(eptm32)
+
+    for grad, grad32 in zip(grads, grads32):
+        if grad is None:
+            assert grad32 is None
+            continue
+        grad, grad32 = np.asarray(grad), np.asarray(grad32)
+        atol = rtol * np.abs(grad).max()
+        np.testing.assert_allclose(grad32, grad, rtol=rtol, atol=atol)
+
+
+def hessian_tester(eptm, geom, effector, step=1e-6, rtol=1e-4):
+    """Checks the analytic Hessian of `effector` (see
+    :meth:`AbstractEffector.hessian`) against central finite
+    differences of its gradient, up to `rtol` relative to the
+    maximum of the Hessian.
+
+    `effector` can also be a model, in which case its
+    `compute_hessian` and `compute_gradient` methods are used.
+    This is an O(Nv) loop over gradient evaluations, meant for
+    small epithelia.
+    """
+    from ..dynamics.factory import accumulate_gradients
+
+    if hasattr(effector, "compute_hessian"):
+        hessian, gradient = effector.compute_hessian, effector.compute_gradient
+    else:
+        hessian = effector.hessian
+
+        def gradient(eptm):
+            return accumulate_gradients(eptm, [effector.gradient(eptm)])
+
+    def flat_grad():
+        grad = gradient(eptm).reindex(eptm.vert_df.index, fill_value=0.0)
+        return np.asarray(grad, dtype=float).ravel()
+
+    pos0 = eptm.vert_df[eptm.coords].to_numpy(dtype=float)
+    geom.update_all(eptm)
+    expected = hessian(eptm).toarray()
+    assert expected.shape == (pos0.size, pos0.size)
+    np.testing.assert_allclose(expected, expected.T, atol=1e-12)
+
+    approx = np.zeros_like(expected)
+    try:
+        for i in range(pos0.size):
+            for sign in (1, -1):
+                pos = pos0.ravel().copy()
+                pos[i] += sign * step
+                eptm.vert_df[eptm.coords] = pos.reshape(pos0.shape)
+                geom.update_all(eptm)
+                approx[:, i] += sign * flat_grad() / (2 * step)
+    finally:
+        eptm.vert_df[eptm.coords] = pos0
+        geom.update_all(eptm)
+
+    atol = rtol * max(np.abs(expected).max(), 1.0)
+    np.testing.assert_allclose(approx, expected, rtol=rtol, atol=atol)
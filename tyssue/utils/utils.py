@@ -354,10 +354,8 @@ def elem_centered_patch(eptm, elem_idx, neighbour_order, elem):
     if elem not in ("face", "cell"):
         raise ValueError
 
-    elems = pd.Series(elem_idx).append(
-        eptm.get_neighborhood(elem_idx, neighbour_order, elem)[elem]
-    )
-    print(elems, elem)
+    neighbors = eptm.get_neighborhoods([elem_idx], neighbour_order, elem)
+    elems = pd.Series(np.concatenate(([elem_idx], neighbors[elem].to_numpy())))
     edges = eptm.edge_df[eptm.edge_df[elem].isin(elems)].copy()
 
     vertices = eptm.vert_df.loc[set(edges["srce"])].copy()